@@ -0,0 +1,16 @@
+"""Vectorized analysis engines used by the analysis commands"""
+from .dca import simulate_dca, compare_frequencies, compare_amounts
+from .montecarlo import SimulationResult, simulate
+from .indicators import IndicatorEngine
+from .risk import RiskEngine, drawdown, max_drawdown
+from .portfolio import PortfolioAnalysis, analyze, correlation
+from .backtest import SweepResult, sweep, equity_curves
+
+__all__ = [
+    'simulate_dca', 'compare_frequencies', 'compare_amounts',
+    'SimulationResult', 'simulate',
+    'RiskEngine', 'drawdown', 'max_drawdown',
+    'IndicatorEngine',
+    'PortfolioAnalysis', 'analyze', 'correlation',
+    'SweepResult', 'sweep', 'equity_curves',
+]
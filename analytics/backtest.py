@@ -0,0 +1,277 @@
+"""
+Vectorized strategy backtester
+Lump-sum, DCA, moving-average crossover and buy-the-dip on daily closes, with
+parameter sweeps evaluated as whole equity-curve matrices
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+STRATEGIES = ('lump_sum', 'dca', 'ma_crossover', 'buy_the_dip')
+
+# Trading days between savings installments for buy_the_dip (about monthly)
+DIP_INTERVAL = 21
+
+# Parameter grid per strategy; one tuple per combination
+DEFAULT_GRIDS: Dict[str, List[tuple]] = {
+    'lump_sum': [()],
+    # Installment every n trading days: weekly, every two weeks, monthly, quarterly
+    'dca': [(5,), (10,), (21,), (63,)],
+    # (fast SMA, slow SMA)
+    'ma_crossover': [(fast, slow) for fast in range(5, 65, 5) for slow in range(20, 260, 10) if fast < slow],
+    # (drop from the rolling high, rolling-high lookback in trading days)
+    'buy_the_dip': [(threshold / 100, lookback) for threshold in range(2, 32, 2) for lookback in (20, 63, 126, 252)],
+}
+
+
+class SweepResult:
+    """
+    Summary statistics of one strategy over a list of parameter combinations
+
+    Arrays are aligned with `params`. ROI, CAGR and drawdown are fractions;
+    every strategy starts with the same capital, and money a strategy has
+    not invested yet counts as cash, so all equity curves are comparable.
+    """
+
+    def __init__(self, strategy: str, params: List[tuple], roi: np.ndarray, cagr: np.ndarray,
+                 max_drawdown: np.ndarray, trades: np.ndarray):
+        self.strategy = strategy
+        self.params = params
+        self.roi = roi
+        self.cagr = cagr
+        self.max_drawdown = max_drawdown
+        self.trades = trades
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    @classmethod
+    def concat(cls, parts: Sequence['SweepResult']) -> 'SweepResult':
+        """Join the results of several chunks of the same sweep"""
+        return cls(
+            parts[0].strategy,
+            [p for part in parts for p in part.params],
+            *(np.concatenate([getattr(part, name) for part in parts])
+              for name in ('roi', 'cagr', 'max_drawdown', 'trades'))
+        )
+
+    def best(self, by: str = 'roi') -> int:
+        """Index of the combination with the highest value of `by`"""
+        return int(np.nanargmax(getattr(self, by)))
+
+    def row(self, index: int) -> dict:
+        return {
+            'params': self.params[index],
+            'roi': float(self.roi[index]),
+            'cagr': float(self.cagr[index]),
+            'max_drawdown': float(self.max_drawdown[index]),
+            'trades': int(self.trades[index]),
+        }
+
+    def grid(self, values: str = 'roi') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Pivot a two-parameter sweep into a table
+
+        Returns:
+            (first parameter values, second parameter values,
+            matrix[first, second] of `values`, NaN for untested pairs)
+        """
+        first = np.unique([p[0] for p in self.params])
+        second = np.unique([p[1] for p in self.params])
+        table = np.full((len(first), len(second)), np.nan)
+        rows = np.searchsorted(first, [p[0] for p in self.params])
+        cols = np.searchsorted(second, [p[1] for p in self.params])
+        table[rows, cols] = getattr(self, values)
+        return first, second, table
+
+
+def _summarize(strategy: str, params: List[tuple], equity: np.ndarray, capital: float,
+               trades: np.ndarray) -> SweepResult:
+    """Statistics for a (combinations, days) equity matrix"""
+    final = equity[:, -1] / capital
+    years = max(equity.shape[1] - 1, 1) / TRADING_DAYS
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = (equity / np.maximum.accumulate(equity, axis=1) - 1.0).min(axis=1)
+        cagr = np.where(final > 0, final ** (1.0 / years) - 1.0, -1.0)
+    return SweepResult(strategy, list(params), final - 1.0, cagr, drawdown, np.asarray(trades, dtype=int))
+
+
+def _accumulate(prices: np.ndarray, deploy: np.ndarray, capital: float, fee: float) -> np.ndarray:
+    """
+    Equity of a strategy that splits capital into equal installments
+
+    Args:
+        deploy: Day each installment is invested (len(prices) = never)
+
+    Returns:
+        Equity per day: uninvested cash plus the value of the shares bought
+    """
+    days = len(prices)
+    amount = capital / len(deploy)
+    invested = np.bincount(deploy, minlength=days + 1)[:days] * amount
+    bought = deploy[deploy < days]
+    shares = np.bincount(bought, weights=amount * (1.0 - fee) / prices[bought], minlength=days)
+    return capital - np.cumsum(invested) + np.cumsum(shares) * prices
+
+
+def _lump_sum(prices: np.ndarray, params, capital: float, fee: float):
+    equity = np.tile(capital * (1.0 - fee) / prices[0] * prices, (len(params), 1))
+    return equity, np.ones(len(params))
+
+
+def _dca(prices: np.ndarray, params, capital: float, fee: float):
+    curves, trades = [], []
+    for (interval,) in params:
+        deploy = np.arange(0, len(prices), interval)
+        curves.append(_accumulate(prices, deploy, capital, fee))
+        trades.append(len(deploy))
+    return np.vstack(curves), np.asarray(trades)
+
+
+def _buy_the_dip(prices: np.ndarray, params, capital: float, fee: float):
+    """
+    Save one installment every DIP_INTERVAL days and invest everything
+    saved once the price is `threshold` below its rolling high
+    """
+    days = len(prices)
+    installments = np.arange(0, days, DIP_INTERVAL)
+    highs = {lookback: pd.Series(prices).rolling(lookback, min_periods=1).max().to_numpy()
+             for lookback in {p[1] for p in params}}
+    curves, trades = [], []
+    for threshold, lookback in params:
+        dips = np.flatnonzero(prices <= highs[lookback] * (1.0 - threshold))
+        # Each installment waits for the first dip on or after the day it was saved
+        slot = np.searchsorted(dips, installments)
+        deploy = np.append(dips, days)[slot]
+        curves.append(_accumulate(prices, deploy, capital, fee))
+        trades.append(len(np.unique(deploy[deploy < days])))
+    return np.vstack(curves), np.asarray(trades)
+
+
+def _ma_crossover(prices: np.ndarray, params, capital: float, fee: float):
+    """
+    Hold the stock while the fast SMA is above the slow one, cash otherwise
+
+    Signals use the close they are computed on, so a position earns returns
+    from the next day; every switch pays the fee.
+    """
+    cumulative = np.concatenate(([0.0], np.cumsum(prices)))
+    smas = {}
+    for window in {w for pair in params for w in pair}:
+        sma = np.full(len(prices), np.nan)
+        sma[window - 1:] = (cumulative[window:] - cumulative[:-window]) / window
+        smas[window] = sma
+
+    fast = np.vstack([smas[f] for f, _ in params])
+    slow = np.vstack([smas[s] for _, s in params])
+    held = np.zeros(fast.shape, dtype=bool)
+    held[:, 1:] = (fast > slow)[:, :-1]
+
+    daily = np.zeros(len(prices))
+    daily[1:] = prices[1:] / prices[:-1] - 1.0
+    switches = np.zeros(held.shape, dtype=bool)
+    switches[:, 1:] = held[:, 1:] != held[:, :-1]
+    growth = (1.0 + held * daily) * (1.0 - fee * switches)
+    return capital * np.cumprod(growth, axis=1), switches.sum(axis=1)
+
+
+_SIMULATORS = {
+    'lump_sum': _lump_sum,
+    'dca': _dca,
+    'ma_crossover': _ma_crossover,
+    'buy_the_dip': _buy_the_dip,
+}
+
+
+def equity_curves(prices, strategy: str, params: Sequence[tuple], capital: float = 10_000.0,
+                  fee_pct: float = 0.0) -> np.ndarray:
+    """
+    Daily equity of a strategy for each parameter combination
+
+    Args:
+        prices: Daily closes in date order
+        strategy: One of STRATEGIES
+        params: Combinations from the strategy's grid
+        capital: Starting capital
+        fee_pct: Percentage fee charged on every purchase or switch
+
+    Returns:
+        (len(params), days) array
+    """
+    if strategy not in _SIMULATORS:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    prices = np.asarray(prices, dtype=float)
+    return _SIMULATORS[strategy](prices, list(params), capital, fee_pct / 100.0)[0]
+
+
+def sweep(prices, strategy: str, params: Optional[Sequence[tuple]] = None, capital: float = 10_000.0,
+          fee_pct: float = 0.0) -> SweepResult:
+    """
+    Evaluate every parameter combination of a strategy
+
+    Args:
+        prices: Daily closes in date order
+        strategy: One of STRATEGIES
+        params: Combinations to test (default: DEFAULT_GRIDS[strategy])
+        capital: Starting capital
+        fee_pct: Percentage fee charged on every purchase or switch
+
+    Returns:
+        SweepResult
+    """
+    if strategy not in _SIMULATORS:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    params = list(DEFAULT_GRIDS[strategy] if params is None else params)
+    prices = np.asarray(prices, dtype=float)
+    equity, trades = _SIMULATORS[strategy](prices, params, capital, fee_pct / 100.0)
+    return _summarize(strategy, params, equity, capital, trades)
+
+
+def sweep_chunk(prices: np.ndarray, row: int, strategy: str, params: Sequence[tuple],
+                capital: float, fee_pct: float) -> SweepResult:
+    """
+    Process-pool task: sweep one symbol's row of a (symbols, days) price matrix
+
+    The matrix is mapped from shared memory by the worker, so a task only
+    pickles its parameters and the returned statistics.
+    """
+    return sweep(prices[row], strategy, params, capital, fee_pct)
+
+
+def sweep_tasks(symbols: int, grids: Optional[Dict[str, List[tuple]]] = None, chunks: int = 1,
+                capital: float = 10_000.0, fee_pct: float = 0.0) -> List[tuple]:
+    """
+    Split a multi-symbol sweep into sweep_chunk argument tuples
+
+    Args:
+        symbols: Rows in the price matrix
+        grids: Strategy -> parameter combinations (default: DEFAULT_GRIDS)
+        chunks: Pieces each large grid is split into (e.g. worker count)
+
+    Returns:
+        List of (row, strategy, params, capital, fee_pct)
+    """
+    grids = DEFAULT_GRIDS if grids is None else grids
+    tasks = []
+    for row in range(symbols):
+        for strategy, params in grids.items():
+            pieces = min(max(chunks, 1), len(params))
+            for piece in np.array_split(np.arange(len(params)), pieces):
+                tasks.append((row, strategy, [params[i] for i in piece], capital, fee_pct))
+    return tasks
+
+
+def collect(tasks: List[tuple], results: List[SweepResult]) -> Dict[int, Dict[str, SweepResult]]:
+    """
+    Reassemble sweep_chunk results
+
+    Returns:
+        row -> strategy -> SweepResult over the whole grid
+    """
+    parts: Dict[int, Dict[str, List[SweepResult]]] = {}
+    for (row, strategy, *_), result in zip(tasks, results):
+        parts.setdefault(row, {}).setdefault(strategy, []).append(result)
+    return {row: {strategy: SweepResult.concat(chunks) for strategy, chunks in by_strategy.items()}
+            for row, by_strategy in parts.items()}
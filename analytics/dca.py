@@ -0,0 +1,240 @@
+"""
+Vectorized Dollar Cost Averaging simulation
+Maps every scheduled investment date to a trading day in one searchsorted
+call and derives shares, cost and value with cumulative sums
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Sequence
+
+# pandas offsets for each investment frequency
+FREQUENCIES = {
+    'daily': 'B',
+    'weekly': 'W-MON',
+    'monthly': 'MS',
+}
+
+
+class DCAResult:
+    """
+    Outcome of one DCA simulation
+
+    Per-installment arrays (dates, prices, shares, ...) are aligned; totals
+    are cumulative up to and including each installment.
+    """
+
+    def __init__(self, dates: np.ndarray, prices: np.ndarray, amount: float,
+                 fees: np.ndarray, shares: np.ndarray, final_price: float):
+        self.dates = dates
+        self.prices = prices
+        self.amount = amount
+        self.fees = fees
+        self.shares = shares
+        self.final_price = final_price
+
+        self.total_shares = np.cumsum(shares)
+        self.total_cost = amount * np.arange(1, len(shares) + 1, dtype=float)
+        self.portfolio_value = self.total_shares * prices
+
+    @property
+    def installments(self) -> int:
+        return len(self.shares)
+
+    @property
+    def invested(self) -> float:
+        return float(self.total_cost[-1]) if self.installments else 0.0
+
+    @property
+    def shares_held(self) -> float:
+        return float(self.total_shares[-1]) if self.installments else 0.0
+
+    @property
+    def total_fees(self) -> float:
+        return float(self.fees.sum())
+
+    @property
+    def final_value(self) -> float:
+        return self.shares_held * self.final_price
+
+    @property
+    def profit_loss(self) -> float:
+        return self.final_value - self.invested
+
+    @property
+    def roi_percent(self) -> float:
+        return (self.profit_loss / self.invested) * 100 if self.invested else 0.0
+
+    @property
+    def avg_cost(self) -> float:
+        """Average cost per share, fees included"""
+        return self.invested / self.shares_held if self.shares_held else 0.0
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Per-installment table
+
+        Returns:
+            DataFrame with Date, Price, Amount, Fee, Shares, TotalShares,
+            TotalCost and PortfolioValue columns
+        """
+        return pd.DataFrame({
+            'Date': self.dates,
+            'Price': self.prices,
+            'Amount': self.amount,
+            'Fee': self.fees,
+            'Shares': self.shares,
+            'TotalShares': self.total_shares,
+            'TotalCost': self.total_cost,
+            'PortfolioValue': self.portfolio_value,
+        })
+
+
+def schedule_dates(start, end, frequency: str) -> np.ndarray:
+    """
+    Build the investment calendar
+
+    Args:
+        start: First possible investment date
+        end: Last possible investment date
+        frequency: 'daily', 'weekly' or 'monthly'
+
+    Returns:
+        datetime64[ns] array of scheduled dates
+    """
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Unknown DCA frequency: {frequency}")
+    return pd.date_range(start=start, end=end, freq=FREQUENCIES[frequency]).values
+
+
+def _execution_positions(trade_dates: np.ndarray, scheduled: np.ndarray) -> np.ndarray:
+    """Index of the first trading day on or after each scheduled date (-1 if none)"""
+    positions = np.searchsorted(trade_dates, scheduled, side='left')
+    positions[positions >= len(trade_dates)] = -1
+    return positions
+
+
+def _simulate(trade_dates: np.ndarray, closes: np.ndarray, positions: np.ndarray,
+              amounts: np.ndarray, fee_pct: float, fee_fixed: float):
+    """
+    Core vectorized simulation for one schedule and k amounts
+
+    Returns:
+        (dates, prices, fees[k, m], shares[k, m])
+    """
+    positions = positions[positions >= 0]
+    prices = closes[positions]
+    fees = amounts * (fee_pct / 100.0) + fee_fixed
+    net = np.clip(amounts - fees, 0.0, None)
+    shares = net[:, None] / prices[None, :]
+    fees = np.broadcast_to(fees[:, None], shares.shape)
+    return trade_dates[positions], prices, fees, shares
+
+
+def _prepare(dates, closes):
+    trade_dates = np.asarray(pd.DatetimeIndex(dates).values)
+    closes = np.asarray(closes, dtype=float)
+    if len(trade_dates) != len(closes):
+        raise ValueError("dates and closes must have the same length")
+    return trade_dates, closes
+
+
+def simulate_dca(dates, closes, start, end, amount: float, frequency: str = 'monthly',
+                 fee_pct: float = 0.0, fee_fixed: float = 0.0) -> DCAResult:
+    """
+    Simulate investing a fixed amount on a schedule
+
+    Each scheduled date buys at the close of the first trading day on or
+    after it; dates past the end of the price history are skipped.
+
+    Args:
+        dates: Trading dates (sorted ascending)
+        closes: Closing prices aligned with dates
+        start: Start of the investment period
+        end: End of the investment period
+        amount: Gross amount invested per installment
+        frequency: 'daily', 'weekly' or 'monthly'
+        fee_pct: Percentage fee charged on each installment
+        fee_fixed: Fixed fee charged on each installment
+
+    Returns:
+        DCAResult
+    """
+    return compare_frequencies(dates, closes, start, end, amount, (frequency,),
+                               fee_pct=fee_pct, fee_fixed=fee_fixed)[frequency]
+
+
+def compare_frequencies(dates, closes, start, end, amount: float,
+                        frequencies: Iterable[str] = ('daily', 'weekly', 'monthly'),
+                        fee_pct: float = 0.0, fee_fixed: float = 0.0) -> Dict[str, DCAResult]:
+    """
+    Simulate several investment frequencies with one searchsorted pass
+
+    Args:
+        dates: Trading dates (sorted ascending)
+        closes: Closing prices aligned with dates
+        start: Start of the investment period
+        end: End of the investment period
+        amount: Gross amount invested per installment
+        frequencies: Frequencies to simulate
+        fee_pct: Percentage fee charged on each installment
+        fee_fixed: Fixed fee charged on each installment
+
+    Returns:
+        Dictionary of frequency -> DCAResult
+    """
+    trade_dates, closes = _prepare(dates, closes)
+    frequencies = list(frequencies)
+    final_price = float(closes[-1]) if len(closes) else float('nan')
+
+    schedules = [schedule_dates(start, end, f) for f in frequencies]
+    all_positions = _execution_positions(trade_dates, np.concatenate(schedules))
+    splits = np.cumsum([len(s) for s in schedules])[:-1]
+
+    amounts = np.array([amount], dtype=float)
+    results = {}
+    for frequency, positions in zip(frequencies, np.split(all_positions, splits)):
+        result_dates, prices, fees, shares = _simulate(trade_dates, closes, positions, amounts,
+                                                       fee_pct, fee_fixed)
+        results[frequency] = DCAResult(result_dates, prices, amount, fees[0], shares[0], final_price)
+    return results
+
+
+def compare_amounts(dates, closes, start, end, amounts: Sequence[float], frequency: str = 'monthly',
+                    fee_pct: float = 0.0, fee_fixed: float = 0.0) -> pd.DataFrame:
+    """
+    Simulate several installment amounts at once (fixed fees make ROI amount-dependent)
+
+    Args:
+        dates: Trading dates (sorted ascending)
+        closes: Closing prices aligned with dates
+        start: Start of the investment period
+        end: End of the investment period
+        amounts: Gross amounts invested per installment
+        frequency: 'daily', 'weekly' or 'monthly'
+        fee_pct: Percentage fee charged on each installment
+        fee_fixed: Fixed fee charged on each installment
+
+    Returns:
+        DataFrame indexed by amount with Invested, FinalValue, ProfitLoss,
+        ROI (%) and AvgCost columns
+    """
+    trade_dates, closes = _prepare(dates, closes)
+    amounts = np.asarray(amounts, dtype=float)
+    positions = _execution_positions(trade_dates, schedule_dates(start, end, frequency))
+    _, _, _, shares = _simulate(trade_dates, closes, positions, amounts, fee_pct, fee_fixed)
+
+    installments = shares.shape[1]
+    invested = amounts * installments
+    shares_held = shares.sum(axis=1)
+    final_value = shares_held * closes[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roi = np.where(invested > 0, (final_value - invested) / invested * 100, 0.0)
+        avg_cost = np.where(shares_held > 0, invested / shares_held, 0.0)
+
+    return pd.DataFrame({
+        'Invested': invested,
+        'FinalValue': final_value,
+        'ProfitLoss': final_value - invested,
+        'ROI (%)': roi,
+        'AvgCost': avg_cost,
+    }, index=pd.Index(amounts, name='Amount'))
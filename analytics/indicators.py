@@ -0,0 +1,342 @@
+"""
+Vectorized technical indicators
+SMA, EMA, RSI, MACD, Bollinger Bands, ATR and rolling VWAP on NumPy arrays,
+plus an engine that extends them with new bars without recomputing history
+"""
+import copy
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Output series of IndicatorEngine, all aligned with its bars
+INDICATORS = (
+    'sma_fast', 'sma_slow', 'ema', 'rsi', 'macd', 'macd_signal', 'macd_hist',
+    'bb_mid', 'bb_upper', 'bb_lower', 'atr', 'vwap',
+)
+
+
+def _nan(n: int) -> np.ndarray:
+    return np.full(n, np.nan)
+
+
+def _recursive(values: np.ndarray, alpha: float, initial: float) -> np.ndarray:
+    """y[t] = y[t-1] + alpha * (x[t] - y[t-1]) starting from y[-1] = initial"""
+    if len(values) == 0:
+        return np.empty(0)
+    seeded = np.concatenate(([initial], values))
+    return pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean().to_numpy()[1:]
+
+
+def _smooth(values: np.ndarray, alpha: float, period: int, initial: Optional[float] = None) -> np.ndarray:
+    """
+    Exponential smoothing seeded with the SMA of the first `period` values
+
+    With `initial` (the previous smoothed value) the recursion simply
+    continues, which is how new bars are appended.
+    """
+    values = np.asarray(values, dtype=float)
+    if initial is not None:
+        return _recursive(values, alpha, initial)
+    out = _nan(len(values))
+    if len(values) < period:
+        return out
+    seed = values[:period].mean()
+    out[period - 1] = seed
+    out[period:] = _recursive(values[period:], alpha, seed)
+    return out
+
+
+def sma(values, period: int) -> np.ndarray:
+    """
+    Simple moving average
+
+    Args:
+        values: Input series
+        period: Window length
+
+    Returns:
+        Array aligned with values, NaN until `period` values are available
+    """
+    values = np.asarray(values, dtype=float)
+    out = _nan(len(values))
+    if len(values) >= period:
+        cumulative = np.cumsum(np.concatenate(([0.0], values)))
+        out[period - 1:] = (cumulative[period:] - cumulative[:-period]) / period
+    return out
+
+
+def ema(values, period: int, initial: Optional[float] = None) -> np.ndarray:
+    """
+    Exponential moving average (alpha = 2 / (period + 1), SMA-seeded)
+
+    Args:
+        values: Input series
+        period: Span of the average
+        initial: Previous EMA value to continue from
+
+    Returns:
+        Array aligned with values
+    """
+    return _smooth(values, 2.0 / (period + 1), period, initial)
+
+
+def rsi(closes, period: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index with Wilder smoothing
+
+    Returns:
+        Array aligned with closes (0-100), NaN for the first `period` bars
+    """
+    closes = np.asarray(closes, dtype=float)
+    out = _nan(len(closes))
+    change = np.diff(closes)
+    if len(change) < period:
+        return out
+    avg_gain = _smooth(np.clip(change, 0, None), 1.0 / period, period)
+    avg_loss = _smooth(np.clip(-change, 0, None), 1.0 / period, period)
+    out[1:] = _rsi(avg_gain, avg_loss)
+    return out
+
+
+def _rsi(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+
+
+def macd(closes, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Moving Average Convergence Divergence
+
+    Returns:
+        (macd line, signal line, histogram), aligned with closes
+    """
+    line = ema(closes, fast) - ema(closes, slow)
+    signal_line = _nan(len(line))
+    valid = ~np.isnan(line)
+    signal_line[valid] = ema(line[valid], signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(closes, period: int = 20, width: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands (population standard deviation, as usually charted)
+
+    Returns:
+        (middle, upper, lower), aligned with closes
+    """
+    closes = np.asarray(closes, dtype=float)
+    mid = sma(closes, period)
+    variance = np.clip(sma(closes * closes, period) - mid * mid, 0, None)
+    band = width * np.sqrt(variance)
+    return mid, mid + band, mid - band
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True range per bar (the first bar uses high - low)"""
+    high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+    previous = np.concatenate(([np.nan], close[:-1]))
+    ranges = np.vstack((high - low, np.abs(high - previous), np.abs(low - previous)))
+    return np.nanmax(ranges, axis=0)
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """
+    Average True Range with Wilder smoothing
+
+    Returns:
+        Array aligned with the bars
+    """
+    return _smooth(true_range(high, low, close), 1.0 / period, period)
+
+
+def vwap(high, low, close, volume, period: int = 20) -> np.ndarray:
+    """
+    Rolling volume-weighted average price over the last `period` daily bars
+
+    Daily bars have no intraday session to anchor to, so the typical price
+    (high + low + close) / 3 is weighted by volume over a sliding window.
+
+    Returns:
+        Array aligned with the bars
+    """
+    high, low, close, volume = (np.asarray(a, dtype=float) for a in (high, low, close, volume))
+    typical = (high + low + close) / 3.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return sma(typical * volume, period) / sma(volume, period)
+
+
+class _Buffer:
+    """Growable array; appending copies only the new values (amortized)"""
+
+    def __init__(self, dtype=float):
+        self._data = np.empty(0, dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def view(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    def append(self, values):
+        values = np.asarray(values, dtype=self._data.dtype)
+        end = self._size + len(values)
+        if end > len(self._data):
+            grown = np.empty(max(end, 2 * len(self._data), 256), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:end] = values
+        self._size = end
+
+
+class IndicatorEngine:
+    """
+    Daily bars plus every indicator in INDICATORS, extended bar by bar
+
+    `extend` computes indicators only for the new bars: moving windows are
+    evaluated over the new bars plus the preceding `period - 1`, and the
+    exponential ones (EMA, RSI, MACD, ATR) continue from their last
+    smoothed values. Bars and results are appended to growable buffers, so
+    an update costs O(new bars + periods) however long the series is.
+    Results match computing the whole series at once (up to floating-point
+    rounding).
+    """
+
+    def __init__(self, sma_fast: int = 20, sma_slow: int = 50, ema_period: int = 20, rsi_period: int = 14,
+                 macd_periods: Tuple[int, int, int] = (12, 26, 9), bb_period: int = 20, bb_width: float = 2.0,
+                 atr_period: int = 14, vwap_period: int = 20):
+        self.sma_fast = sma_fast
+        self.sma_slow = sma_slow
+        self.ema_period = ema_period
+        self.rsi_period = rsi_period
+        self.macd_periods = macd_periods
+        self.bb_period = bb_period
+        self.bb_width = bb_width
+        self.atr_period = atr_period
+        self.vwap_period = vwap_period
+
+        self._dates = _Buffer('M8[ns]')
+        self._bars: Dict[str, _Buffer] = {name: _Buffer() for name in ('high', 'low', 'close', 'volume')}
+        self._values: Dict[str, _Buffer] = {name: _Buffer() for name in INDICATORS}
+        # Last smoothed values the exponential indicators continue from
+        self._state: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def copy(self) -> 'IndicatorEngine':
+        return copy.deepcopy(self)
+
+    @property
+    def dates(self) -> np.ndarray:
+        """Bar dates (datetime64[ns])"""
+        return self._dates.view
+
+    @property
+    def bars(self) -> Dict[str, np.ndarray]:
+        """High, low, close and volume arrays aligned with `dates`"""
+        return {name: buffer.view for name, buffer in self._bars.items()}
+
+    def values(self, name: str) -> np.ndarray:
+        """Indicator series aligned with `dates` (NaN during warm-up)"""
+        return self._values[name].view
+
+    def latest(self) -> Dict[str, float]:
+        """Last value of every indicator"""
+        return {name: float(buffer.view[-1]) if len(buffer) else np.nan for name, buffer in self._values.items()}
+
+    def extend_frame(self, df: pd.DataFrame):
+        """Append the rows of an OHLCV DataFrame (as returned by get_price_history)"""
+        self.extend(df.index.values, df['High'].to_numpy(), df['Low'].to_numpy(),
+                    df['Close'].to_numpy(), df['Volume'].to_numpy())
+
+    def extend(self, dates, high, low, close, volume):
+        """
+        Append new daily bars (in date order) and compute their indicators
+
+        Args:
+            dates: Bar dates
+            high, low, close, volume: Bar values aligned with dates
+        """
+        if len(dates) == 0:
+            return
+        start = len(self)
+        self._dates.append(dates)
+        for name, values in zip(('high', 'low', 'close', 'volume'), (high, low, close, volume)):
+            self._bars[name].append(values)
+
+        computed = self._compute(start)
+        for name in INDICATORS:
+            self._values[name].append(computed[name])
+
+    def _windowed(self, func, names, start: int, period: int, *args):
+        offset = min(start, period - 1)
+        inputs = [self._bars[name].view[start - offset:] for name in names]
+        result = func(*inputs, period, *args)
+        if isinstance(result, tuple):
+            return tuple(r[offset:] for r in result)
+        return result[offset:]
+
+    def _continue(self, key: str, values: np.ndarray, alpha: float, period: int,
+                  history: Callable[[], np.ndarray]) -> np.ndarray:
+        """
+        Exponential smoothing of new values, continuing from the stored
+        state, or from scratch (over `history()`, which ends with `values`)
+        while the seed window has not filled yet
+        """
+        initial = self._state.get(key)
+        if initial is None:
+            full = history()
+            smoothed = _smooth(full, alpha, period)[len(full) - len(values):]
+        else:
+            smoothed = _smooth(values, alpha, period, initial)
+        if len(smoothed) and not np.isnan(smoothed[-1]):
+            self._state[key] = float(smoothed[-1])
+        return smoothed
+
+    def _compute(self, start: int) -> Dict[str, np.ndarray]:
+        high, low, close = (self._bars[name].view for name in ('high', 'low', 'close'))
+        new_close = close[start:]
+        # Bars from the one before the first new bar: its close gives the
+        # first change / true range, so warm updates never scan the history
+        previous = max(start - 1, 0)
+        out = {}
+
+        out['sma_fast'] = self._windowed(sma, ('close',), start, self.sma_fast)
+        out['sma_slow'] = self._windowed(sma, ('close',), start, self.sma_slow)
+        out['bb_mid'], out['bb_upper'], out['bb_lower'] = self._windowed(
+            bollinger, ('close',), start, self.bb_period, self.bb_width)
+        out['vwap'] = self._windowed(vwap, ('high', 'low', 'close', 'volume'), start, self.vwap_period)
+
+        out['ema'] = self._continue('ema', new_close, 2.0 / (self.ema_period + 1), self.ema_period,
+                                    lambda: close)
+
+        # RSI works on close-to-close changes; the first bar has none
+        change = np.diff(close[previous:])
+        alpha = 1.0 / self.rsi_period
+        gain = self._continue('rsi_gain', np.clip(change, 0, None), alpha, self.rsi_period,
+                              lambda: np.clip(np.diff(close), 0, None))
+        loss = self._continue('rsi_loss', np.clip(-change, 0, None), alpha, self.rsi_period,
+                              lambda: np.clip(-np.diff(close), 0, None))
+        rsi_values = _rsi(gain, loss)
+        out['rsi'] = np.concatenate((_nan(1), rsi_values)) if start == 0 else rsi_values
+
+        fast, slow, signal = self.macd_periods
+        line = (self._continue('macd_fast', new_close, 2.0 / (fast + 1), fast, lambda: close)
+                - self._continue('macd_slow', new_close, 2.0 / (slow + 1), slow, lambda: close))
+
+        def valid_line():
+            all_line = np.concatenate((self._values['macd'].view, line))
+            return all_line[~np.isnan(all_line)]
+
+        signal_line = _nan(len(line))
+        signal_line[~np.isnan(line)] = self._continue('macd_signal', line[~np.isnan(line)],
+                                                      2.0 / (signal + 1), signal, valid_line)
+        out['macd'], out['macd_signal'], out['macd_hist'] = line, signal_line, line - signal_line
+
+        tr = true_range(high[previous:], low[previous:], close[previous:])
+        tr = tr[1:] if start > 0 else tr
+        out['atr'] = self._continue('atr', tr, 1.0 / self.atr_period, self.atr_period,
+                                    lambda: true_range(high, low, close))
+        return out
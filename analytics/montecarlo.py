@@ -0,0 +1,162 @@
+"""
+Vectorized Monte Carlo price projection
+Simulates every path at once as a (days, paths) float32 matrix of log
+returns, drawn from a fitted GBM or bootstrapped from historical returns
+"""
+import numpy as np
+from typing import Optional, Sequence
+
+METHODS = ('gbm', 'bootstrap')
+
+# Percentiles drawn as the fan chart bands (outer to inner, then the median)
+FAN_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Days resampled per batch of bootstrap index draws
+BOOTSTRAP_BLOCK_DAYS = 16
+
+
+class SimulationResult:
+    """
+    Outcome of one Monte Carlo run
+
+    Only per-path summaries and per-day percentiles are kept, not the full
+    path matrix.
+    """
+
+    def __init__(self, method: str, start_price: float, horizon: int, paths: int,
+                 percentiles: Sequence[float], fan: np.ndarray, final_prices: np.ndarray,
+                 path_max: np.ndarray, path_min: np.ndarray):
+        self.method = method
+        self.start_price = start_price
+        self.horizon = horizon
+        self.paths = paths
+        self.percentiles = tuple(percentiles)
+        self.fan = fan
+        self.final_prices = final_prices
+        self.path_max = path_max
+        self.path_min = path_min
+
+    def final_percentile(self, q: float) -> float:
+        """Price at percentile q (0-100) of the final-day distribution"""
+        return float(np.percentile(self.final_prices, q))
+
+    @property
+    def expected_price(self) -> float:
+        return float(self.final_prices.mean(dtype=np.float64))
+
+    @property
+    def probability_of_gain(self) -> float:
+        return float(np.mean(self.final_prices > self.start_price))
+
+    def probability_of_target(self, target: float) -> dict:
+        """
+        Chance of reaching a target price
+
+        Args:
+            target: Target price (above or below the start price)
+
+        Returns:
+            Dictionary with 'at_end' (final price beyond the target) and
+            'touch' (target crossed at any point before the horizon)
+        """
+        if target >= self.start_price:
+            at_end = np.mean(self.final_prices >= target)
+            touch = np.mean(self.path_max >= target)
+        else:
+            at_end = np.mean(self.final_prices <= target)
+            touch = np.mean(self.path_min <= target)
+        return {'at_end': float(at_end), 'touch': float(touch)}
+
+
+def _log_returns(returns) -> np.ndarray:
+    returns = np.asarray(returns, dtype=np.float64)
+    returns = returns[np.isfinite(returns)]
+    if len(returns) < 2:
+        raise ValueError("At least two returns are needed to simulate")
+    return np.log1p(returns)
+
+
+def _gbm_steps(log_returns: np.ndarray, horizon: int, paths: int,
+               rng: np.random.Generator) -> np.ndarray:
+    # Fitting on log returns makes mu - sigma^2/2 the sample mean directly
+    drift = np.float32(log_returns.mean())
+    sigma = np.float32(log_returns.std(ddof=1))
+    steps = rng.standard_normal((horizon, paths), dtype=np.float32)
+    steps *= sigma
+    steps += drift
+    return steps
+
+
+def _bootstrap_steps(log_returns: np.ndarray, horizon: int, paths: int,
+                     rng: np.random.Generator) -> np.ndarray:
+    # Resample a block of days at a time so the index matrix never exists
+    # in full (int64 indices would be twice the size of the float32 paths)
+    values = log_returns.astype(np.float32)
+    steps = np.empty((horizon, paths), dtype=np.float32)
+    for start in range(0, horizon, BOOTSTRAP_BLOCK_DAYS):
+        block = steps[start:start + BOOTSTRAP_BLOCK_DAYS]
+        picks = rng.integers(0, len(values), size=block.shape, dtype=np.int32)
+        np.take(values, picks, out=block)
+    return steps
+
+
+def _sorted_percentiles(rows: np.ndarray, percentiles: Sequence[float]) -> np.ndarray:
+    """Linearly interpolated percentiles of each already-sorted row"""
+    position = np.asarray(percentiles, dtype=np.float64) / 100 * (rows.shape[1] - 1)
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, rows.shape[1] - 1)
+    weight = position - lower
+    return rows[:, lower].T * (1 - weight)[:, None] + rows[:, upper].T * weight[:, None]
+
+
+def simulate(returns, start_price: float, horizon: int = 252, paths: int = 50_000,
+             method: str = 'gbm', seed: Optional[int] = None,
+             percentiles: Sequence[float] = FAN_PERCENTILES) -> SimulationResult:
+    """
+    Project future prices from historical daily returns
+
+    'gbm' draws normal log returns with the historical mean and volatility;
+    'bootstrap' resamples the historical returns themselves, keeping their
+    fat tails and skew.
+
+    Args:
+        returns: Historical simple daily returns (e.g. Close.pct_change())
+        start_price: Price the paths start from
+        horizon: Trading days to simulate
+        paths: Number of simulated paths
+        method: 'gbm' or 'bootstrap'
+        seed: RNG seed; the same seed and inputs give identical results
+        percentiles: Percentiles (0-100) recorded for every day
+
+    Returns:
+        SimulationResult with `fan` of shape (len(percentiles), horizon + 1)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown simulation method: {method}")
+    if horizon < 1 or paths < 1:
+        raise ValueError("horizon and paths must be positive")
+
+    log_returns = _log_returns(returns)
+    rng = np.random.default_rng(seed)
+    step = _gbm_steps if method == 'gbm' else _bootstrap_steps
+
+    # Cumulative log return of every path, one row per day, built in place
+    cumulative = step(log_returns, horizon, paths, rng)
+    np.cumsum(cumulative, axis=0, out=cumulative)
+
+    start = np.float32(start_price)
+    final_prices = start * np.exp(cumulative[-1])
+    path_max = start * np.exp(np.maximum(cumulative.max(axis=0), 0))
+    path_min = start * np.exp(np.minimum(cumulative.min(axis=0), 0))
+
+    # Per-path summaries are taken; sorting each day in place (much faster
+    # than np.percentile's partitioning for float32) gives the percentiles.
+    # exp is monotonic, so they are read in log space and only the few
+    # resulting numbers are converted to prices.
+    cumulative.sort(axis=1)
+    fan = np.empty((len(percentiles), horizon + 1))
+    fan[:, 0] = start_price
+    fan[:, 1:] = start_price * np.exp(_sorted_percentiles(cumulative, percentiles))
+
+    return SimulationResult(method, float(start_price), horizon, paths, percentiles, fan,
+                            final_prices, path_max, path_min)
@@ -0,0 +1,225 @@
+"""
+Vectorized multi-asset portfolio analytics
+Correlation, volatility, beta and random-weight efficient frontier samples
+computed with matrix products over a (days, assets) return matrix
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple
+
+TRADING_DAYS = 252
+
+# Column holding the benchmark inside analyze's working table
+BENCHMARK_COLUMN = '__benchmark__'
+
+
+def returns_matrix(closes: pd.DataFrame, min_coverage: float = 0.9) -> pd.DataFrame:
+    """
+    Daily returns for every symbol on common dates
+
+    Symbols with prices on fewer than `min_coverage` of the dates (recent
+    listings, long halts) are dropped; short gaps in the rest are
+    forward-filled so one missing bar does not cost a whole day of data.
+
+    Args:
+        closes: Close prices, one column per symbol
+        min_coverage: Minimum fraction of dates a symbol must have
+
+    Returns:
+        DataFrame of simple daily returns without missing values
+    """
+    closes = closes.sort_index()
+    coverage = closes.notna().mean()
+    closes = closes.loc[:, coverage >= min_coverage].ffill(limit=5)
+    return closes.pct_change(fill_method=None).iloc[1:].dropna()
+
+
+def correlation(returns: np.ndarray) -> np.ndarray:
+    """
+    Pearson correlation matrix of the columns of a return matrix
+
+    Args:
+        returns: (days, assets) array
+
+    Returns:
+        (assets, assets) array
+    """
+    returns = np.asarray(returns, dtype=float)
+    centered = returns - returns.mean(axis=0)
+    std = centered.std(axis=0)
+    std[std == 0] = np.nan
+    z = centered / std
+    corr = z.T @ z / len(returns)
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+def betas(returns: np.ndarray, benchmark: np.ndarray) -> np.ndarray:
+    """Beta of every column against a benchmark return series"""
+    returns = np.asarray(returns, dtype=float)
+    benchmark = np.asarray(benchmark, dtype=float)
+    b = benchmark - benchmark.mean()
+    variance = b @ b
+    if variance == 0:
+        return np.full(returns.shape[1], np.nan)
+    return (returns - returns.mean(axis=0)).T @ b / variance
+
+
+def frontier_samples(mean: np.ndarray, cov: np.ndarray, samples: int = 5000,
+                     seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Random long-only portfolios for plotting the efficient frontier
+
+    Weights are drawn from a flat Dirichlet distribution and every sample is
+    evaluated at once: returns as W @ mean and variances as the row sums of
+    (W @ cov) * W.
+
+    Args:
+        mean: Annualized expected return per asset
+        cov: Annualized covariance matrix
+        samples: Number of random portfolios
+        seed: RNG seed
+
+    Returns:
+        (weights[samples, assets], annual returns, annual volatilities)
+    """
+    rng = np.random.default_rng(seed)
+    weights = rng.dirichlet(np.ones(len(mean)), size=samples)
+    returns = weights @ mean
+    volatility = np.sqrt(np.einsum('ij,ij->i', weights @ cov, weights))
+    return weights, returns, volatility
+
+
+def group_correlation(corr: np.ndarray, groups: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+    """
+    Average correlation within and between groups (e.g. sectors)
+
+    Args:
+        corr: (assets, assets) correlation matrix
+        groups: Group label per asset
+
+    Returns:
+        (group names, (groups, groups) matrix of mean pairwise correlation,
+        excluding each asset's correlation with itself)
+    """
+    names, codes = np.unique(np.asarray(groups), return_inverse=True)
+    membership = np.zeros((len(codes), len(names)))
+    membership[np.arange(len(codes)), codes] = 1.0
+    counts = membership.sum(axis=0)
+    off_diagonal = np.nan_to_num(corr) - np.eye(len(corr))
+    sums = membership.T @ off_diagonal @ membership
+    pairs = np.outer(counts, counts) - np.diag(counts)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return names.tolist(), sums / pairs
+
+
+class PortfolioAnalysis:
+    """
+    Statistics for a weighted set of assets
+
+    All return/volatility figures are annualized from daily returns.
+    """
+
+    def __init__(self, symbols: List[str], weights: np.ndarray, returns: np.ndarray,
+                 benchmark: Optional[np.ndarray] = None, frontier: int = 5000,
+                 seed: Optional[int] = None, risk_free_rate: float = 0.0):
+        self.symbols = symbols
+        self.weights = weights
+        self.days = len(returns)
+        self.risk_free_rate = risk_free_rate
+
+        self.mean = returns.mean(axis=0) * TRADING_DAYS
+        self.cov = np.cov(returns, rowvar=False).reshape(len(symbols), len(symbols)) * TRADING_DAYS
+        self.volatility = np.sqrt(np.diag(self.cov))
+        self.correlation = correlation(returns)
+
+        self.portfolio_returns = returns @ weights
+        self.expected_return = float(weights @ self.mean)
+        self.portfolio_volatility = float(np.sqrt(weights @ self.cov @ weights))
+
+        if benchmark is not None:
+            self.betas = betas(returns, benchmark)
+            self.portfolio_beta = float(weights @ self.betas)
+        else:
+            self.betas = np.full(len(symbols), np.nan)
+            self.portfolio_beta = float('nan')
+
+        if frontier and len(symbols) > 1:
+            self.frontier_weights, self.frontier_returns, self.frontier_volatility = frontier_samples(
+                self.mean, self.cov, frontier, seed)
+        else:
+            self.frontier_weights = weights[None, :]
+            self.frontier_returns = np.array([self.expected_return])
+            self.frontier_volatility = np.array([self.portfolio_volatility])
+
+    @property
+    def sharpe(self) -> float:
+        if not self.portfolio_volatility:
+            return float('nan')
+        return (self.expected_return - self.risk_free_rate) / self.portfolio_volatility
+
+    @property
+    def frontier_sharpe(self) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (self.frontier_returns - self.risk_free_rate) / self.frontier_volatility
+
+    def best_sharpe(self) -> Dict[str, float]:
+        """Weights of the sampled portfolio with the highest Sharpe ratio"""
+        return self._sample(int(np.nanargmax(self.frontier_sharpe)))
+
+    def min_volatility(self) -> Dict[str, float]:
+        """Weights of the sampled portfolio with the lowest volatility"""
+        return self._sample(int(np.argmin(self.frontier_volatility)))
+
+    def _sample(self, index: int) -> Dict[str, float]:
+        return {
+            'return': float(self.frontier_returns[index]),
+            'volatility': float(self.frontier_volatility[index]),
+            'weights': dict(zip(self.symbols, self.frontier_weights[index].tolist())),
+        }
+
+    def pairs(self, limit: int = 3) -> Tuple[list, list]:
+        """
+        Most and least correlated pairs
+
+        Returns:
+            (most, least): lists of (symbol_a, symbol_b, correlation)
+        """
+        upper_i, upper_j = np.triu_indices(len(self.symbols), k=1)
+        values = self.correlation[upper_i, upper_j]
+        order = np.argsort(values)
+        pair = lambda k: (self.symbols[upper_i[k]], self.symbols[upper_j[k]], float(values[k]))
+        return [pair(k) for k in order[::-1][:limit]], [pair(k) for k in order[:limit]]
+
+    @property
+    def average_correlation(self) -> float:
+        n = len(self.symbols)
+        if n < 2:
+            return float('nan')
+        return float((self.correlation.sum() - n) / (n * (n - 1)))
+
+
+def analyze(closes: pd.DataFrame, weights: Sequence[float], benchmark: Optional[pd.Series] = None,
+            frontier: int = 5000, seed: Optional[int] = None) -> PortfolioAnalysis:
+    """
+    Analyze a portfolio from a close-price table
+
+    Args:
+        closes: Close prices, one column per portfolio symbol
+        weights: Weight per column of `closes` (normalized to sum to 1)
+        benchmark: Benchmark close prices (e.g. SPY) used for beta
+        frontier: Number of random portfolios sampled for the frontier
+        seed: RNG seed for the frontier samples
+
+    Returns:
+        PortfolioAnalysis
+    """
+    symbols = list(closes.columns)
+    table = closes if benchmark is None else pd.concat([closes, benchmark.rename(BENCHMARK_COLUMN)], axis=1)
+    returns = returns_matrix(table, min_coverage=0.0)
+    if len(returns) < 2:
+        raise ValueError("Not enough overlapping price history")
+    weights = np.asarray(weights, dtype=float)
+    weights = weights / weights.sum()
+    bench = returns[BENCHMARK_COLUMN].to_numpy() if benchmark is not None else None
+    return PortfolioAnalysis(symbols, weights, returns[symbols].to_numpy(), bench, frontier, seed)
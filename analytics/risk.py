@@ -0,0 +1,179 @@
+"""
+Rolling-window risk engine
+Volatility, VaR/CVaR and Sharpe over a sliding window of daily returns,
+updated per new bar without rescanning the price history
+"""
+import bisect
+import copy
+import math
+from collections import deque
+from statistics import NormalDist
+from typing import Dict, Optional
+import numpy as np
+
+TRADING_DAYS = 252
+
+# Series recorded for every bar once the window is full (NaN before)
+SERIES = ('volatility', 'var_historical', 'cvar_historical', 'var_parametric', 'cvar_parametric', 'sharpe')
+
+
+class RiskEngine:
+    """
+    Streaming risk statistics over the last `window` daily returns
+
+    Feed closing prices in date order with `update` / `extend`; each new
+    price moves the window by one return. Mean and variance are maintained
+    in O(1) with Welford's add/remove updates. The window is also kept as a
+    sorted list for the historical quantile: inserting and removing a
+    return shifts the list (O(w), a memmove) and CVaR averages the tail
+    below the quantile (O(alpha * w)). Nothing is recomputed over the whole
+    history. VaR and CVaR are expressed as (negative) daily returns.
+
+    Args:
+        window: Number of daily returns in the rolling window
+        confidence: VaR/CVaR confidence level, e.g. 0.95
+        risk_free_rate: Annual risk-free rate used for the Sharpe ratio
+    """
+
+    def __init__(self, window: int = 63, confidence: float = 0.95, risk_free_rate: float = 0.0):
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = window
+        self.confidence = confidence
+        self.risk_free_rate = risk_free_rate
+
+        self._alpha = 1.0 - confidence
+        self._z = NormalDist().inv_cdf(self._alpha)
+        # E[X | X <= VaR] of a standard normal, as a multiple of sigma
+        self._tail = NormalDist().pdf(self._z) / self._alpha
+
+        self._returns = deque()
+        self._sorted = []
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._last_price: Optional[float] = None
+        self._started = False
+        self._series: Dict[str, list] = {name: [] for name in SERIES}
+
+    @property
+    def count(self) -> int:
+        """Entries in every series (one less than the prices fed)"""
+        return len(self._series['volatility'])
+
+    @property
+    def ready(self) -> bool:
+        return len(self._returns) == self.window
+
+    def copy(self) -> 'RiskEngine':
+        return copy.deepcopy(self)
+
+    def _add(self, value: float):
+        self._returns.append(value)
+        bisect.insort(self._sorted, value)
+        delta = value - self._mean
+        self._mean += delta / len(self._returns)
+        self._m2 += delta * (value - self._mean)
+
+    def _remove(self, value: float):
+        self._sorted.pop(bisect.bisect_left(self._sorted, value))
+        n = len(self._returns)
+        if n == 0:
+            self._mean = self._m2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / n
+        self._m2 = max(self._m2 - delta * (value - self._mean), 0.0)
+
+    def _historical(self) -> tuple:
+        position = self._alpha * (self.window - 1)
+        lower = int(position)
+        upper = min(lower + 1, self.window - 1)
+        var = self._sorted[lower] + (self._sorted[upper] - self._sorted[lower]) * (position - lower)
+        tail = self._sorted[:bisect.bisect_right(self._sorted, var)]
+        cvar = sum(tail) / len(tail) if tail else var
+        return var, cvar
+
+    def update(self, price: float):
+        """
+        Feed the next closing price
+
+        Args:
+            price: Close of the next trading day
+        """
+        price = float(price)
+        started, self._started = self._started, True
+        previous = self._last_price
+        if math.isfinite(price):
+            self._last_price = price
+        if not started:
+            return
+        if not math.isfinite(price) or previous is None or previous <= 0:
+            # No return for this bar; record NaN so every price after the
+            # first keeps its entry. After a gap the next valid price spans
+            # it as a single return.
+            for values in self._series.values():
+                values.append(math.nan)
+            return
+
+        value = price / previous - 1.0
+        self._add(value)
+        if len(self._returns) > self.window:
+            self._remove(self._returns.popleft())
+
+        series = self._series
+        if not self.ready:
+            for name in SERIES:
+                series[name].append(math.nan)
+            return
+
+        std = math.sqrt(self._m2 / (self.window - 1))
+        var_historical, cvar_historical = self._historical()
+        excess = self._mean - self.risk_free_rate / TRADING_DAYS
+        series['volatility'].append(std * math.sqrt(TRADING_DAYS))
+        series['var_historical'].append(var_historical)
+        series['cvar_historical'].append(cvar_historical)
+        series['var_parametric'].append(self._mean + self._z * std)
+        series['cvar_parametric'].append(self._mean - self._tail * std)
+        series['sharpe'].append(excess / std * math.sqrt(TRADING_DAYS) if std > 0 else math.nan)
+
+    def extend(self, prices):
+        """Feed several closing prices in date order"""
+        for price in np.asarray(prices, dtype=float):
+            self.update(price)
+
+    def series(self, name: str) -> np.ndarray:
+        """
+        One statistic for every return fed so far
+
+        Args:
+            name: One of SERIES
+
+        Returns:
+            Array aligned with the prices after the first, NaN until the
+            window is full
+        """
+        return np.asarray(self._series[name])
+
+    def latest(self) -> Dict[str, float]:
+        """Current value of every statistic (NaN until the window is full)"""
+        return {name: values[-1] if values else math.nan for name, values in self._series.items()}
+
+
+def drawdown(prices) -> np.ndarray:
+    """
+    Drawdown from the running peak for every price
+
+    Args:
+        prices: Closing prices in date order
+
+    Returns:
+        Array of drawdowns (0 at a new high, negative below it)
+    """
+    prices = np.asarray(prices, dtype=float)
+    return prices / np.maximum.accumulate(prices) - 1.0
+
+
+def max_drawdown(prices) -> float:
+    """Largest peak-to-trough decline as a (negative) fraction"""
+    prices = np.asarray(prices, dtype=float)
+    return float(drawdown(prices).min()) if len(prices) else 0.0
@@ -0,0 +1 @@
+"""Performance benchmarks for command handlers (not part of the bot)"""
@@ -0,0 +1,266 @@
+"""
+Fake Yahoo Finance and Google Translate backends for benchmarks
+Serve recorded fixture data (or deterministic synthetic prices) with a
+configurable per-call latency instead of going to the network
+"""
+import copy
+import datetime
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# Trading days of synthetic history generated per symbol
+HISTORY_DAYS = 252 * 12
+
+PERIOD_DAYS = {'d': 1, 'wk': 7, 'mo': 31, 'y': 366}
+
+# Ticker.info costs several Yahoo round trips (cookie/crumb + quoteSummary)
+# where fast_info and history are a single chart request
+INFO_LATENCY_FACTOR = 3.0
+
+# Sectors assigned round-robin to the fake S&P 500 constituents
+SECTORS = ('Information Technology', 'Health Care', 'Financials', 'Energy', 'Industrials', 'Utilities')
+
+
+class Latency:
+    """Blocking delay with Gaussian jitter, shared safely across threads"""
+
+    def __init__(self, mean: float, jitter: float = 0.0, seed: int = 0):
+        self.mean = mean
+        self.jitter = jitter
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sleep(self, factor: float = 1.0):
+        with self._lock:
+            self.calls += 1
+            mean = self.mean * factor
+            delay = self._rng.gauss(mean, mean * self.jitter) if self.jitter else mean
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _substitute(value, symbol: str):
+    """Fill {symbol} / {symbol_lower} placeholders in a fixture template"""
+    if isinstance(value, str):
+        return value.replace('{symbol}', symbol).replace('{symbol_lower}', symbol.lower())
+    if isinstance(value, list):
+        return [_substitute(v, symbol) for v in value]
+    if isinstance(value, dict):
+        return {k: _substitute(v, symbol) for k, v in value.items()}
+    return value
+
+
+def _period_start(period: str, end: pd.Timestamp) -> pd.Timestamp:
+    for unit, days in PERIOD_DAYS.items():
+        if period.endswith(unit) and period[:-len(unit)].isdigit():
+            return end - pd.Timedelta(days=int(period[:-len(unit)]) * days)
+    raise ValueError(f"Unsupported period: {period}")
+
+
+class FixtureStore:
+    """
+    Fixture data keyed by symbol
+
+    info.json / news.json hold recorded payloads per symbol plus a
+    `_template` entry used for symbols that were not recorded. Price
+    history is synthetic: a seeded random walk per symbol, so every run
+    sees identical series.
+    """
+
+    def __init__(self, path: str = FIXTURE_DIR):
+        self.path = path
+        self._info = self._load('info.json')
+        self._news = self._load('news.json')
+        self._history: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, name: str) -> dict:
+        with open(os.path.join(self.path, name), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def info(self, symbol: str) -> dict:
+        if symbol in self._info:
+            return copy.deepcopy(self._info[symbol])
+        return _substitute(self._info['_template'], symbol)
+
+    def news(self, symbol: str) -> List[dict]:
+        if symbol in self._news:
+            return copy.deepcopy(self._news[symbol])
+        return _substitute(self._news['_template'], symbol)
+
+    def _full_history(self, symbol: str) -> pd.DataFrame:
+        with self._lock:
+            df = self._history.get(symbol)
+            if df is None:
+                rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+                end = pd.Timestamp(datetime.date.today())
+                index = pd.bdate_range(end=end, periods=HISTORY_DAYS, tz='America/New_York')
+                returns = rng.normal(0.0004, 0.018, len(index))
+                close = 20 + rng.random() * 300 * np.exp(np.cumsum(returns))
+                spread = np.abs(rng.normal(0, 0.01, len(index))) * close
+                df = pd.DataFrame({
+                    'Open': close * (1 + rng.normal(0, 0.004, len(index))),
+                    'High': close + spread,
+                    'Low': close - spread,
+                    'Close': close,
+                    'Volume': rng.integers(1_000_000, 80_000_000, len(index)),
+                    'Dividends': 0.0,
+                    'Stock Splits': 0.0,
+                }, index=index)
+                df.index.name = 'Date'
+                self._history[symbol] = df
+            return df
+
+    def history(self, symbol: str, period: Optional[str] = None, start=None, end=None, **kwargs) -> pd.DataFrame:
+        df = self._full_history(symbol)
+        tz = df.index.tz
+        last = df.index[-1]
+        if start is not None:
+            lo = pd.Timestamp(start).tz_localize(tz) if pd.Timestamp(start).tzinfo is None else pd.Timestamp(start)
+        elif period == 'max':
+            lo = df.index[0]
+        else:
+            lo = _period_start(period or '1mo', last)
+        hi = pd.Timestamp(end).tz_localize(tz) if end is not None else None
+        mask = df.index >= lo
+        if hi is not None:
+            mask &= df.index < hi
+        return df[mask].copy()
+
+
+class FakeTicker:
+    """Stand-in for yfinance.Ticker backed by a FixtureStore"""
+
+    def __init__(self, backend: 'FakeBackend', symbol: str):
+        self._backend = backend
+        self.ticker = symbol.upper()
+
+    @property
+    def info(self) -> dict:
+        self._backend.yahoo.sleep(INFO_LATENCY_FACTOR)
+        return self._backend.store.info(self.ticker)
+
+    @property
+    def fast_info(self) -> 'FakeFastInfo':
+        return FakeFastInfo(self)
+
+    @property
+    def news(self) -> List[dict]:
+        self._backend.yahoo.sleep()
+        return self._backend.store.news(self.ticker)
+
+    def history(self, period: Optional[str] = None, interval: str = '1d', start=None, end=None, **kwargs) -> pd.DataFrame:
+        self._backend.yahoo.sleep()
+        return self._backend.store.history(self.ticker, period=period, start=start, end=end)
+
+
+class FakeFastInfo:
+    """
+    Stand-in for yfinance's lazy FastInfo mapping: the first key read
+    loads one year of history, later reads are free
+    """
+
+    def __init__(self, ticker: FakeTicker):
+        self._ticker = ticker
+        self._prices: Optional[pd.DataFrame] = None
+
+    def _bars(self) -> pd.DataFrame:
+        if self._prices is None:
+            self._prices = self._ticker.history(period='1y')
+        return self._prices
+
+    def __getitem__(self, key: str):
+        bars = self._bars()
+        if bars.empty:
+            return None
+        last = bars.iloc[-1]
+        values = {
+            'lastPrice': float(last['Close']),
+            'regularMarketPreviousClose': float(bars['Close'].iloc[-2]) if len(bars) > 1 else None,
+            'open': float(last['Open']),
+            'dayLow': float(last['Low']),
+            'dayHigh': float(last['High']),
+            'lastVolume': int(last['Volume']),
+        }
+        if key not in values:
+            raise KeyError(key)
+        return values[key]
+
+
+class FakeTranslator:
+    """Stand-in for deep_translator.GoogleTranslator"""
+
+    def __init__(self, backend: 'FakeBackend'):
+        self._backend = backend
+
+    def translate(self, text: str) -> str:
+        self._backend.translate.sleep()
+        # Keep line structure so batched requests split back correctly
+        return '\n'.join(f"[th] {line}" for line in text.split('\n'))
+
+
+class FakeBackend:
+    """
+    Patches yfinance, the translator and the S&P 500 fetch in-process
+
+    Args:
+        yahoo_latency: Mean seconds per Yahoo Finance call
+        translate_latency: Mean seconds per translation request
+        jitter: Standard deviation as a fraction of the mean latency
+        universe: Symbols reported as S&P 500 constituents
+    """
+
+    def __init__(self, yahoo_latency: float = 0.25, translate_latency: float = 0.15,
+                 jitter: float = 0.3, universe: Optional[List[str]] = None, fixture_dir: str = FIXTURE_DIR):
+        self.store = FixtureStore(fixture_dir)
+        self.yahoo = Latency(yahoo_latency, jitter, seed=1)
+        self.translate = Latency(translate_latency, jitter, seed=2)
+        self.universe = universe or []
+        self._patches = []
+
+    def ticker(self, symbol: str) -> FakeTicker:
+        return FakeTicker(self, symbol)
+
+    def download(self, tickers, period: Optional[str] = None, start=None, end=None, **kwargs) -> pd.DataFrame:
+        symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+        self.yahoo.sleep()
+        frames = {s: self.store.history(s.upper(), period=period, start=start, end=end) for s in symbols}
+        df = pd.concat(frames, axis=1)
+        if kwargs.get('group_by') == 'ticker':
+            return df
+        return df.swaplevel(axis=1).sort_index(axis=1)
+
+    def constituents(self) -> List[Dict[str, str]]:
+        return [{'symbol': s, 'name': f"{s} Holdings Inc.", 'sector': SECTORS[i % len(SECTORS)],
+                 'sub_industry': 'Software'}
+                for i, s in enumerate(self.universe)]
+
+    def _patch(self, target, name: str, value):
+        self._patches.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def install(self):
+        """Route all upstream calls made by the bot to this backend"""
+        import yfinance
+        from utils import sp500, translator
+
+        translator_instance = FakeTranslator(self)
+        self._patch(yfinance, 'Ticker', self.ticker)
+        self._patch(yfinance, 'download', self.download)
+        self._patch(translator, '_translator', lambda: translator_instance)
+        self._patch(sp500, 'fetch_sp500_constituents', self.constituents)
+
+    def uninstall(self):
+        while self._patches:
+            target, name, original = self._patches.pop()
+            setattr(target, name, original)
@@ -0,0 +1,42 @@
+"""
+Record live Yahoo Finance payloads as benchmark fixtures
+Adds per-symbol entries next to the `_template` entries in
+benchmarks/fixtures/info.json and news.json
+
+Usage:
+    python -m benchmarks.record_fixtures AAPL MSFT NVDA
+"""
+import argparse
+import json
+import os
+import yfinance as yf
+from .fake_backend import FIXTURE_DIR
+
+
+def _update(name: str, entries: dict):
+    path = os.path.join(FIXTURE_DIR, name)
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    data.update(entries)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('symbols', nargs='+', help='Ticker symbols to record')
+    args = parser.parse_args()
+
+    info, news = {}, {}
+    for symbol in (s.upper() for s in args.symbols):
+        ticker = yf.Ticker(symbol)
+        info[symbol] = ticker.info
+        news[symbol] = ticker.news
+        print(f"Recorded {symbol}: {len(info[symbol])} info fields, {len(news[symbol])} news items")
+
+    _update('info.json', info)
+    _update('news.json', news)
+
+
+if __name__ == '__main__':
+    main()
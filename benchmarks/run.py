@@ -0,0 +1,262 @@
+"""
+Command handler benchmark
+Drives the real /stock, /news, /dca, /probability, /indicators and
+/marketdata handlers
+against the fake Yahoo/translator backend with N concurrent simulated users,
+and reports throughput, latency percentiles and event loop lag per command
+
+Usage:
+    python -m benchmarks.run --users 20 --requests 5
+    python -m benchmarks.run --save baseline.json
+    python -m benchmarks.run --compare baseline.json --tolerance 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import types
+from typing import Callable, Dict, List, Optional
+import numpy as np
+
+SCENARIOS = ('stock', 'news', 'dca', 'probability', 'indicators', 'portfolio', 'backtest', 'marketdata')
+
+
+def _scenario_args(name: str, rng: random.Random, symbols: List[str]) -> dict:
+    """Options one simulated user passes to a command (all options are explicit)"""
+    symbol = rng.choice(symbols)
+    if name == 'stock':
+        return {'symbol': symbol}
+    if name == 'news':
+        return {'symbol': symbol, 'limit': 5}
+    if name == 'dca':
+        return {'symbol': symbol, 'amount': 100.0, 'frequency': rng.choice(["รายวัน", "รายสัปดาห์", "รายเดือน"]),
+                'period': rng.choice([6, 12, 24]), 'fee': 0.0}
+    if name == 'probability':
+        return {'symbol': symbol, 'period': rng.choice(["6 เดือน", "1 ปี", "2 ปี"]),
+                'horizon': rng.choice(["1 เดือน", "3 เดือน", "1 ปี"]), 'method': rng.choice(["GBM", "Bootstrap"]),
+                'target': None, 'window': rng.choice(["1 เดือน", "3 เดือน", "6 เดือน"])}
+    if name == 'indicators':
+        return {'symbol': symbol, 'period': rng.choice(["3 เดือน", "6 เดือน", "1 ปี"])}
+    if name == 'portfolio':
+        picks = rng.sample(symbols, min(len(symbols), rng.choice([3, 5, 10])))
+        return {'symbols': ", ".join(picks), 'weights': None, 'period': rng.choice(["6 เดือน", "1 ปี", "2 ปี"])}
+    if name == 'backtest':
+        picks = rng.sample(symbols, min(len(symbols), rng.choice([1, 3])))
+        return {'symbols': ", ".join(picks), 'period': rng.choice(["2 ปี", "5 ปี"]), 'capital': 10000.0, 'fee': 0.1}
+    if name == 'marketdata':
+        return {'top_n': 5}
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+class FakeContext:
+    """
+    Minimal ApplicationContext: records responses and simulates the
+    Discord API round trip for each call
+    """
+
+    def __init__(self, command: str, user: int, discord_latency: float):
+        self.command = types.SimpleNamespace(qualified_name=command)
+        self.author = f"bench-user-{user}"
+        self.responses = []
+        self._latency = discord_latency
+
+    async def _call(self, kind: str, args: dict):
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        self.responses.append((kind, args))
+
+    async def defer(self, **kwargs):
+        await self._call('defer', kwargs)
+
+    async def respond(self, content=None, **kwargs):
+        await self._call('respond', {'content': content, **kwargs})
+
+    async def edit(self, **kwargs):
+        await self._call('edit', kwargs)
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    arr = np.asarray(values)
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99), 'max': float(arr.max())}
+
+
+async def run_scenario(name: str, callback: Callable, users: int, requests: int,
+                       symbols: List[str], discord_latency: float, seed: int) -> dict:
+    """
+    Run one command with `users` concurrent users, each sending `requests`
+    commands back to back
+
+    Returns:
+        Result row with throughput, latency percentiles and loop lag
+    """
+    from utils.instrumentation import command_errors
+    from utils.loop_monitor import LoopLagMonitor
+
+    def error_count() -> float:
+        return sum(v for _, key, v in command_errors.samples() if dict(key).get('command') == name)
+
+    errors_before = error_count()
+    latencies: List[float] = []
+    monitor = LoopLagMonitor(interval=0.01, window=1_000_000)
+    monitor.start()
+
+    async def user(i: int):
+        rng = random.Random(seed * 1000 + i)
+        for _ in range(requests):
+            ctx = FakeContext(name, i, discord_latency)
+            started = time.perf_counter()
+            await callback(ctx, **_scenario_args(name, rng, symbols))
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(users)))
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+
+    lag = _percentiles(list(monitor.samples))
+    return {
+        'command': name,
+        'calls': len(latencies),
+        'errors': int(error_count() - errors_before),
+        'elapsed': elapsed,
+        'throughput': len(latencies) / elapsed if elapsed else 0.0,
+        'latency': _percentiles(latencies),
+        'loop_lag': {'p95': lag['p95'], 'max': lag['max']},
+    }
+
+
+def print_report(results: List[dict], args):
+    print()
+    print(f"users={args.users} requests/user={args.requests} symbols={args.symbols} "
+          f"yahoo={args.yahoo_latency * 1000:.0f}ms translate={args.translate_latency * 1000:.0f}ms "
+          f"discord={args.discord_latency * 1000:.0f}ms cache={'on' if not args.no_cache else 'off'}")
+    header = f"{'command':<13}{'calls':>7}{'err':>5}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'lag p95':>9}{'lag max':>9}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        lat, lag = r['latency'], r['loop_lag']
+        print(f"{'/' + r['command']:<13}{r['calls']:>7}{r['errors']:>5}{r['throughput']:>9.1f}"
+              f"{lat['p50'] * 1000:>8.0f}ms{lat['p95'] * 1000:>7.0f}ms{lat['p99'] * 1000:>7.0f}ms"
+              f"{lag['p95'] * 1000:>7.1f}ms{lag['max'] * 1000:>7.1f}ms")
+    print('(latencies in milliseconds; lag = event loop lag while the command was under load)')
+
+
+def compare(results: List[dict], baseline_path: str, tolerance: float) -> List[str]:
+    """
+    Compare results with a saved baseline
+
+    Returns:
+        Human-readable regressions (p95 latency, loop lag or throughput worse
+        than the baseline by more than `tolerance`)
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {r['command']: r for r in json.load(f)['results']}
+
+    regressions = []
+    for r in results:
+        base = baseline.get(r['command'])
+        if base is None:
+            continue
+        checks = [
+            ('p95 latency', r['latency']['p95'], base['latency']['p95'], True),
+            ('max loop lag', r['loop_lag']['max'], base['loop_lag']['max'], True),
+            ('throughput', r['throughput'], base['throughput'], False),
+        ]
+        for label, now, before, lower_is_better in checks:
+            if before <= 0:
+                continue
+            change = (now - before) / before
+            if (change if lower_is_better else -change) > tolerance:
+                regressions.append(f"/{r['command']} {label}: {before:.4g} -> {now:.4g} ({change:+.0%})")
+        if r['errors'] > base['errors']:
+            regressions.append(f"/{r['command']} errors: {base['errors']} -> {r['errors']}")
+    return regressions
+
+
+async def run(args) -> List[dict]:
+    import discord
+    from commands import setup_all_commands
+    from utils.charts import shutdown_render_pool, start_render_pool
+    from utils.sweep_pool import shutdown_sweep_pool, start_sweep_pool
+    from utils.executor import shutdown_executor
+    from .fake_backend import FakeBackend
+
+    symbols = [f"SYM{i:03d}" for i in range(args.symbols)]
+    backend = FakeBackend(args.yahoo_latency, args.translate_latency, args.jitter,
+                          universe=[f"SYM{i:03d}" for i in range(args.universe)])
+    backend.install()
+
+    bot = discord.Bot()
+    setup_all_commands(bot)
+    callbacks = {c.name: c.callback for c in bot.pending_application_commands}
+
+    start_render_pool()
+    start_sweep_pool()
+    results = []
+    try:
+        for name in args.commands:
+            row = await run_scenario(name, callbacks[name], args.users, args.requests,
+                                     symbols, args.discord_latency, args.seed)
+            results.append(row)
+            print(f"  /{name}: {row['calls']} calls in {row['elapsed']:.1f}s", file=sys.stderr)
+    finally:
+        shutdown_render_pool()
+        shutdown_sweep_pool()
+        shutdown_executor()
+        backend.uninstall()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark command handlers against a fake backend')
+    parser.add_argument('--users', type=int, default=10, help='Concurrent simulated users')
+    parser.add_argument('--requests', type=int, default=5, help='Commands sent by each user')
+    parser.add_argument('--commands', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--symbols', type=int, default=8, help='Distinct tickers users pick from')
+    parser.add_argument('--universe', type=int, default=100, help='Size of the fake S&P 500 list')
+    parser.add_argument('--yahoo-latency', type=float, default=0.25, help='Seconds per Yahoo call')
+    parser.add_argument('--translate-latency', type=float, default=0.15, help='Seconds per translation request')
+    parser.add_argument('--discord-latency', type=float, default=0.05, help='Seconds per Discord API call')
+    parser.add_argument('--jitter', type=float, default=0.3, help='Latency std dev as a fraction of the mean')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the market data cache')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save', metavar='PATH', help='Write results as JSON')
+    parser.add_argument('--compare', metavar='PATH', help='Fail if results regress against a saved run')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative regression')
+    args = parser.parse_args(argv)
+
+    # Config is read at import time: isolate on-disk state and quiet the logs first
+    data_dir = tempfile.mkdtemp(prefix='stockbot-bench-')
+    os.environ['DATA_DIR'] = data_dir
+    os.environ['CHART_CACHE_DIR'] = ''
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    os.environ['CACHE_ENABLED'] = 'false' if args.no_cache else 'true'
+
+    results = asyncio.run(run(args))
+    print_report(results, args)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2)
+        print(f"\nSaved results to {args.save}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,45 +2,32 @@
 Discord Stock Bot - Main Entry Point
 Secure, optimized version for deployment on Render.com
 """
+from utils.startup import startup  # first, so the remaining imports are timed
 import discord
 import os
 import asyncio
-from threading import Thread
-from flask import Flask
 from config import Config
 from utils.logger import setup_logger
+from utils.executor import shutdown_executor
+from utils.charts import start_render_pool, shutdown_render_pool
+from utils.sweep_pool import start_sweep_pool, shutdown_sweep_pool
+from utils.lazy import load_module, warm_up_in_background
+from utils.scheduler import scheduler
+from utils.sp500 import sp500_index, refresh_sp500_index
+from utils.http_client import http_clients
+from utils.web_server import WebServer
+from utils.watchdog import watchdog
+from utils.quote_poller import poll_quotes
+from utils.instrumentation import instrument_commands, record_command_error
 from commands import setup_all_commands
 
 # Initialize logger
 logger = setup_logger('StockBot')
-
-# Simple web server for Render health checks
-app = Flask(__name__)
-
-@app.route('/')
-def home():
-    return "Discord Stock Bot is running! 🤖📈"
-
-@app.route('/health')
-def health():
-    return {"status": "healthy", "bot": "online"}
-
-def run_web_server():
-    port = int(os.getenv('PORT', 10000))
-    logger.info(f"Starting Flask web server on 0.0.0.0:{port}")
-    app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
-
-def keep_alive():
-    """Start web server in background thread"""
-    t = Thread(target=run_web_server)
-    t.daemon = True
-    t.start()
-    logger.info(f"Web server started on port {os.getenv('PORT', 10000)}")
+startup.mark("modules imported")
 
 # Self-ping to prevent sleep (optional - use if you don't want external uptime monitor)
 async def self_ping():
     """Ping self every 5 minutes to prevent Render from sleeping"""
-    import aiohttp
     await asyncio.sleep(60)  # Wait 1 minute for server to start
     
     # Get Render URL from environment (Render sets RENDER_EXTERNAL_URL automatically)
@@ -53,12 +40,11 @@ async def self_ping():
     
     while True:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{url}/health") as response:
-                    if response.status == 200:
-                        logger.debug("Self-ping successful")
-                    else:
-                        logger.warning(f"Self-ping returned status {response.status}")
+            async with http_clients.session.get(f"{url}/health") as response:
+                if response.status == 200:
+                    logger.debug("Self-ping successful")
+                else:
+                    logger.warning(f"Self-ping returned status {response.status}")
         except Exception as e:
             logger.error(f"Self-ping failed: {e}")
         
@@ -71,10 +57,35 @@ except ValueError as e:
     logger.error(str(e))
     exit(1)
 
+class StockBot(discord.Bot):
+    """Discord bot that owns the lifecycle of shared services"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Health checks and metrics are served from the bot's own event loop
+        self.web_server = WebServer(self, host=Config.WEB_HOST, port=Config.WEB_PORT)
+    
+    async def start(self, token: str, *, reconnect: bool = True):
+        await http_clients.start()
+        # Listen before logging in so Render's health check passes during startup
+        await self.web_server.start()
+        if Config.WATCHDOG_ENABLED:
+            watchdog.start()
+        startup.mark("web server listening")
+        await super().start(token, reconnect=reconnect)
+    
+    async def close(self):
+        await scheduler.stop()
+        watchdog.stop()
+        await self.web_server.stop()
+        await http_clients.close()
+        await super().close()
+
+
 # Initialize Discord bot
 intents = discord.Intents.default()
 intents.message_content = True  # Required for some features
-bot = discord.Bot(intents=intents)
+bot = StockBot(intents=intents)
 
 
 @bot.event
@@ -85,15 +96,30 @@ async def on_ready():
     logger.info(f"Guilds: {len(bot.guilds)}")
     logger.info("=" * 50)
     
+    # on_ready fires again after reconnects; only start background jobs once
+    if not scheduler.running:
+        startup.mark("gateway ready")
+        scheduler.start()
+        # Import pandas/scipy/yfinance now rather than in the first command
+        bot.loop.create_task(warm_up())
+    
     # Start self-ping task to prevent Render from sleeping
     bot.loop.create_task(self_ping())
     logger.info("Self-ping task started - bot will stay awake!")
 
 
+async def warm_up():
+    """Load heavy modules in the background once the bot is online"""
+    await warm_up_in_background()
+    startup.mark("heavy modules warmed")
+    logger.info(f"Startup phases: {startup.summary()}")
+
+
 @bot.event
 async def on_application_command_error(ctx, error):
     """Global error handler for slash commands"""
     logger.error(f"Command error in {ctx.command}: {error}", exc_info=True)
+    record_command_error(ctx, error)
     
     if isinstance(error, discord.errors.CheckFailure):
         await ctx.respond("❌ คุณไม่มีสิทธิ์ใช้คำสั่งนี้", ephemeral=True)
@@ -108,19 +134,44 @@ async def on_application_command_error(ctx, error):
 # Register all commands
 try:
     setup_all_commands(bot)
+    instrument_commands(bot)
     logger.info("All commands registered successfully")
+    startup.mark("commands registered")
 except Exception as e:
     logger.error(f"Failed to register commands: {e}", exc_info=True)
     exit(1)
 
 
+# Jobs backed by heavy modules import them off the event loop on first run
+async def refresh_market_snapshot():
+    """Scheduler job: refresh the /marketdata snapshot"""
+    await (await load_module('utils.market_snapshot')).refresh_market_snapshot()
+
+
+async def poll_news():
+    """Scheduler job: refresh news for tracked symbols"""
+    await (await load_module('utils.news_feed')).poll_news()
+
+
+# Background jobs (started from on_ready)
+scheduler.add_job('sp500_refresh', refresh_sp500_index, interval=60 * 60)
+scheduler.add_job('market_snapshot', refresh_market_snapshot, interval=60, initial_delay=5)
+scheduler.add_job('news_ingest', poll_news, interval=Config.NEWS_POLL_INTERVAL, initial_delay=30)
+scheduler.add_job('quote_poller', poll_quotes, interval=Config.WATCH_POLL_INTERVAL)
+
+
 # Run the bot
 if __name__ == "__main__":
     try:
         logger.info("Starting bot...")
         
-        # Start web server for Render health checks
-        keep_alive()
+        # Serve S&P 500 constituents from the last snapshot until the first refresh
+        sp500_index.load()
+        
+        # Fork chart workers before any other threads are started (the sweep
+        # pool starts its workers from a fork server, so it can come after)
+        start_render_pool()
+        start_sweep_pool()
         
         # Run Discord bot
         bot.run(Config.BOT_TOKEN)
@@ -132,3 +183,7 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=True)
         exit(1)
+    finally:
+        shutdown_render_pool()
+        shutdown_sweep_pool()
+        shutdown_executor()
@@ -2,10 +2,15 @@
 
 def setup_all_commands(bot):
     """Register all command modules with the bot"""
-    from . import basic, stock, analysis, market, news
+    from . import basic, stock, analysis, indicators, portfolio, backtest, market, news, watch, admin
     
     basic.setup(bot)
     stock.setup(bot)
     analysis.setup(bot)
+    indicators.setup(bot)
+    portfolio.setup(bot)
+    backtest.setup(bot)
     market.setup(bot)
     news.setup(bot)
+    watch.setup(bot)
+    admin.setup(bot)
@@ -0,0 +1,77 @@
+"""
+Admin commands: botstats
+Operational statistics for the people running the bot
+"""
+import discord
+from discord.commands import Option
+from utils.cache import market_cache
+from utils.charts import chart_cache
+from utils.instrumentation import command_summary, stage_summary
+from utils.logger import setup_logger
+from utils.loop_monitor import loop_monitor
+from utils.translator import translation_cache
+
+logger = setup_logger(__name__)
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:,.0f}ms"
+
+
+def _table(rows, label, limit: int = 10) -> str:
+    """Format summary rows as a fixed-width code block"""
+    if not rows:
+        return "ยังไม่มีข้อมูล"
+    lines = [f"{'':<22}{'n':>6}{'p50':>9}{'p95':>9}{'p99':>9}"]
+    for row in rows[:limit]:
+        lines.append(f"{label(row)[:21]:<22}{row['count']:>6}"
+                     f"{_ms(row['p50']):>9}{_ms(row['p95']):>9}{_ms(row['p99']):>9}")
+    return "```\n" + "\n".join(lines) + "\n```"
+
+
+def setup(bot: discord.Bot):
+    """Register admin commands with the bot"""
+
+    @bot.slash_command(name="botstats", description="สถิติการทำงานของบอท (สำหรับผู้ดูแล)")
+    @discord.default_permissions(administrator=True)
+    async def botstats(
+        ctx,
+        command: Option(str, "ดูรายละเอียดเฉพาะคำสั่ง (เช่น stock)", required=False, default=None)
+    ):
+        """Show command latency percentiles, upstream stage timings and cache hit rates"""
+        logger.info(f"/botstats command used by {ctx.author}")
+
+        commands = command_summary()
+        if command:
+            command = command.lstrip('/').lower()
+            commands = [row for row in commands if row['command'] == command]
+        stages = stage_summary(command)
+
+        embed = discord.Embed(
+            title="🛠️ สถิติการทำงานของบอท",
+            description=(
+                f"Gateway latency: `{_ms(bot.latency) if bot.latency == bot.latency else 'N/A'}`\n"
+                f"Event loop lag: `{_ms(loop_monitor.last)}` (สูงสุดล่าสุด `{_ms(loop_monitor.recent_max())}`)"
+            ),
+            color=discord.Color.blurple()
+        )
+
+        embed.add_field(name="⏱️ เวลาตอบสนองต่อคำสั่ง", value=_table(commands, lambda r: f"/{r['command']}"), inline=False)
+        errors = "\n".join(f"/{r['command']}: `{r['errors']}`" for r in commands if r['errors'])
+        embed.add_field(name="❌ ข้อผิดพลาด", value=errors or "ไม่มี", inline=False)
+        embed.add_field(
+            name="🌐 เวลาที่ใช้กับบริการภายนอก",
+            value=_table(stages, lambda r: f"{r['stage']}:{r['op']}" if command else f"{r['command']}/{r['op']}"),
+            inline=False
+        )
+
+        caches = "\n".join(
+            f"{c.name}: `{c.stats()['hit_rate'] * 100:.1f}%` ({c.hits:,} hit / {c.misses:,} miss, {len(c):,} รายการ)"
+            for c in (market_cache, chart_cache, translation_cache.memory)
+        )
+        embed.add_field(name="💾 Cache hit rate", value=caches, inline=False)
+        embed.set_footer(text="เปอร์เซ็นไทล์คำนวณจากการเรียกล่าสุดไม่เกิน 1,024 ครั้งต่อรายการ • ดูทั้งหมดได้ที่ /metrics")
+
+        await ctx.respond(embed=embed, ephemeral=True)
+
+    logger.info("Admin commands registered")
@@ -2,19 +2,87 @@
 Stock analysis commands: DCA and Probability Analysis
 Advanced analysis tools for investment strategies
 """
+import asyncio
 import discord
 from discord.commands import slash_command, Option
-import yfinance as yf
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
 import io
 import datetime
-from scipy.stats import norm, skew, kurtosis
+import zlib
+import numpy as np
+from config import Config
+from utils.instrumentation import record_command_error, timed
 from utils.logger import setup_logger
+from utils.charts import render_cached, render_dca_chart, render_montecarlo_chart, render_probability_chart
+from utils.executor import run_blocking
+from utils.lazy import load_modules
+from utils.series_cache import series_cache
 
 logger = setup_logger(__name__)
 
+DCA_FREQUENCIES = {
+    "รายวัน": "daily",
+    "รายสัปดาห์": "weekly",
+    "รายเดือน": "monthly"
+}
+
+# Trading days simulated for each /probability horizon
+PROJECTION_HORIZONS = {
+    "1 เดือน": 21,
+    "3 เดือน": 63,
+    "6 เดือน": 126,
+    "1 ปี": 252
+}
+
+SIMULATION_METHODS = {
+    "GBM": "gbm",
+    "Bootstrap": "bootstrap"
+}
+
+
+# Rolling window (trading days) for the /probability risk section
+RISK_WINDOWS = {
+    "1 เดือน": 21,
+    "3 เดือน": 63,
+    "6 เดือน": 126,
+    "1 ปี": 252
+}
+
+
+def _rolling_risk(risk, symbol: str, ticker_data, window: int) -> dict:
+    """
+    Rolling risk over the requested history (blocking)
+
+    The risk engine for (symbol, window) is kept in the series cache, so
+    only bars added since the previous request are fed to it.
+    """
+    engine = series_cache.get(
+        (symbol.upper(), 'risk', window), ticker_data,
+        factory=lambda: risk.RiskEngine(window=window),
+        feed=lambda engine, bars: engine.extend(bars['Close'].to_numpy())
+    )
+    returns = len(ticker_data) - 1
+    # [-0:] would be the whole series, not an empty one
+    volatility = engine.series('volatility')[-returns:] if returns > 0 else np.empty(0)
+    volatility = volatility[np.isfinite(volatility)]
+    closes = ticker_data['Close'].to_numpy()
+    closes = closes[np.isfinite(closes)]
+    return {
+        **engine.latest(),
+        'volatility_min': float(volatility.min()) if len(volatility) else float('nan'),
+        'volatility_max': float(volatility.max()) if len(volatility) else float('nan'),
+        'max_drawdown': risk.max_drawdown(closes),
+        'drawdown': float(risk.drawdown(closes)[-1]),
+    }
+
+
+# Simulations running at once: each holds a (horizon, paths) float32 matrix
+_simulation_slots = asyncio.Semaphore(Config.MONTE_CARLO_CONCURRENCY)
+
+
+def _simulation_seed(symbol: str, last_date, method: str, horizon: int) -> int:
+    """Same request on the same data gives the same paths (and a cached chart)"""
+    return zlib.crc32(f"{symbol.upper()}|{last_date}|{method}|{horizon}".encode())
+
 
 def setup(bot: discord.Bot):
     """Register analysis commands with the bot"""
@@ -25,70 +93,42 @@ def setup(bot: discord.Bot):
         symbol: Option(str, "สัญลักษณ์หุ้น", required=True),
         amount: Option(float, "จำนวนเงินลงทุนต่องวด (USD)", required=True),
         frequency: Option(str, "ความถี่", choices=["รายวัน", "รายสัปดาห์", "รายเดือน"], required=True),
-        period: Option(int, "ระยะเวลาย้อนหลัง (เดือน)", required=True)
+        period: Option(int, "ระยะเวลาย้อนหลัง (เดือน)", required=True),
+        fee: Option(float, "ค่าธรรมเนียมต่องวด (%)", default=0.0, min_value=0.0, max_value=10.0)
     ):
         """DCA strategy analysis"""
         logger.info(f"/dca {symbol} command used by {ctx.author}")
         await ctx.defer()
         
         try:
+            pd, market_data, dca_engine = await load_modules('pandas', 'utils.market_data', 'analytics.dca')
             end_date = datetime.date.today()
             start_date = end_date - pd.DateOffset(months=period)
-            ticker_data = yf.download(symbol, start=start_date, end=end_date, progress=False)
+            ticker_data = await market_data.get_price_history(symbol, start=start_date, end=end_date)
             
             if ticker_data.empty:
                 await ctx.respond(f"❌ ไม่พบข้อมูลราคาย้อนหลังสำหรับ '{symbol}' ในช่วง {period} เดือนครับ")
                 return
             
-            # Fix MultiIndex if present
-            if isinstance(ticker_data.columns, pd.MultiIndex):
-                ticker_data.columns = ticker_data.columns.droplevel(1)
-            
-            dca_investments = []
-            if frequency == "รายเดือน": 
-                freq_code = 'MS'
-            elif frequency == "รายสัปดาห์": 
-                freq_code = 'W-MON'
-            else: 
-                freq_code = 'B'
-                
-            investment_dates = pd.date_range(start=start_date, end=end_date, freq=freq_code)
-            total_investment = 0
-            total_shares = 0
-            
-            for date in investment_dates:
-                date_ts = pd.Timestamp(date)
-                pos = ticker_data.index.searchsorted(date_ts)
-                
-                if pos >= len(ticker_data):
-                    continue
-                
-                actual_date = ticker_data.index[pos]
-                price = ticker_data.loc[actual_date, 'Close']
-                shares_bought = amount / price
-                total_shares += shares_bought
-                total_investment += amount
-                
-                dca_investments.append({
-                    'Date': actual_date, 
-                    'Price': price, 
-                    'Amount': amount, 
-                    'Shares': shares_bought,
-                    'TotalShares': total_shares, 
-                    'TotalCost': total_investment,
-                    'PortfolioValue': total_shares * price
-                })
-
-            if not dca_investments:
+            # Simulate all three frequencies in one pass; the selected one drives the report
+            results = dca_engine.compare_frequencies(
+                ticker_data.index, ticker_data['Close'].to_numpy(),
+                start_date, end_date, amount, fee_pct=fee
+            )
+            result = results[DCA_FREQUENCIES[frequency]]
+
+            if result.installments == 0:
                 await ctx.respond(f"❌ ไม่สามารถจำลองการลงทุนสำหรับ '{symbol}' ได้")
                 return
 
-            df = pd.DataFrame(dca_investments)
-            final_price = ticker_data.iloc[-1]['Close']
-            final_value = total_shares * final_price
-            profit_loss = final_value - total_investment
-            roi_percent = (profit_loss / total_investment) * 100
-            avg_cost_per_share = total_investment / total_shares
+            df = result.to_frame()
+            total_investment = result.invested
+            total_shares = result.shares_held
+            final_price = result.final_price
+            final_value = result.final_value
+            profit_loss = result.profit_loss
+            roi_percent = result.roi_percent
+            avg_cost_per_share = result.avg_cost
             
             embed = discord.Embed(
                 title=f"DCA Analysis: {symbol.upper()}",
@@ -104,57 +144,61 @@ def setup(bot: discord.Bot):
             embed.add_field(name="📈 สถิติและราคา", 
                           value=f"ราคาเฉลี่ย DCA: `${avg_cost_per_share:,.2f}`\nราคาปัจจุบัน: `${final_price:,.2f}`\nจำนวนหุ้น: `{total_shares:.4f}`", 
                           inline=False)
+            if fee > 0:
+                embed.add_field(name="🧾 ค่าธรรมเนียม",
+                              value=f"`{fee:.2f}%` ต่องวด\nรวม: `${result.total_fees:,.2f}`",
+                              inline=True)
+            embed.add_field(name="⚖️ เปรียบเทียบความถี่ (ROI)",
+                          value="\n".join(
+                              f"{label}: `{results[code].roi_percent:.2f}%` ({results[code].installments} ครั้ง)"
+                              for label, code in DCA_FREQUENCIES.items()
+                          ),
+                          inline=True)
 
             # Create chart
-            plt.style.use('dark_background')
-            fig, ax1 = plt.subplots(figsize=(10, 6))
-            color = 'tab:green'
-            ax1.set_xlabel('Date')
-            ax1.set_ylabel('Portfolio Value ($)', color=color)
-            ax1.plot(df['Date'], df['PortfolioValue'], color=color, label='Portfolio Value')
-            ax1.tick_params(axis='y', labelcolor=color)
-            ax2 = ax1.twinx()
-            color = 'tab:cyan'
-            ax2.set_ylabel(f'{symbol.upper()} Price ($)', color=color)
-            ax2.plot(ticker_data.index, ticker_data['Close'], color=color, label=f'{symbol} Price', alpha=0.6, linestyle='--')
-            ax2.tick_params(axis='y', labelcolor=color)
-            plt.title(f'DCA Portfolio Value vs. {symbol.upper()} Price')
-            fig.tight_layout()
-            
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png')
-            buf.seek(0)
-            plt.close(fig)
+            png = await render_cached(
+                render_dca_chart, symbol,
+                df['Date'].to_numpy(), df['PortfolioValue'].to_numpy(),
+                ticker_data.index.to_numpy(), ticker_data['Close'].to_numpy()
+            )
             
-            discord_file = discord.File(buf, filename=f"dca_{symbol.lower()}.png")
+            discord_file = discord.File(io.BytesIO(png), filename=f"dca_{symbol.lower()}.png")
             embed.set_image(url=f"attachment://dca_{symbol.lower()}.png")
             await ctx.respond(file=discord_file, embed=embed)
             logger.info(f"DCA analysis sent for {symbol}")
 
         except Exception as e:
             logger.error(f"Error in /dca {symbol}: {e}", exc_info=True)
+            record_command_error(ctx, e)
             await ctx.respond(f"เกิดข้อผิดพลาดขณะวิเคราะห์ DCA {symbol} ครับ: {e}")
 
     @bot.slash_command(name="probability", description="วิเคราะห์การกระจายตัวของผลตอบแทนและความเสี่ยง")
     async def probability(
         ctx,
         symbol: Option(str, "สัญลักษณ์หุ้น", required=True),
-        period: Option(str, "ระยะเวลาย้อนหลัง", choices=["6 เดือน", "1 ปี", "2 ปี", "5 ปี"], default="1 ปี")
+        period: Option(str, "ระยะเวลาย้อนหลัง", choices=["6 เดือน", "1 ปี", "2 ปี", "5 ปี"], default="1 ปี"),
+        horizon: Option(str, "ระยะเวลาจำลองราคาล่วงหน้า", choices=list(PROJECTION_HORIZONS), default="3 เดือน"),
+        method: Option(str, "วิธีจำลอง Monte Carlo", choices=list(SIMULATION_METHODS), default="GBM"),
+        target: Option(float, "ราคาเป้าหมาย (USD)", required=False, default=None, min_value=0.01),
+        window: Option(str, "หน้าต่างคำนวณความเสี่ยงแบบ Rolling", choices=list(RISK_WINDOWS), default="3 เดือน")
     ):
-        """Probability and risk analysis"""
+        """Probability and risk analysis with a Monte Carlo price projection"""
         logger.info(f"/probability {symbol} command used by {ctx.author}")
         await ctx.defer()
 
         try:
+            pd, stats, market_data, montecarlo, risk = await load_modules(
+                'pandas', 'scipy.stats', 'utils.market_data', 'analytics.montecarlo', 'analytics.risk'
+            )
             period_map = {
-                "6 เดือน": "6mo",
-                "1 ปี": "1y",
-                "2 ปี": "2y",
-                "5 ปี": "5y"
+                "6 เดือน": pd.DateOffset(months=6),
+                "1 ปี": pd.DateOffset(years=1),
+                "2 ปี": pd.DateOffset(years=2),
+                "5 ปี": pd.DateOffset(years=5)
             }
-            hist_period = period_map.get(period, "1y")
+            start_date = datetime.date.today() - period_map.get(period, pd.DateOffset(years=1))
 
-            ticker_data = yf.Ticker(symbol).history(period=hist_period)
+            ticker_data = await market_data.get_price_history(symbol, start=start_date)
             if ticker_data.empty:
                 await ctx.respond(f"❌ ไม่พบข้อมูลราคาย้อนหลังสำหรับ '{symbol}' ในช่วง {period} ครับ")
                 return
@@ -163,11 +207,11 @@ def setup(bot: discord.Bot):
 
             mean_return = daily_returns.mean()
             std_dev = daily_returns.std()
-            skewness = skew(daily_returns)
-            kurt = kurtosis(daily_returns)
+            skewness = stats.skew(daily_returns)
+            kurt = stats.kurtosis(daily_returns)
             
             confidence_level = 0.95
-            z_score = norm.ppf(1 - confidence_level)
+            z_score = stats.norm.ppf(1 - confidence_level)
             var_95 = (mean_return + z_score * std_dev)
             cvar_95 = daily_returns[daily_returns <= var_95].mean()
             
@@ -197,44 +241,80 @@ def setup(bot: discord.Bot):
             
             embed.set_footer(text=f"VaR 95% = มีโอกาส 5% ที่จะขาดทุนมากกว่า {abs(var_95 * 100):.2f}% ใน 1 วัน")
 
-            # Create histogram
-            plt.style.use('dark_background')
-            fig, ax = plt.subplots(figsize=(10, 6))
+            # Rolling risk and the forward simulation, both off the event loop
+            risk_window = min(RISK_WINDOWS[window], len(daily_returns))
+            days = PROJECTION_HORIZONS[horizon]
+            sim_method = SIMULATION_METHODS[method]
+            last_price = float(ticker_data['Close'].iloc[-1])
+            with timed('analytics', 'risk'):
+                rolling = await run_blocking(_rolling_risk, risk, symbol, ticker_data, risk_window)
+            async with _simulation_slots:
+                with timed('analytics', 'montecarlo'):
+                    simulation = await run_blocking(
+                        montecarlo.simulate, daily_returns.to_numpy(), last_price,
+                        horizon=days, paths=Config.MONTE_CARLO_PATHS, method=sim_method,
+                        seed=_simulation_seed(symbol, ticker_data.index[-1], sim_method, days)
+                    )
 
-            n, bins, patches = ax.hist(daily_returns, bins=50, alpha=0.75, label='Daily Returns Distribution')
-            
-            for i in range(len(patches)):
-                if bins[i] < 0:
-                    patches[i].set_facecolor('tab:red')
-                else:
-                    patches[i].set_facecolor('tab:green')
-
-            ax.axvline(mean_return, color='yellow', linestyle='dashed', linewidth=2, label=f'Mean ({mean_return*100:.2f}%)')
-            ax.axvline(var_95, color='orange', linestyle='dashed', linewidth=2, label=f'VaR 95% ({var_95*100:.2f}%)')
-
-            ax.set_xlabel('Daily Returns')
-            ax.set_ylabel('Frequency')
-            ax.set_title(f'Probability Distribution: {symbol.upper()} ({period})')
-            
-            vals = ax.get_xticks()
-            ax.set_xticklabels([f'{x*100:.1f}%' for x in vals])
-            
-            ax.legend()
-            fig.tight_layout()
+            embed.add_field(name=f"📉 ความเสี่ยงแบบ Rolling ({risk_window} วันล่าสุด)", value=(
+                f"ความผันผวนรายปี: `{rolling['volatility'] * 100:.1f}%` "
+                f"(ช่วง {period}: `{rolling['volatility_min'] * 100:.1f}% - {rolling['volatility_max'] * 100:.1f}%`)\n"
+                f"VaR / CVaR ย้อนหลัง: `{rolling['var_historical'] * 100:.2f}%` / `{rolling['cvar_historical'] * 100:.2f}%`\n"
+                f"VaR / CVaR พาราเมตริก: `{rolling['var_parametric'] * 100:.2f}%` / `{rolling['cvar_parametric'] * 100:.2f}%`\n"
+                f"Sharpe Ratio: `{rolling['sharpe']:.2f}`\n"
+                f"Max Drawdown: `{rolling['max_drawdown'] * 100:.1f}%` (ปัจจุบัน `{rolling['drawdown'] * 100:.1f}%`)"
+            ), inline=False)
 
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png')
-            buf.seek(0)
-            plt.close(fig)
+            projection = discord.Embed(
+                title=f"Monte Carlo Projection: {symbol.upper()}",
+                description=f"จำลอง `{simulation.paths:,}` เส้นทางราคา ({method}) ล่วงหน้า **{horizon}** (`{days}` วันเทรด)",
+                color=discord.Color.purple()
+            )
+            projection.add_field(name="🎯 ช่วงราคาที่คาดการณ์", value=(
+                f"ค่ามัธยฐาน: `${simulation.final_percentile(50):,.2f}`\n"
+                f"ช่วง 50%: `${simulation.final_percentile(25):,.2f} - ${simulation.final_percentile(75):,.2f}`\n"
+                f"ช่วง 90%: `${simulation.final_percentile(5):,.2f} - ${simulation.final_percentile(95):,.2f}`"
+            ), inline=True)
+            projection.add_field(name="🎲 ความน่าจะเป็น", value=(
+                f"ราคาเฉลี่ยที่คาดหวัง: `${simulation.expected_price:,.2f}`\n"
+                f"โอกาสสูงกว่าราคาปัจจุบัน: `{simulation.probability_of_gain * 100:.1f}%`"
+            ), inline=True)
+            if target is not None:
+                chance = simulation.probability_of_target(target)
+                direction = "ขึ้นถึง" if target >= last_price else "ลงถึง"
+                projection.add_field(name=f"📍 ราคาเป้าหมาย ${target:,.2f}", value=(
+                    f"โอกาส{direction}เป้าหมายระหว่างทาง: `{chance['touch'] * 100:.1f}%`\n"
+                    f"โอกาสอยู่เลยเป้าหมาย ณ สิ้นสุด: `{chance['at_end'] * 100:.1f}%`"
+                ), inline=False)
+            projection.set_footer(text="การจำลองอิงจากผลตอบแทนในอดีต ไม่ใช่การรับประกันผลในอนาคต")
+
+            # Create histogram and fan chart
+            history = ticker_data['Close'].iloc[-days:]
+            future_dates = pd.bdate_range(start=ticker_data.index[-1], periods=days + 1).to_numpy()
+            png, fan_png = await asyncio.gather(
+                render_cached(
+                    render_probability_chart, symbol, period,
+                    daily_returns.to_numpy(), float(mean_return), float(var_95)
+                ),
+                render_cached(
+                    render_montecarlo_chart, symbol, history.index.to_numpy(), history.to_numpy(),
+                    future_dates, simulation.fan, simulation.percentiles, target
+                )
+            )
             
-            discord_file = discord.File(buf, filename=f"prob_{symbol.lower()}.png")
+            files = [
+                discord.File(io.BytesIO(png), filename=f"prob_{symbol.lower()}.png"),
+                discord.File(io.BytesIO(fan_png), filename=f"mc_{symbol.lower()}.png")
+            ]
             embed.set_image(url=f"attachment://prob_{symbol.lower()}.png")
+            projection.set_image(url=f"attachment://mc_{symbol.lower()}.png")
             
-            await ctx.respond(file=discord_file, embed=embed)
+            await ctx.respond(files=files, embeds=[embed, projection])
             logger.info(f"Probability analysis sent for {symbol}")
 
         except Exception as e:
             logger.error(f"Error in /probability {symbol}: {e}", exc_info=True)
+            record_command_error(ctx, e)
             await ctx.respond(f"เกิดข้อผิดพลาดขณะวิเคราะห์ Probability {symbol} ครับ: {e}")
     
     logger.info("Analysis commands registered")
@@ -0,0 +1,160 @@
+"""
+Strategy backtest command
+Compares lump-sum, DCA, moving-average crossover and buy-the-dip over one or
+more symbols, sweeping the parameters of the rule-based strategies
+"""
+import discord
+from discord.commands import slash_command, Option
+import io
+from typing import Dict
+import numpy as np
+from config import Config
+from utils.charts import render_backtest_chart, render_cached
+from utils.executor import run_blocking
+from utils.instrumentation import record_command_error, timed
+from utils.lazy import load_modules
+from utils.logger import setup_logger
+from utils.symbols import parse_symbols
+from utils.sweep_pool import run_shared
+
+logger = setup_logger(__name__)
+
+BACKTEST_PERIODS = {
+    "1 ปี": "1y",
+    "2 ปี": "2y",
+    "5 ปี": "5y",
+    "10 ปี": "10y"
+}
+
+# DCA installment interval (trading days) shown in the comparison
+DCA_INTERVAL = 21
+
+# Minimum trading days for the slowest moving averages to produce signals
+MIN_DAYS = 60
+
+COLUMNS = ('Lump', 'DCA', 'MA*', 'Dip*')
+
+
+def _pick(sweeps) -> Dict[str, dict]:
+    """Lump-sum, monthly DCA and the best MA crossover / buy-the-dip rows for one symbol"""
+    dca = sweeps['dca']
+    return {
+        'Lump': sweeps['lump_sum'].row(0),
+        'DCA': dca.row(dca.params.index((DCA_INTERVAL,))),
+        'MA*': sweeps['ma_crossover'].row(sweeps['ma_crossover'].best()),
+        'Dip*': sweeps['buy_the_dip'].row(sweeps['buy_the_dip'].best()),
+    }
+
+
+def _table(symbols, picks, key: str) -> str:
+    lines = [f"{'':<7}" + "".join(f"{c:>8}" for c in COLUMNS)]
+    for symbol, row in zip(symbols, picks):
+        lines.append(f"{symbol[:6]:<7}" + "".join(f"{row[c][key] * 100:>+7.0f}%" for c in COLUMNS))
+    return "```\n" + "\n".join(lines) + "\n```"
+
+
+def _equity(backtest, prices: np.ndarray, picks: dict, capital: float, fee: float) -> Dict[str, np.ndarray]:
+    """Equity curves of the compared strategies for the chart (blocking)"""
+    fast, slow = picks['MA*']['params']
+    threshold, lookback = picks['Dip*']['params']
+    return {
+        'Lump Sum': backtest.equity_curves(prices, 'lump_sum', [()], capital, fee)[0],
+        f'DCA ({DCA_INTERVAL}d)': backtest.equity_curves(prices, 'dca', [(DCA_INTERVAL,)], capital, fee)[0],
+        f'SMA {fast}/{slow}': backtest.equity_curves(prices, 'ma_crossover', [(fast, slow)], capital, fee)[0],
+        f'Dip {threshold:.0%}/{lookback}d': backtest.equity_curves(
+            prices, 'buy_the_dip', [(threshold, lookback)], capital, fee)[0],
+    }
+
+
+def setup(bot: discord.Bot):
+    """Register backtest command with the bot"""
+
+    @bot.slash_command(name="backtest", description="ทดสอบย้อนหลัง: ซื้อครั้งเดียว vs DCA vs MA Crossover vs ซื้อตอนย่อ")
+    async def backtest(
+        ctx,
+        symbols: Option(str, "สัญลักษณ์หุ้น (คั่นด้วยจุลภาคหรือเว้นวรรค) เช่น AAPL, MSFT", required=True),
+        period: Option(str, "ช่วงเวลาทดสอบ", choices=list(BACKTEST_PERIODS), default="5 ปี"),
+        capital: Option(float, "เงินทุนทั้งหมด (USD)", default=10000.0, min_value=100.0),
+        fee: Option(float, "ค่าธรรมเนียมต่อการซื้อขาย (%)", default=0.1, min_value=0.0, max_value=5.0)
+    ):
+        """Compare investment strategies with parameter sweeps"""
+        logger.info(f"/backtest {symbols} command used by {ctx.author}")
+
+        try:
+            symbol_list = parse_symbols(symbols)
+        except ValueError as e:
+            await ctx.respond(f"❌ สัญลักษณ์ '{e}' ไม่ถูกต้องครับ", ephemeral=True)
+            return
+        if not 1 <= len(symbol_list) <= Config.BACKTEST_MAX_SYMBOLS:
+            await ctx.respond(f"❌ กรุณาระบุหุ้น 1 - {Config.BACKTEST_MAX_SYMBOLS} ตัวครับ", ephemeral=True)
+            return
+
+        await ctx.defer()
+
+        try:
+            market_data, engine = await load_modules('utils.market_data', 'analytics.backtest')
+            closes = await market_data.get_closes(symbol_list, period=BACKTEST_PERIODS[period])
+            missing = [s for s in symbol_list if s not in closes.columns]
+            if missing:
+                await ctx.respond(f"❌ ไม่พบข้อมูลราคาย้อนหลังสำหรับ {', '.join(missing)} ครับ")
+                return
+            table = closes[symbol_list].ffill().dropna()
+            if len(table) < MIN_DAYS:
+                await ctx.respond(f"❌ ข้อมูลราคาที่ตรงกันมีเพียง {len(table)} วันเทรด ไม่พอสำหรับทดสอบครับ")
+                return
+
+            prices = table.to_numpy().T
+            tasks = engine.sweep_tasks(len(symbol_list), chunks=max(Config.SWEEP_WORKERS, 1),
+                                       capital=capital, fee_pct=fee)
+            with timed('analytics', 'backtest'):
+                results = await run_shared(engine.sweep_chunk, prices, tasks)
+            sweeps = engine.collect(tasks, results)
+            picks = [_pick(sweeps[row]) for row in range(len(symbol_list))]
+            combinations = sum(len(params) for _, _, params, *_ in tasks)
+
+            embed = discord.Embed(
+                title=f"🧪 Backtest: {', '.join(symbol_list)}",
+                description=(
+                    f"ช่วง **{period}** (`{len(table)}` วันเทรด) ทุน `${capital:,.0f}` ค่าธรรมเนียม `{fee:g}%`\n"
+                    f"ทดสอบทั้งหมด `{combinations:,}` ชุดพารามิเตอร์"
+                ),
+                color=discord.Color.blurple()
+            )
+            embed.add_field(name="💰 ผลตอบแทน (ROI)", value=_table(symbol_list, picks, 'roi'), inline=False)
+            embed.add_field(name="📉 Max Drawdown", value=_table(symbol_list, picks, 'max_drawdown'), inline=False)
+
+            params = []
+            for symbol, row in zip(symbol_list, picks):
+                fast, slow = row['MA*']['params']
+                threshold, lookback = row['Dip*']['params']
+                params.append(f"**{symbol}**: SMA `{fast}/{slow}` ({row['MA*']['trades']} ครั้ง) • "
+                              f"ย่อ `{threshold:.0%}` จากจุดสูงสุด `{lookback}` วัน")
+            embed.add_field(name="⚙️ พารามิเตอร์ที่ดีที่สุด", value="\n".join(params)[:1024], inline=False)
+
+            wins = [max(COLUMNS, key=lambda c: row[c]['roi']) for row in picks]
+            summary = "\n".join(
+                f"{c}: ROI เฉลี่ย `{np.mean([row[c]['roi'] for row in picks]) * 100:+.1f}%`, "
+                f"Drawdown เฉลี่ย `{np.mean([row[c]['max_drawdown'] for row in picks]) * 100:.1f}%`, "
+                f"ชนะ `{wins.count(c)}` ตัว"
+                for c in COLUMNS
+            )
+            embed.add_field(name="🏆 สรุป", value=summary, inline=False)
+            embed.set_footer(text=f"Lump = ซื้อครั้งเดียว • DCA = ทุก {DCA_INTERVAL} วันเทรด • "
+                                  "* = พารามิเตอร์ที่ดีที่สุดจากข้อมูลชุดเดียวกัน (in-sample) ผลจริงมักต่ำกว่านี้")
+
+            curves = await run_blocking(_equity, engine, prices[0], picks[0], capital, fee)
+            fast, slow, roi_table = sweeps[0]['ma_crossover'].grid()
+            png = await render_cached(
+                render_backtest_chart, symbol_list[0], table.index.values, curves, fast, slow, roi_table
+            )
+            discord_file = discord.File(io.BytesIO(png), filename="backtest.png")
+            embed.set_image(url="attachment://backtest.png")
+            await ctx.respond(file=discord_file, embed=embed)
+            logger.info(f"Backtest sent for {', '.join(symbol_list)} ({combinations} combinations)")
+
+        except Exception as e:
+            logger.error(f"Error in /backtest {symbols}: {e}", exc_info=True)
+            record_command_error(ctx, e)
+            await ctx.respond(f"เกิดข้อผิดพลาดขณะทดสอบย้อนหลังครับ: {e}")
+
+    logger.info("Backtest command registered")
@@ -0,0 +1,153 @@
+"""
+Technical indicator command
+SMA, EMA, RSI, MACD, Bollinger Bands, ATR and VWAP for one symbol, with a
+price/RSI/MACD chart
+"""
+import discord
+from discord.commands import slash_command, Option
+import io
+import datetime
+import numpy as np
+from utils.charts import render_cached, render_indicator_chart
+from utils.executor import run_blocking
+from utils.instrumentation import record_command_error, timed
+from utils.lazy import load_modules
+from utils.logger import setup_logger
+from utils.series_cache import series_cache
+
+logger = setup_logger(__name__)
+
+# Months of history shown for each choice
+INDICATOR_PERIODS = {
+    "3 เดือน": 3,
+    "6 เดือน": 6,
+    "1 ปี": 12,
+    "2 ปี": 24
+}
+
+# Extra calendar days fetched before the shown range so SMA 50 and the
+# MACD signal line are already warmed up on the first plotted bar
+WARMUP_DAYS = 120
+
+
+def _compute(indicators, symbol: str, ticker_data, shown_from) -> dict:
+    """
+    Indicator series for the shown range (blocking)
+
+    The engine is kept in the series cache, so only bars added since the
+    last request for the symbol are computed.
+    """
+    engine = series_cache.get(
+        (symbol.upper(), 'indicators'), ticker_data,
+        factory=indicators.IndicatorEngine,
+        feed=lambda engine, bars: engine.extend_frame(bars)
+    )
+    shown = engine.dates >= np.datetime64(shown_from, 'ns')
+    series = {name: engine.values(name)[shown] for name in indicators.INDICATORS}
+    series['dates'] = engine.dates[shown]
+    series['close'] = engine.bars['close'][shown]
+    return series
+
+
+def _rsi_status(value: float) -> str:
+    if value >= 70:
+        return "🔴 ซื้อมากเกินไป (Overbought)"
+    if value <= 30:
+        return "🟢 ขายมากเกินไป (Oversold)"
+    return "⚪ ปกติ"
+
+
+def _trend(close: float, sma_fast: float, sma_slow: float) -> str:
+    if close > sma_fast > sma_slow:
+        return "📈 ขาขึ้น"
+    if close < sma_fast < sma_slow:
+        return "📉 ขาลง"
+    return "↔️ ไซด์เวย์"
+
+
+def setup(bot: discord.Bot):
+    """Register indicators command with the bot"""
+
+    @bot.slash_command(name="indicators", description="ดูตัวชี้วัดทางเทคนิค (SMA, EMA, RSI, MACD, Bollinger, ATR, VWAP)")
+    async def indicators(
+        ctx,
+        symbol: Option(str, "สัญลักษณ์หุ้น", required=True),
+        period: Option(str, "ช่วงเวลาที่แสดงในกราฟ", choices=list(INDICATOR_PERIODS), default="6 เดือน")
+    ):
+        """Technical indicators for one symbol"""
+        logger.info(f"/indicators {symbol} command used by {ctx.author}")
+        await ctx.defer()
+
+        try:
+            pd, market_data, engine_module = await load_modules('pandas', 'utils.market_data', 'analytics.indicators')
+            shown_from = datetime.date.today() - pd.DateOffset(months=INDICATOR_PERIODS[period])
+            start_date = shown_from - pd.Timedelta(days=WARMUP_DAYS)
+
+            ticker_data = await market_data.get_price_history(symbol, start=start_date)
+            if ticker_data.empty:
+                await ctx.respond(f"❌ ไม่พบข้อมูลราคาย้อนหลังสำหรับ '{symbol}' ครับ")
+                return
+
+            with timed('analytics', 'indicators'):
+                series = await run_blocking(_compute, engine_module, symbol, ticker_data, shown_from)
+            if len(series['dates']) == 0:
+                await ctx.respond(f"❌ ไม่พบข้อมูลราคาย้อนหลังสำหรับ '{symbol}' ในช่วง {period} ครับ")
+                return
+
+            latest = {name: values[-1] for name, values in series.items()}
+            close = float(latest['close'])
+            band_width = latest['bb_upper'] - latest['bb_lower']
+            percent_b = (close - latest['bb_lower']) / band_width * 100 if band_width else float('nan')
+            change = close / series['close'][0] - 1
+
+            embed = discord.Embed(
+                title=f"Technical Indicators: {symbol.upper()}",
+                description=f"ข้อมูลรายวันย้อนหลัง **{period}** (`{len(series['dates'])}` วันเทรด, เปลี่ยนแปลง `{change * 100:+.2f}%`)",
+                color=discord.Color.green() if close >= latest['sma_slow'] else discord.Color.red()
+            )
+            embed.add_field(name="💵 ราคาและเส้นค่าเฉลี่ย", value=(
+                f"ราคาปิดล่าสุด: `${close:,.2f}`\n"
+                f"SMA 20: `${latest['sma_fast']:,.2f}`\n"
+                f"SMA 50: `${latest['sma_slow']:,.2f}`\n"
+                f"EMA 20: `${latest['ema']:,.2f}`\n"
+                f"แนวโน้ม: {_trend(close, latest['sma_fast'], latest['sma_slow'])}"
+            ), inline=True)
+            embed.add_field(name="📊 โมเมนตัม", value=(
+                f"RSI (14): `{latest['rsi']:.1f}` {_rsi_status(latest['rsi'])}\n"
+                f"MACD: `{latest['macd']:.3f}`\n"
+                f"Signal: `{latest['macd_signal']:.3f}`\n"
+                f"Histogram: `{latest['macd_hist']:+.3f}` "
+                f"{'🟢 สัญญาณบวก' if latest['macd_hist'] >= 0 else '🔴 สัญญาณลบ'}"
+            ), inline=True)
+            embed.add_field(name="🎯 ความผันผวน", value=(
+                f"Bollinger (20, 2): `${latest['bb_lower']:,.2f} - ${latest['bb_upper']:,.2f}`\n"
+                f"%B: `{percent_b:.0f}%`\n"
+                f"ATR (14): `${latest['atr']:,.2f}` (`{latest['atr'] / close * 100:.2f}%` ของราคา)\n"
+                f"VWAP (20 วัน): `${latest['vwap']:,.2f}` "
+                f"({'เหนือ' if close >= latest['vwap'] else 'ต่ำกว่า'} VWAP)"
+            ), inline=False)
+            embed.set_footer(text="RSI > 70 = Overbought, RSI < 30 = Oversold • ตัวชี้วัดไม่ใช่คำแนะนำการลงทุน")
+
+            overlays = {
+                'SMA 20': series['sma_fast'],
+                'SMA 50': series['sma_slow'],
+                'VWAP 20': series['vwap'],
+                'BB Upper': series['bb_upper'],
+                'BB Lower': series['bb_lower'],
+            }
+            png = await render_cached(
+                render_indicator_chart, symbol, series['dates'], series['close'], overlays,
+                series['rsi'], series['macd'], series['macd_signal'], series['macd_hist']
+            )
+
+            discord_file = discord.File(io.BytesIO(png), filename=f"ind_{symbol.lower()}.png")
+            embed.set_image(url=f"attachment://ind_{symbol.lower()}.png")
+            await ctx.respond(file=discord_file, embed=embed)
+            logger.info(f"Indicators sent for {symbol}")
+
+        except Exception as e:
+            logger.error(f"Error in /indicators {symbol}: {e}", exc_info=True)
+            record_command_error(ctx, e)
+            await ctx.respond(f"เกิดข้อผิดพลาดขณะคำนวณตัวชี้วัด {symbol} ครับ: {e}")
+
+    logger.info("Indicators command registered")
@@ -4,12 +4,9 @@ Display S&P 500 market overview with top gainers, losers, and most active
 """
 import discord
 from discord.commands import slash_command, Option
-import yfinance as yf
-import pandas as pd
-import datetime
-import time
+from utils.instrumentation import record_command_error
+from utils.lazy import load_module
 from utils.logger import setup_logger
-from utils.sp500 import get_sp500_symbols
 
 logger = setup_logger(__name__)
 
@@ -27,74 +24,32 @@ def setup(bot: discord.Bot):
         await ctx.defer(ephemeral=False)
         
         try:
-            await ctx.respond(f"กำลังดึงข้อมูลสรุปตลาด (S&P 500)... นี่อาจใช้เวลา 1-2 นาทีนะครับ ☕")
+            market_snapshot = (await load_module('utils.market_snapshot')).market_snapshot
+            snapshot = market_snapshot.snapshot
+            if snapshot is None:
+                # First request before the background job has finished its first run
+                await ctx.respond(f"กำลังดึงข้อมูลสรุปตลาด (S&P 500)... นี่อาจใช้เวลา 1-2 นาทีนะครับ ☕")
+                snapshot = await market_snapshot.get()
 
-            # Get S&P 500 symbols
-            symbols = get_sp500_symbols()
-            if not symbols:
-                await ctx.edit(content="❌ เกิดข้อผิดพลาดในการดึงรายชื่อหุ้น S&P 500 ครับ")
-                return
-
-            # Fetch stock data
-            end_date = datetime.date.today()
-            start_date = end_date - pd.DateOffset(days=5)
-            
-            # Download in chunks to avoid rate limiting
-            all_close_data = []
-            all_volume_data = []
-            symbols_chunks = [symbols[i:i + 100] for i in range(0, len(symbols), 100)]
-            
-            for i, chunk in enumerate(symbols_chunks):
-                logger.info(f"Fetching S&P 500 data chunk {i+1}/{len(symbols_chunks)}...")
-                data = yf.download(chunk, start=start_date, end=end_date, progress=False, auto_adjust=True)
-                
-                if not data.empty:
-                    if 'Close' in data.columns:
-                        all_close_data.append(data['Close'])
-                    if 'Volume' in data.columns:
-                        all_volume_data.append(data['Volume'])
-                
-                time.sleep(1)  # Rate limiting
-            
-            if not all_close_data:
+            if snapshot is None:
                 await ctx.edit(content="❌ ไม่สามารถดึงข้อมูลราคาปิดได้ครับ")
                 return
-                
-            all_close = pd.concat(all_close_data, axis=1)
-            all_volume = pd.concat(all_volume_data, axis=1)
-
-            # Process data
-            if all_close.empty:
-                await ctx.edit(content="❌ ไม่สามารถดึงข้อมูลราคาปิดได้ครับ")
-                return
-
-            close_prices = all_close.iloc[-2:]
-            volume_data = all_volume.iloc[-1]
-            
-            pct_change = ((close_prices.iloc[-1] - close_prices.iloc[-2]) / close_prices.iloc[-2]) * 100
-            
-            market_summary = pd.DataFrame({
-                'Ticker': pct_change.index,
-                'Price': all_close.iloc[-1],
-                'Change (%)': pct_change,
-                'Volume': volume_data
-            }).dropna()
 
             # Summary statistics
-            gainers = (market_summary['Change (%)'] > 0).sum()
-            losers = (market_summary['Change (%)'] < 0).sum()
-            avg_change = market_summary['Change (%)'].mean()
+            gainers = snapshot.gainers
+            losers = snapshot.losers
+            avg_change = snapshot.avg_change
             
             # Top N lists
-            top_gainers = market_summary.sort_values(by='Change (%)', ascending=False).head(top_n)
-            top_losers = market_summary.sort_values(by='Change (%)', ascending=True).head(top_n)
-            most_active = market_summary.sort_values(by='Volume', ascending=False).head(top_n)
+            top_gainers = snapshot.top_gainers(top_n)
+            top_losers = snapshot.top_losers(top_n)
+            most_active = snapshot.most_active(top_n)
 
             # Create embed
             embed_color = discord.Color.green() if avg_change >= 0 else discord.Color.red()
             embed = discord.Embed(
                 title="📊 สรุปข้อมูลตลาดหุ้นวันนี้ (S&P 500)",
-                description=f"ข้อมูลล่าสุดเมื่อ: {datetime.date.today().strftime('%d/%m/%Y')}",
+                description=f"ข้อมูลล่าสุดเมื่อ: {snapshot.updated_at.astimezone().strftime('%d/%m/%Y %H:%M')}",
                 color=embed_color
             )
             
@@ -123,6 +78,7 @@ def setup(bot: discord.Bot):
 
         except Exception as e:
             logger.error(f"Error in /marketdata: {e}", exc_info=True)
+            record_command_error(ctx, e)
             await ctx.edit(content=f"เกิดข้อผิดพลาดขณะสรุปข้อมูลตลาดครับ: {e}")
     
     logger.info("Market command registered")
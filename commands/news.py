@@ -4,11 +4,9 @@ Display latest news for a stock with Thai translation
 """
 import discord
 from discord.commands import slash_command, Option
-import yfinance as yf
-import datetime
+from utils.instrumentation import record_command_error
+from utils.lazy import load_module
 from utils.logger import setup_logger
-from utils.translator import translate_to_thai
-from config import Config
 
 logger = setup_logger(__name__)
 
@@ -27,10 +25,10 @@ def setup(bot: discord.Bot):
         await ctx.defer()
 
         try:
-            ticker = yf.Ticker(symbol.upper())
-            news_list = ticker.news
+            news_feed = (await load_module('utils.news_feed')).news_feed
+            entries = await news_feed.get(symbol)
 
-            if not news_list:
+            if not entries:
                 await ctx.respond(f"❌ ไม่พบข่าวสำหรับ '{symbol}' ครับ")
                 return
 
@@ -40,77 +38,28 @@ def setup(bot: discord.Bot):
             )
 
             count = 0
-            for item in news_list:
-                if count >= limit:
-                    break
-                
-                content = item.get('content', {})
-                
-                title = content.get('title', 'ไม่มีหัวข้อ')
-                summary = content.get('summary', '')
-                publisher = content.get('provider', {}).get('displayName', 'N/A')
-                
-                # Translate title and summary
-                title_th = translate_to_thai(title) if title else 'ไม่มีหัวข้อ'
-                summary_th = translate_to_thai(summary) if summary else ''
-                
-                # Get URL
-                link = None
-                click_url = content.get('clickThroughUrl')
-                if click_url and isinstance(click_url, dict):
-                    link = click_url.get('url')
-                
-                if not link:
-                    canonical_url = content.get('canonicalUrl')
-                    if canonical_url and isinstance(canonical_url, dict):
-                        link = canonical_url.get('url')
-                
-                if not link:
-                    link = content.get('previewUrl')
-                
-                if not link:
-                    link = '#'
+            for entry in entries[:limit]:
+                title_th = entry['title_th']
+                summary_th = entry['summary_th']
                 
                 if not title_th or str(title_th).strip() == '':
                     continue
                 
                 title_th = str(title_th)
-                link = str(link) if link else '#'
-                publisher = str(publisher) if publisher else 'N/A'
-                
-                # Parse publish time
-                publish_time = "N/A"
-                pub_date = content.get('pubDate') or content.get('displayTime')
-                if pub_date:
-                    try:
-                        dt = datetime.datetime.fromisoformat(pub_date.replace('Z', '+00:00'))
-                        publish_time = dt.strftime('%d/%m/%Y %H:%M')
-                    except:
-                        publish_time = "N/A"
 
-                description = f"**สำนักข่าว:** {publisher}\n**เวลาเผยแพร่:** {publish_time}\n"
+                description = f"**สำนักข่าว:** {entry['publisher']}\n**เวลาเผยแพร่:** {entry['publish_time']}\n"
                 if summary_th:
                     description += f"{summary_th[:200]}...\n"
                 
-                # Get thumbnail
-                thumbnail_url = None
-                thumbnail = content.get('thumbnail')
-                if thumbnail and isinstance(thumbnail, dict):
-                    resolutions = thumbnail.get('resolutions', [])
-                    if resolutions and len(resolutions) > 0:
-                        thumbnail_url = resolutions[0].get('url')
-                    elif thumbnail.get('originalUrl'):
-                        thumbnail_url = thumbnail.get('originalUrl')
-                
                 display_title = title_th[:250] + "..." if len(title_th) > 250 else title_th
                 
                 try:
-                    if count == 0 and thumbnail_url:
-                        embed.set_thumbnail(url=thumbnail_url)
+                    if count == 0 and entry['thumbnail']:
+                        embed.set_thumbnail(url=entry['thumbnail'])
                     
                     embed.add_field(
                         name=f"▶️ {display_title}",
-                        value=f"{description}[🔗 อ่านข่าวเต็ม]({link})",
+                        value=f"{description}[🔗 อ่านข่าวเต็ม]({entry['link']})",
                         inline=False
                     )
                     count += 1
@@ -128,6 +77,7 @@ def setup(bot: discord.Bot):
 
         except Exception as e:
             logger.error(f"Error in /news {symbol}: {e}", exc_info=True)
+            record_command_error(ctx, e)
             await ctx.respond(f"เกิดข้อผิดพลาดขณะดึงข่าว {symbol} ครับ: {e}")
     
     logger.info("News command registered")
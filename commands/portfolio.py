@@ -0,0 +1,290 @@
+"""
+Portfolio analytics commands
+/portfolio: correlation, volatility, beta vs SPY and efficient frontier for a
+set of symbols; /sp500corr: sector correlation of the whole S&P 500 (admins)
+"""
+import discord
+from discord.commands import slash_command, Option
+import io
+import zlib
+from typing import List, Optional, Tuple
+import numpy as np
+from config import Config
+from utils.charts import render_cached, render_correlation_heatmap, render_portfolio_chart
+from utils.executor import run_blocking
+from utils.instrumentation import record_command_error, timed
+from utils.lazy import load_modules
+from utils.logger import setup_logger
+from utils.symbols import parse_symbols
+
+logger = setup_logger(__name__)
+
+BENCHMARK = 'SPY'
+
+PORTFOLIO_PERIODS = {
+    "6 เดือน": "6mo",
+    "1 ปี": "1y",
+    "2 ปี": "2y",
+    "5 ปี": "5y"
+}
+
+
+def parse_weights(text: Optional[str], count: int) -> List[float]:
+    """
+    Parse a comma/space separated weight list
+
+    Args:
+        text: User input, e.g. "50, 30, 20" (any scale; normalized later),
+            or None for equal weights
+        count: Number of symbols the weights belong to
+
+    Returns:
+        One weight per symbol
+
+    Raises:
+        ValueError: If the list is malformed, negative or the wrong length
+    """
+    if not text:
+        return [1.0] * count
+    try:
+        weights = [float(part.rstrip('%')) for part in text.replace(',', ' ').split()]
+    except ValueError:
+        raise ValueError("น้ำหนักต้องเป็นตัวเลข") from None
+    if len(weights) != count:
+        raise ValueError(f"ต้องระบุน้ำหนัก {count} ค่า (ได้รับ {len(weights)} ค่า)")
+    if any(w < 0 or not np.isfinite(w) for w in weights) or sum(weights) <= 0:
+        raise ValueError("น้ำหนักต้องไม่ติดลบและรวมกันมากกว่า 0")
+    return weights
+
+
+# Fewer overlapping trading days than this make annualized figures meaningless
+MIN_COMMON_DAYS = 60
+
+# Symbols with prices on less of the period than this shorten the analysis
+MIN_COVERAGE = 0.8
+
+
+def _short_histories(closes, symbols: List[str]) -> List[Tuple[str, int]]:
+    """
+    Symbols whose history covers too little of the requested period
+
+    Returns:
+        (symbol, trading days with a price), shortest first
+    """
+    counts = closes[symbols].notna().sum()
+    short = counts[counts < MIN_COVERAGE * len(closes)].sort_values()
+    return [(symbol, int(days)) for symbol, days in short.items()]
+
+
+def _frontier_seed(symbols: List[str], last_date) -> int:
+    """Same inputs sample the same frontier, so the chart can be served from cache"""
+    return zlib.crc32(f"{','.join(symbols)}|{last_date}".encode())
+
+
+def _weights_text(weights: dict) -> str:
+    top = sorted(weights.items(), key=lambda item: item[1], reverse=True)
+    return ", ".join(f"{symbol} `{w * 100:.0f}%`" for symbol, w in top if w >= 0.005)
+
+
+def _sector_correlation(portfolio, closes, sectors: dict) -> dict:
+    """
+    Full correlation matrix ordered by sector (blocking)
+
+    Returns:
+        Dict with the ordered matrix, symbols, sector names/sizes and the
+        average within-sector correlation
+    """
+    returns = portfolio.returns_matrix(closes)
+    symbols = sorted(returns.columns, key=lambda s: (sectors.get(s) or 'Unknown', s))
+    groups = [sectors.get(s) or 'Unknown' for s in symbols]
+    corr = portfolio.correlation(returns[symbols].to_numpy()).astype(np.float32)
+    names, group_corr = portfolio.group_correlation(corr, groups)
+    sizes = [groups.count(name) for name in names]
+    n = len(symbols)
+    average = float((np.nansum(corr) - n) / (n * (n - 1))) if n > 1 else float('nan')
+    return {
+        'corr': corr,
+        'symbols': symbols,
+        'days': len(returns),
+        'sectors': names,
+        'sizes': sizes,
+        'within': np.diag(group_corr),
+        'average': average,
+    }
+
+
+def setup(bot: discord.Bot):
+    """Register portfolio commands with the bot"""
+
+    @bot.slash_command(name="portfolio", description="วิเคราะห์พอร์ตหลายหุ้น: Correlation, ความผันผวน, Beta และ Efficient Frontier")
+    async def portfolio(
+        ctx,
+        symbols: Option(str, "สัญลักษณ์หุ้นคั่นด้วยจุลภาคหรือเว้นวรรค เช่น AAPL, MSFT, NVDA", required=True),
+        weights: Option(str, "น้ำหนักแต่ละตัวตามลำดับ เช่น 50, 30, 20 (ไม่ระบุ = เท่ากัน)", required=False, default=None),
+        period: Option(str, "ช่วงข้อมูลย้อนหลัง", choices=list(PORTFOLIO_PERIODS), default="1 ปี")
+    ):
+        """Correlation and risk/return analytics for a weighted set of symbols"""
+        logger.info(f"/portfolio {symbols} command used by {ctx.author}")
+
+        try:
+            symbol_list = parse_symbols(symbols)
+        except ValueError as e:
+            await ctx.respond(f"❌ สัญลักษณ์ '{e}' ไม่ถูกต้องครับ", ephemeral=True)
+            return
+        if not 2 <= len(symbol_list) <= Config.PORTFOLIO_MAX_SYMBOLS:
+            await ctx.respond(f"❌ กรุณาระบุหุ้น 2 - {Config.PORTFOLIO_MAX_SYMBOLS} ตัวครับ", ephemeral=True)
+            return
+        try:
+            weight_list = parse_weights(weights, len(symbol_list))
+        except ValueError as e:
+            await ctx.respond(f"❌ น้ำหนักไม่ถูกต้อง: {e}", ephemeral=True)
+            return
+
+        await ctx.defer()
+
+        try:
+            market_data, engine, risk = await load_modules('utils.market_data', 'analytics.portfolio', 'analytics.risk')
+            closes = await market_data.get_closes(symbol_list + [BENCHMARK], period=PORTFOLIO_PERIODS[period])
+            missing = [s for s in symbol_list if s not in closes.columns]
+            if missing:
+                await ctx.respond(f"❌ ไม่พบข้อมูลราคาย้อนหลังสำหรับ {', '.join(missing)} ครับ")
+                return
+            benchmark = closes[BENCHMARK] if BENCHMARK in closes.columns else None
+
+            # Returns are taken on common dates, so the shortest history sets the window
+            short = _short_histories(closes, symbol_list)
+            common_days = len(closes[symbol_list].dropna())
+            if common_days < MIN_COMMON_DAYS:
+                limiting = ", ".join(f"{symbol} ({days} วัน)" for symbol, days in short) or "ข้อมูลไม่ตรงกัน"
+                await ctx.respond(f"❌ ช่วงที่มีราคาครบทุกตัวมีเพียง {common_days} วันเทรด "
+                                  f"ซึ่งไม่พอสำหรับวิเคราะห์ครับ (ถูกจำกัดโดย {limiting})")
+                return
+
+            with timed('analytics', 'portfolio'):
+                analysis = await run_blocking(
+                    engine.analyze, closes[symbol_list], weight_list, benchmark,
+                    Config.PORTFOLIO_FRONTIER_SAMPLES, _frontier_seed(symbol_list, closes.index[-1])
+                )
+            growth = np.cumprod(1.0 + analysis.portfolio_returns)
+            drawdown = risk.max_drawdown(growth)
+            best, safest = analysis.best_sharpe(), analysis.min_volatility()
+
+            embed = discord.Embed(
+                title=f"📊 Portfolio Analysis: {len(symbol_list)} หุ้น",
+                description=(
+                    f"ข้อมูลรายวันย้อนหลัง **{period}** (`{analysis.days}` วันเทรด)\n"
+                    f"น้ำหนัก: {_weights_text(dict(zip(symbol_list, analysis.weights)))}"
+                    + (f"\n⚠️ ช่วงข้อมูลสั้นกว่า {period} เพราะ "
+                       + ", ".join(f"{symbol} มีข้อมูลเพียง {days} วันเทรด" for symbol, days in short)
+                       if short else "")
+                ),
+                color=discord.Color.green() if analysis.expected_return >= 0 else discord.Color.red()
+            )
+            embed.add_field(name="💼 ภาพรวมพอร์ต", value=(
+                f"ผลตอบแทนต่อปี (เฉลี่ย): `{analysis.expected_return * 100:+.2f}%`\n"
+                f"ความผันผวนต่อปี: `{analysis.portfolio_volatility * 100:.2f}%`\n"
+                f"Sharpe Ratio: `{analysis.sharpe:.2f}`\n"
+                f"Beta vs {BENCHMARK}: `{analysis.portfolio_beta:.2f}`\n"
+                f"Max Drawdown: `{drawdown * 100:.2f}%`\n"
+                f"Correlation เฉลี่ย: `{analysis.average_correlation:.2f}`"
+            ), inline=True)
+
+            most, least = analysis.pairs(3)
+            embed.add_field(name="🔗 คู่ที่สัมพันธ์กัน", value=(
+                "**สูงสุด**\n" + "\n".join(f"{a}/{b}: `{c:.2f}`" for a, b, c in most)
+                + "\n**ต่ำสุด**\n" + "\n".join(f"{a}/{b}: `{c:.2f}`" for a, b, c in least)
+            ), inline=True)
+
+            rows = [f"{'':<7}{'Ret':>8}{'Vol':>8}{'Beta':>6}"]
+            for i, symbol in enumerate(symbol_list[:15]):
+                rows.append(f"{symbol[:6]:<7}{analysis.mean[i] * 100:>+7.1f}%{analysis.volatility[i] * 100:>7.1f}%"
+                            f"{analysis.betas[i]:>6.2f}")
+            if len(symbol_list) > 15:
+                rows.append(f"... และอีก {len(symbol_list) - 15} ตัว")
+            embed.add_field(name="📈 รายตัว (ต่อปี)", value="```\n" + "\n".join(rows) + "\n```", inline=False)
+
+            embed.add_field(name="⭐ Sharpe สูงสุด (จากการสุ่ม)", value=(
+                f"ผลตอบแทน `{best['return'] * 100:+.2f}%` ความผันผวน `{best['volatility'] * 100:.2f}%`\n"
+                f"{_weights_text(best['weights'])}"
+            ), inline=False)
+            embed.add_field(name="🛡️ ความผันผวนต่ำสุด (จากการสุ่ม)", value=(
+                f"ผลตอบแทน `{safest['return'] * 100:+.2f}%` ความผันผวน `{safest['volatility'] * 100:.2f}%`\n"
+                f"{_weights_text(safest['weights'])}"
+            ), inline=False)
+            embed.set_footer(text=f"Frontier จากพอร์ตสุ่ม {len(analysis.frontier_returns):,} แบบ • "
+                                  "ผลตอบแทนในอดีตไม่ได้รับประกันผลในอนาคต")
+
+            points = {
+                'Portfolio': (analysis.portfolio_volatility, analysis.expected_return),
+                'Max Sharpe': (best['volatility'], best['return']),
+                'Min Volatility': (safest['volatility'], safest['return']),
+            }
+            png = await render_cached(
+                render_portfolio_chart, symbol_list, analysis.correlation,
+                analysis.frontier_volatility, analysis.frontier_returns, points
+            )
+            discord_file = discord.File(io.BytesIO(png), filename="portfolio.png")
+            embed.set_image(url="attachment://portfolio.png")
+            await ctx.respond(file=discord_file, embed=embed)
+            logger.info(f"Portfolio analysis sent for {', '.join(symbol_list)}")
+
+        except Exception as e:
+            logger.error(f"Error in /portfolio {symbols}: {e}", exc_info=True)
+            record_command_error(ctx, e)
+            await ctx.respond(f"เกิดข้อผิดพลาดขณะวิเคราะห์พอร์ตครับ: {e}")
+
+    @bot.slash_command(name="sp500corr", description="Correlation ของหุ้นทั้ง S&P 500 แยกตามกลุ่มอุตสาหกรรม (สำหรับผู้ดูแล)")
+    @discord.default_permissions(administrator=True)
+    async def sp500corr(
+        ctx,
+        period: Option(str, "ช่วงข้อมูลย้อนหลัง", choices=list(PORTFOLIO_PERIODS), default="1 ปี")
+    ):
+        """Sector-ordered correlation matrix of every S&P 500 constituent"""
+        logger.info(f"/sp500corr command used by {ctx.author}")
+        await ctx.defer()
+
+        try:
+            market_data, engine, sp500 = await load_modules('utils.market_data', 'analytics.portfolio', 'utils.sp500')
+            symbols = await run_blocking(sp500.get_sp500_symbols)
+            if not symbols:
+                await ctx.respond("❌ ไม่สามารถดึงรายชื่อหุ้น S&P 500 ได้ครับ")
+                return
+
+            closes = await market_data.get_closes(symbols, period=PORTFOLIO_PERIODS[period])
+            sectors = {s: (sp500.sp500_index.get(s) or {}).get('sector') for s in symbols}
+            with timed('analytics', 'sp500corr'):
+                result = await run_blocking(_sector_correlation, engine, closes, sectors)
+            if len(result['symbols']) < 2:
+                await ctx.respond("❌ ข้อมูลราคาไม่เพียงพอสำหรับคำนวณ Correlation ครับ")
+                return
+
+            embed = discord.Embed(
+                title="🧮 S&P 500 Correlation",
+                description=(
+                    f"`{len(result['symbols'])}` หุ้น (จาก `{len(symbols)}`), `{result['days']}` วันเทรด ({period})\n"
+                    f"Correlation เฉลี่ยทั้งตลาด: `{result['average']:.2f}`"
+                ),
+                color=discord.Color.blurple()
+            )
+            ranked = sorted(zip(result['sectors'], result['sizes'], result['within']),
+                            key=lambda row: np.nan_to_num(row[2], nan=-2), reverse=True)
+            rows = [f"{'Sector':<24}{'n':>4}{'corr':>7}"]
+            rows += [f"{name[:23]:<24}{size:>4}{within:>7.2f}" for name, size, within in ranked]
+            embed.add_field(name="🏭 Correlation ภายในกลุ่ม", value="```\n" + "\n".join(rows) + "\n```", inline=False)
+            embed.set_footer(text="หุ้นที่มีข้อมูลไม่ครบ 90% ของช่วงเวลาจะถูกตัดออก")
+
+            png = await render_cached(
+                render_correlation_heatmap, f"S&P 500 Correlation ({PORTFOLIO_PERIODS[period]})",
+                result['corr'], result['sectors'], result['sizes']
+            )
+            discord_file = discord.File(io.BytesIO(png), filename="sp500corr.png")
+            embed.set_image(url="attachment://sp500corr.png")
+            await ctx.respond(file=discord_file, embed=embed)
+            logger.info(f"S&P 500 correlation sent ({len(result['symbols'])} symbols)")
+
+        except Exception as e:
+            logger.error(f"Error in /sp500corr: {e}", exc_info=True)
+            record_command_error(ctx, e)
+            await ctx.respond(f"เกิดข้อผิดพลาดขณะคำนวณ Correlation ครับ: {e}")
+
+    logger.info("Portfolio commands registered")
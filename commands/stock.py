@@ -2,9 +2,11 @@
 Stock information command
 Display current stock price and basic information
 """
+import asyncio
 import discord
 from discord.commands import slash_command, Option
-import yfinance as yf
+from utils.instrumentation import record_command_error
+from utils.lazy import load_module
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -28,8 +30,14 @@ def setup(bot: discord.Bot):
         await ctx.defer()
         
         try:
-            ticker = yf.Ticker(symbol.upper())
-            info = ticker.info
+            market_data = await load_module('utils.market_data')
+            fundamentals, quote = await asyncio.gather(
+                market_data.get_fundamentals(symbol), market_data.get_quote(symbol)
+            )
+            if 'currentPrice' not in quote and fundamentals:
+                # No chart data from fast_info: take the prices from the full payload
+                quote = await market_data.get_info(symbol)
+            info = {**quote, **fundamentals}
             
             if 'shortName' not in info or info['shortName'] is None:
                 logger.warning(f"Stock symbol not found: {symbol}")
@@ -66,6 +74,7 @@ def setup(bot: discord.Bot):
             
         except Exception as e:
             logger.error(f"Error in /stock {symbol}: {e}", exc_info=True)
+            record_command_error(ctx, e)
             await ctx.respond(f"เกิดข้อผิดพลาดขณะดึงข้อมูล {symbol} ครับ")
     
     logger.info("Stock command registered")
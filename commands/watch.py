@@ -0,0 +1,157 @@
+"""
+Live price watch commands
+/watch posts a message that keeps updating with the latest prices, fed by
+the shared quote poller
+"""
+import discord
+from discord.commands import slash_command, Option
+from typing import Dict
+from config import Config
+from utils.instrumentation import record_command_error
+from utils.logger import setup_logger
+from utils.quote_poller import Quote, Subscription, quote_poller
+from utils.symbols import parse_symbols
+
+logger = setup_logger(__name__)
+
+
+def _format_quote(quote: Quote) -> str:
+    lines = [f"**${quote.price:,.2f}**"]
+    if quote.change is not None:
+        sign = "+" if quote.change >= 0 else ""
+        arrow = "🟢" if quote.change >= 0 else "🔴"
+        lines[0] += f" {arrow} {sign}{quote.change:.2f} ({sign}{quote.change_percent:.2f}%)"
+    if quote.day_low is not None and quote.day_high is not None:
+        lines.append(f"ช่วงวันนี้ ${quote.day_low:,.2f} - ${quote.day_high:,.2f}")
+    if quote.volume is not None:
+        lines.append(f"Volume {quote.volume:,}")
+    return "\n".join(lines)
+
+
+def build_embed(subscription: Subscription, quotes: Dict[str, Quote], final: bool = False) -> discord.Embed:
+    """
+    Render the live quote message for a subscription
+
+    Args:
+        subscription: Watch being displayed
+        quotes: Latest quotes keyed by symbol
+        final: Whether the watch has ended
+
+    Returns:
+        Discord embed
+    """
+    shown = [quotes[s] for s in subscription.symbols if s in quotes]
+    if final:
+        color = discord.Color.light_grey()
+    elif len(shown) == 1 and shown[0].change is not None:
+        color = discord.Color.green() if shown[0].change >= 0 else discord.Color.red()
+    else:
+        color = discord.Color.blue()
+
+    embed = discord.Embed(title="📡 ติดตามราคาแบบเรียลไทม์", color=color)
+    for symbol in subscription.symbols:
+        quote = quotes.get(symbol)
+        embed.add_field(name=symbol, value=_format_quote(quote) if quote else "ไม่พบข้อมูล", inline=True)
+
+    expires = discord.utils.format_dt(subscription.expires_at, 'R')
+    if final:
+        embed.description = "⏹️ หยุดติดตามแล้ว"
+    else:
+        embed.description = f"อัปเดตทุก {Config.WATCH_POLL_INTERVAL:g} วินาที • สิ้นสุด {expires}"
+    embed.set_footer(text=f"Watch #{subscription.id} • /unwatch เพื่อหยุด")
+    embed.timestamp = discord.utils.utcnow()
+    return embed
+
+
+def setup(bot: discord.Bot):
+    """Register watch commands with the bot"""
+
+    @bot.slash_command(name="watch", description="ติดตามราคาหุ้นแบบเรียลไทม์ในช่องนี้")
+    async def watch(
+        ctx,
+        symbols: Option(str, f"สัญลักษณ์หุ้น คั่นด้วยเว้นวรรคหรือจุลภาค (สูงสุด {Config.WATCH_MAX_SYMBOLS} ตัว)",
+                        required=True),
+        minutes: Option(int, "ระยะเวลาติดตาม (นาที)", required=False, default=60,
+                        min_value=1, max_value=Config.WATCH_MAX_MINUTES)
+    ):
+        """
+        Post a message that updates with live prices
+
+        Args:
+            symbols: Ticker symbols to watch
+            minutes: How long to keep updating
+        """
+        logger.info(f"/watch {symbols} ({minutes}m) command used by {ctx.author}")
+
+        try:
+            symbol_list = parse_symbols(symbols)
+        except ValueError as e:
+            await ctx.respond(f"❌ สัญลักษณ์ '{e}' ไม่ถูกต้องครับ", ephemeral=True)
+            return
+        if not symbol_list:
+            await ctx.respond("❌ กรุณาระบุสัญลักษณ์หุ้นอย่างน้อย 1 ตัวครับ", ephemeral=True)
+            return
+        if len(symbol_list) > Config.WATCH_MAX_SYMBOLS:
+            await ctx.respond(f"❌ ติดตามได้สูงสุด {Config.WATCH_MAX_SYMBOLS} ตัวต่อข้อความครับ", ephemeral=True)
+            return
+
+        limit = quote_poller.can_subscribe(ctx.channel_id)
+        if limit == 'channel':
+            await ctx.respond(f"❌ ช่องนี้มีการติดตามครบ {Config.WATCH_MAX_PER_CHANNEL} รายการแล้ว "
+                              "ใช้ /unwatch เพื่อหยุดรายการเดิมก่อนครับ", ephemeral=True)
+            return
+        if limit == 'global':
+            await ctx.respond("❌ ขณะนี้มีการติดตามราคาเต็มจำนวนแล้ว กรุณาลองใหม่ภายหลังครับ", ephemeral=True)
+            return
+
+        await ctx.defer(ephemeral=True)
+
+        try:
+            quotes = await quote_poller.quotes_for(symbol_list)
+            if not any(s in quotes for s in symbol_list):
+                await ctx.respond(f"❌ ไม่พบข้อมูลราคาสำหรับ {', '.join(symbol_list)} ครับ")
+                return
+
+            message = None
+
+            async def on_update(subscription: Subscription, latest: Dict[str, Quote], final: bool):
+                try:
+                    await message.edit(embed=build_embed(subscription, latest, final))
+                except (discord.NotFound, discord.Forbidden) as e:
+                    raise LookupError(f"watch message unavailable: {e}") from e
+
+            subscription = Subscription(ctx.channel_id, ctx.author.id, symbol_list, minutes, on_update)
+            subscription.last_key = subscription.quotes_key(quotes)
+            # Interaction tokens expire after 15 minutes, so the live message is a
+            # regular channel message the bot can keep editing
+            message = await ctx.channel.send(embed=build_embed(subscription, quotes))
+            quote_poller.add(subscription)
+
+            await ctx.respond(f"✅ เริ่มติดตาม {', '.join(symbol_list)} เป็นเวลา {minutes} นาทีแล้วครับ")
+
+        except discord.Forbidden:
+            await ctx.respond("❌ บอทไม่มีสิทธิ์ส่งข้อความในช่องนี้ครับ")
+        except Exception as e:
+            logger.error(f"Error in /watch {symbols}: {e}", exc_info=True)
+            record_command_error(ctx, e)
+            await ctx.respond("เกิดข้อผิดพลาดขณะเริ่มติดตามราคาครับ")
+
+    @bot.slash_command(name="unwatch", description="หยุดติดตามราคาในช่องนี้")
+    async def unwatch(ctx):
+        """Stop your live price messages in this channel (or all of them with Manage Messages)"""
+        logger.info(f"/unwatch command used by {ctx.author}")
+
+        subscriptions = quote_poller.for_channel(ctx.channel_id)
+        manage = ctx.author.guild_permissions.manage_messages if ctx.guild else False
+        if not manage:
+            subscriptions = [s for s in subscriptions if s.owner_id == ctx.author.id]
+
+        if not subscriptions:
+            await ctx.respond("ไม่มีการติดตามราคาของคุณในช่องนี้ครับ", ephemeral=True)
+            return
+
+        for subscription in subscriptions:
+            await quote_poller.remove(subscription)
+        await ctx.respond(f"⏹️ หยุดติดตามแล้ว {len(subscriptions)} รายการครับ", ephemeral=True)
+
+    logger.info("Watch commands registered")
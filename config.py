@@ -21,12 +21,101 @@ class Config:
     MAX_NEWS_ITEMS = 10
     MAX_MARKET_DATA_STOCKS = 503  # S&P 500
     
-    # Cache settings (for future optimization)
-    CACHE_ENABLED = True
-    CACHE_TTL = 300  # 5 minutes
+    # Outbound HTTP (shared aiohttp / requests sessions)
+    HTTP_TIMEOUT = int(os.getenv('HTTP_TIMEOUT', '15'))
+    HTTP_MAX_CONNECTIONS = 50
+    HTTP_MAX_CONNECTIONS_PER_HOST = 10
+    HTTP_DNS_CACHE_TTL = 300
+    
+    # Health check / metrics web server (Render sets PORT)
+    WEB_HOST = os.getenv('WEB_HOST', '0.0.0.0')
+    WEB_PORT = int(os.getenv('PORT', '10000'))
+    
+    # Local data directory for snapshots and stores
+    DATA_DIR = os.getenv('DATA_DIR', 'data')
+    
+    # S&P 500 constituent index
+    SP500_SNAPSHOT_PATH = os.path.join(DATA_DIR, 'sp500.json')
+    SP500_REFRESH_INTERVAL = int(os.getenv('SP500_REFRESH_INTERVAL', str(24 * 60 * 60)))  # 1 day
+    
+    # Background S&P 500 market snapshot (/marketdata)
+    MARKET_SNAPSHOT_INTERVAL = int(os.getenv('MARKET_SNAPSHOT_INTERVAL', '300'))  # during market hours
+    MARKET_SNAPSHOT_MAX_AGE = 6 * 60 * 60  # force a refresh after 6 hours regardless of session
+    
+    # Local OHLCV store for daily history (/dca, /probability)
+    PRICE_STORE_DIR = os.path.join(DATA_DIR, 'ohlcv')
+    PRICE_STORE_TAIL_TTL = int(os.getenv('PRICE_STORE_TAIL_TTL', '300'))  # re-check latest bars after 5 minutes
+    
+    # Streaming risk/indicator state per symbol, advanced with new bars
+    SERIES_CACHE_TTL = 24 * 60 * 60
+    SERIES_CACHE_MAX_ENTRIES = int(os.getenv('SERIES_CACHE_MAX_ENTRIES', '128'))
+    
+    # Monte Carlo projection in /probability
+    MONTE_CARLO_PATHS = int(os.getenv('MONTE_CARLO_PATHS', '50000'))
+    MONTE_CARLO_CONCURRENCY = int(os.getenv('MONTE_CARLO_CONCURRENCY', '2'))  # each run holds a ~50 MB path matrix
+    
+    # /backtest parameter sweep worker processes (0 = run in the I/O thread pool)
+    SWEEP_WORKERS = int(os.getenv('SWEEP_WORKERS', '2'))
+    BACKTEST_MAX_SYMBOLS = 10
+    
+    # Chart rendering worker processes (0 = render in the I/O thread pool)
+    CHART_WORKERS = int(os.getenv('CHART_WORKERS', '1'))
+    
+    # Rendered chart cache (set CHART_CACHE_DIR to also keep PNGs on disk)
+    CHART_CACHE_TTL = 24 * 60 * 60
+    CHART_CACHE_MAX_ENTRIES = int(os.getenv('CHART_CACHE_MAX_ENTRIES', '64'))
+    CHART_CACHE_DIR = os.getenv('CHART_CACHE_DIR', '')
+    CHART_CACHE_MAX_FILES = 500
+    
+    # Bulk multi-symbol downloads (keep concurrency below EXECUTOR_MAX_WORKERS)
+    BULK_RATE_LIMIT = float(os.getenv('BULK_RATE_LIMIT', '50'))  # symbols per second
+    BULK_CONCURRENCY = int(os.getenv('BULK_CONCURRENCY', '4'))
+    BULK_CHUNK_SIZE = 25
+    BULK_MIN_CHUNK = 5
+    BULK_MAX_CHUNK = 100
+    BULK_MAX_RETRIES = 3
+    BULK_BACKOFF = 2.0  # seconds, doubled on each retry
+    BULK_DOWNLOAD_THRESHOLD = 50  # more symbols than this use the bulk downloader
+    CLOSES_CACHE_TTL = 6 * 60 * 60  # bulk close tables (e.g. S&P 500 correlation)
+    
+    # /portfolio
+    PORTFOLIO_MAX_SYMBOLS = int(os.getenv('PORTFOLIO_MAX_SYMBOLS', '30'))
+    PORTFOLIO_FRONTIER_SAMPLES = 5000
+    
+    # Market data cache settings
+    CACHE_ENABLED = os.getenv('CACHE_ENABLED', 'true').lower() == 'true'
+    CACHE_TTL = int(os.getenv('CACHE_TTL', '300'))  # 5 minutes
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '512'))
+    QUOTE_CACHE_TTL = int(os.getenv('QUOTE_CACHE_TTL', '60'))  # /stock price, change, range, volume
+    FUNDAMENTALS_CACHE_TTL = 6 * 60 * 60  # name, market cap, P/E
     
     # Translation settings
     TRANSLATION_MAX_LENGTH = 5000
+    TRANSLATION_CACHE_PATH = os.path.join(DATA_DIR, 'translations.sqlite3')
+    
+    # Background news ingestion (/news)
+    NEWS_WATCHLIST = [s.strip().upper() for s in os.getenv(
+        'NEWS_WATCHLIST', 'AAPL,MSFT,NVDA,TSLA,AMZN,GOOGL,META,SPY'
+    ).split(',') if s.strip()]
+    NEWS_POLL_INTERVAL = int(os.getenv('NEWS_POLL_INTERVAL', '300'))
+    NEWS_RECENT_TTL = 60 * 60  # keep polling tickers queried within the last hour
+    NEWS_RECENT_MAX = int(os.getenv('NEWS_RECENT_MAX', '50'))  # least recently queried are dropped beyond this
+    NEWS_POLL_CONCURRENCY = 3
+    
+    # /watch live quotes (one batched fetch per interval for all watched symbols)
+    WATCH_POLL_INTERVAL = int(os.getenv('WATCH_POLL_INTERVAL', '30'))  # seconds
+    WATCH_MAX_SYMBOLS = 10  # per watch message
+    WATCH_MAX_PER_CHANNEL = 3
+    WATCH_MAX_SUBSCRIPTIONS = 200
+    WATCH_MAX_MINUTES = 240
+    
+    # Worker pool for blocking network calls (yfinance, requests)
+    EXECUTOR_MAX_WORKERS = int(os.getenv('EXECUTOR_MAX_WORKERS', '8'))
+    
+    # Event loop watchdog: logs the command and stack that block the loop
+    WATCHDOG_ENABLED = os.getenv('WATCHDOG_ENABLED', 'true').lower() == 'true'
+    WATCHDOG_THRESHOLD = float(os.getenv('WATCHDOG_THRESHOLD', '0.5'))  # seconds
+    LOOP_MONITOR_INTERVAL = 0.25  # seconds between event loop lag samples
     
     @classmethod
     def validate(cls):
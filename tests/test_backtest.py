@@ -0,0 +1,75 @@
+"""
+Backtester checks
+Strategy results compared with straightforward recomputations
+"""
+import numpy as np
+import pytest
+from analytics import backtest
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(7)
+    return 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, 600)))
+
+
+def test_lump_sum_roi_is_price_ratio(prices):
+    result = backtest.sweep(prices, 'lump_sum')
+    assert result.roi[0] == pytest.approx(prices[-1] / prices[0] - 1)
+
+
+def test_lump_sum_fee_scales_equity(prices):
+    result = backtest.sweep(prices, 'lump_sum', fee_pct=1.0)
+    assert result.roi[0] == pytest.approx(0.99 * prices[-1] / prices[0] - 1)
+
+
+def test_dca_matches_loop(prices):
+    capital, interval = 10_000.0, 21
+    days = range(0, len(prices), interval)
+    shares = sum(capital / len(days) / prices[day] for day in days)
+    result = backtest.sweep(prices, 'dca', [(interval,)], capital=capital)
+    assert result.roi[0] == pytest.approx(shares * prices[-1] / capital - 1)
+    assert result.trades[0] == len(days)
+
+
+def test_zero_threshold_dip_is_monthly_dca(prices):
+    dip = backtest.equity_curves(prices, 'buy_the_dip', [(0.0, 20)])[0]
+    dca = backtest.equity_curves(prices, 'dca', [(backtest.DIP_INTERVAL,)])[0]
+    np.testing.assert_allclose(dip, dca)
+
+
+def test_ma_crossover_matches_loop(prices):
+    fast, slow = 10, 40
+    equity = backtest.equity_curves(prices, 'ma_crossover', [(fast, slow)], capital=1.0, fee_pct=0.1)[0]
+
+    # Held today if yesterday's close put the fast SMA above the slow one
+    value, held, expected = 1.0, False, [1.0]
+    for day in range(1, len(prices)):
+        signal = day >= slow and prices[day - fast:day].mean() > prices[day - slow:day].mean()
+        if signal != held:
+            value *= 1 - 0.001
+            held = signal
+        if held:
+            value *= prices[day] / prices[day - 1]
+        expected.append(value)
+    np.testing.assert_allclose(equity, expected)
+
+
+def test_max_drawdown_matches_loop(prices):
+    result = backtest.sweep(prices, 'lump_sum')
+    peak, worst = prices[0], 0.0
+    for price in prices:
+        peak = max(peak, price)
+        worst = min(worst, price / peak - 1)
+    assert result.max_drawdown[0] == pytest.approx(worst)
+
+
+def test_chunked_sweep_matches_single_sweep(prices):
+    matrix = np.vstack([prices, prices[::-1]])
+    tasks = backtest.sweep_tasks(2, chunks=3)
+    sweeps = backtest.collect(tasks, [backtest.sweep_chunk(matrix, *task) for task in tasks])
+    for row in range(2):
+        for strategy, params in backtest.DEFAULT_GRIDS.items():
+            whole = backtest.sweep(matrix[row], strategy)
+            assert sweeps[row][strategy].params == params
+            np.testing.assert_allclose(sweeps[row][strategy].roi, whole.roi)
@@ -0,0 +1,102 @@
+"""
+Bulk downloader checks
+Batching, retries and rate limiting against a fake Ticker
+"""
+import asyncio
+import threading
+import time
+import types
+import pandas as pd
+import pytest
+from utils import bulk_download, market_data
+from utils.bulk_download import BulkDownloader, TokenBucket
+
+
+class FakeTicker:
+    """Ticker.history stand-in that records call concurrency"""
+
+    active = 0
+    peak = 0
+    calls = []
+    bad = set()
+    lock = threading.Lock()
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, **kwargs):
+        cls = FakeTicker
+        with cls.lock:
+            cls.calls.append(self.symbol)
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.01)
+        with cls.lock:
+            cls.active -= 1
+        if self.symbol in cls.bad:
+            return pd.DataFrame()
+        index = pd.date_range('2024-01-01', periods=3, tz='America/New_York')
+        return pd.DataFrame({'Close': [1.0, 2.0, 3.0], 'Volume': [10, 20, 30]}, index=index)
+
+
+@pytest.fixture
+def ticker(monkeypatch):
+    FakeTicker.active = FakeTicker.peak = 0
+    FakeTicker.calls = []
+    FakeTicker.bad = set()
+    monkeypatch.setattr(bulk_download, 'yf', types.SimpleNamespace(Ticker=FakeTicker))
+    return FakeTicker
+
+
+def _downloader(**kwargs):
+    options = dict(rate=10_000, concurrency=4, chunk_size=5, min_chunk=1, max_chunk=10, max_retries=2,
+                   backoff=0.01)
+    options.update(kwargs)
+    return BulkDownloader(**options)
+
+
+def test_downloads_every_symbol_in_concurrent_batches(ticker):
+    symbols = [f"S{i}" for i in range(40)]
+    result = asyncio.run(_downloader().download(symbols + ['s0'], period='5d'))
+    assert sorted(result.frames) == sorted(symbols)
+    assert result.failed == []
+    assert sorted(ticker.calls) == sorted(symbols)
+    assert ticker.peak > 1
+    assert result.frames['S0'].index.tz is None
+    assert sorted(result.field('Close').columns) == sorted(symbols)
+
+
+def test_does_not_wait_for_the_market_data_download_lock(ticker):
+    with market_data._download_lock:
+        result = asyncio.run(asyncio.wait_for(_downloader().download(['A', 'B']), timeout=5))
+    assert sorted(result.frames) == ['A', 'B']
+
+
+def test_bad_symbols_are_reported_without_retrying_the_batch(ticker):
+    ticker.bad = {'BAD'}
+    result = asyncio.run(_downloader().download(['A', 'B', 'C', 'BAD']))
+    assert result.failed == ['BAD']
+    assert sorted(result.frames) == ['A', 'B', 'C']
+    assert ticker.calls.count('A') == 1
+
+
+def test_throttled_batches_back_off_and_give_up(ticker):
+    ticker.bad = {'A', 'B', 'C'}
+    downloader = _downloader(chunk_size=4)
+    result = asyncio.run(downloader.download(['A', 'B', 'C', 'D']))
+    assert sorted(result.failed) == ['A', 'B', 'C']
+    # First attempt plus max_retries
+    assert ticker.calls.count('A') == 3
+    assert downloader.chunk_size < 4
+
+
+def test_token_bucket_limits_rate():
+    async def take():
+        bucket = TokenBucket(rate=200, capacity=10)
+        started = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire(10)
+        return time.monotonic() - started
+
+    # The first 10 tokens are free, the other 40 take 40 / 200 s
+    assert asyncio.run(take()) >= 0.19
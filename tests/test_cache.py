@@ -0,0 +1,77 @@
+"""
+TTL + LRU cache checks
+Expiry, eviction order and counters with a controllable clock
+"""
+import pytest
+from utils import cache
+from utils.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    store = TTLCache(ttl=10, max_entries=4)
+    store.set('a', 1)
+    clock[0] += 9.9
+    assert store.get('a') == 1
+    clock[0] += 0.2
+    assert store.get('a', 'gone') == 'gone'
+    assert len(store) == 0
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    store = TTLCache(ttl=10, max_entries=4)
+    store.set('short', 1, ttl=1)
+    store.set('long', 2)
+    clock[0] += 5
+    assert store.get('short') is None
+    assert store.get('long') == 2
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    store = TTLCache(ttl=10, max_entries=3)
+    for key in 'abc':
+        store.set(key, key)
+    store.get('a')
+    store.set('d', 'd')
+    assert store.get('b') is None
+    assert [store.get(key) for key in 'acd'] == ['a', 'c', 'd']
+    assert store.evictions == 1
+
+
+def test_overwrite_refreshes_recency_and_expiry(clock):
+    store = TTLCache(ttl=10, max_entries=2)
+    store.set('a', 1)
+    store.set('b', 2)
+    clock[0] += 8
+    store.set('a', 3)
+    store.set('c', 4)
+    clock[0] += 8
+    assert store.get('a') == 3
+    assert store.get('b') is None
+
+
+def test_stats_count_hits_and_misses(clock):
+    store = TTLCache(ttl=10, max_entries=2, name='test')
+    store.set('a', 1)
+    store.get('a')
+    store.get('a')
+    store.get('missing')
+    stats = store.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (2, 1, 1)
+    assert stats['hit_rate'] == pytest.approx(2 / 3)
+
+
+def test_pop_and_clear(clock):
+    store = TTLCache(ttl=10, max_entries=2)
+    store.set('a', 1)
+    assert store.pop('a') == 1
+    assert store.pop('a', 'none') == 'none'
+    store.set('b', 2)
+    store.clear()
+    assert len(store) == 0
@@ -0,0 +1,78 @@
+"""
+DCA engine checks
+Vectorized simulations compared with a per-installment loop
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from analytics import dca
+
+
+@pytest.fixture
+def history():
+    dates = pd.bdate_range('2022-01-03', '2024-06-28')
+    closes = 50 * np.exp(np.cumsum(np.random.default_rng(8).normal(0.0003, 0.015, len(dates))))
+    return dates, closes
+
+
+def _loop(dates, closes, start, end, amount, frequency, fee_pct, fee_fixed):
+    """Buy on the first trading day on or after each scheduled date"""
+    shares = invested = 0.0
+    for day in pd.date_range(start, end, freq=dca.FREQUENCIES[frequency]):
+        position = dates.searchsorted(day)
+        if position == len(dates):
+            continue
+        shares += max(amount - amount * fee_pct / 100 - fee_fixed, 0) / closes[position]
+        invested += amount
+    return shares, invested
+
+
+@pytest.mark.parametrize('frequency', ['daily', 'weekly', 'monthly'])
+def test_simulation_matches_loop(history, frequency):
+    dates, closes = history
+    result = dca.simulate_dca(dates, closes, '2022-02-15', '2024-06-30', 250.0, frequency,
+                              fee_pct=0.5, fee_fixed=1.0)
+    shares, invested = _loop(dates, closes, '2022-02-15', '2024-06-30', 250.0, frequency, 0.5, 1.0)
+    assert result.shares_held == pytest.approx(shares)
+    assert result.invested == pytest.approx(invested)
+    assert result.final_value == pytest.approx(shares * closes[-1])
+    assert result.roi_percent == pytest.approx((shares * closes[-1] / invested - 1) * 100)
+
+
+def test_weekend_installments_execute_on_the_next_trading_day(history):
+    dates, closes = history
+    # 2022-05-01 is a Sunday, so May's installment buys on Monday 2022-05-02
+    result = dca.simulate_dca(dates, closes, '2022-05-01', '2022-05-31', 100.0, 'monthly')
+    np.testing.assert_array_equal(result.dates, [np.datetime64('2022-05-02', 'ns')])
+    assert result.prices[0] == closes[dates.get_loc('2022-05-02')]
+
+
+def test_schedule_past_history_is_skipped(history):
+    dates, closes = history
+    result = dca.simulate_dca(dates, closes, '2024-05-01', '2024-12-31', 100.0, 'monthly')
+    assert result.installments == 2
+
+
+def test_frequencies_match_single_simulations(history):
+    dates, closes = history
+    together = dca.compare_frequencies(dates, closes, '2023-01-01', '2024-01-01', 100.0, fee_pct=0.2)
+    for frequency, result in together.items():
+        alone = dca.simulate_dca(dates, closes, '2023-01-01', '2024-01-01', 100.0, frequency, fee_pct=0.2)
+        np.testing.assert_allclose(result.total_shares, alone.total_shares)
+
+
+def test_amounts_match_single_simulations(history):
+    dates, closes = history
+    table = dca.compare_amounts(dates, closes, '2023-01-01', '2024-01-01', [10.0, 100.0, 1000.0],
+                                fee_fixed=5.0)
+    for amount, row in table.iterrows():
+        alone = dca.simulate_dca(dates, closes, '2023-01-01', '2024-01-01', amount, fee_fixed=5.0)
+        assert row['FinalValue'] == pytest.approx(alone.final_value)
+        assert row['ROI (%)'] == pytest.approx(alone.roi_percent)
+    # A fixed fee costs a larger share of small installments
+    assert table['ROI (%)'].is_monotonic_increasing
+
+
+def test_unknown_frequency_is_rejected(history):
+    with pytest.raises(ValueError):
+        dca.simulate_dca(*history, '2023-01-01', '2024-01-01', 100.0, 'hourly')
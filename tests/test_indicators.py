@@ -0,0 +1,89 @@
+"""
+Indicator checks
+Incremental IndicatorEngine updates compared with a full recompute and pandas
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from analytics import indicators
+from analytics.indicators import INDICATORS, IndicatorEngine
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(3)
+    days = 300
+    close = 20 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    spread = np.abs(rng.normal(0, 0.01, days)) * close
+    dates = pd.bdate_range('2020-01-01', periods=days).values
+    return dates, close + spread, close - spread, close, rng.integers(1_000, 50_000, days).astype(float)
+
+
+@pytest.mark.parametrize('chunks', [[300], [1] * 300, [5, 20, 30, 1, 100, 144], [60, 240]])
+def test_incremental_extend_matches_full_recompute(bars, chunks):
+    full = IndicatorEngine()
+    full.extend(*bars)
+
+    engine = IndicatorEngine()
+    start = 0
+    for size in chunks:
+        engine.extend(*(values[start:start + size] for values in bars))
+        start += size
+
+    assert len(engine) == len(full)
+    for name in INDICATORS:
+        np.testing.assert_allclose(engine.values(name), full.values(name), rtol=1e-9, equal_nan=True,
+                                   err_msg=name)
+
+
+def test_engine_matches_standalone_functions(bars):
+    _, high, low, close, volume = bars
+    engine = IndicatorEngine()
+    engine.extend(*bars)
+    np.testing.assert_allclose(engine.values('sma_fast'), indicators.sma(close, 20), equal_nan=True)
+    np.testing.assert_allclose(engine.values('rsi'), indicators.rsi(close, 14), equal_nan=True)
+    np.testing.assert_allclose(engine.values('atr'), indicators.atr(high, low, close, 14), equal_nan=True)
+    np.testing.assert_allclose(engine.values('vwap'), indicators.vwap(high, low, close, volume, 20),
+                               equal_nan=True)
+    line, signal, _ = indicators.macd(close)
+    np.testing.assert_allclose(engine.values('macd'), line, equal_nan=True)
+    np.testing.assert_allclose(engine.values('macd_signal'), signal, equal_nan=True)
+
+
+def test_sma_and_bollinger_match_pandas(bars):
+    close = pd.Series(bars[3])
+    np.testing.assert_allclose(indicators.sma(close, 20), close.rolling(20).mean(), equal_nan=True)
+    mid, upper, _ = indicators.bollinger(close, 20, 2.0)
+    np.testing.assert_allclose(mid, close.rolling(20).mean(), equal_nan=True)
+    np.testing.assert_allclose(upper - mid, 2.0 * close.rolling(20).std(ddof=0), equal_nan=True)
+
+
+def test_ema_matches_sma_seeded_recursion(bars):
+    close = bars[3]
+    alpha = 2 / 21
+    expected = np.full(len(close), np.nan)
+    expected[19] = close[:20].mean()
+    for day in range(20, len(close)):
+        expected[day] = expected[day - 1] + alpha * (close[day] - expected[day - 1])
+    np.testing.assert_allclose(indicators.ema(close, 20), expected, equal_nan=True)
+
+
+def test_warm_update_does_not_rescan_history(bars, monkeypatch):
+    engine = IndicatorEngine()
+    engine.extend(*(values[:-1] for values in bars))
+
+    sizes = []
+
+    def recording(func, size=len):
+        def wrapper(values, *args, **kwargs):
+            sizes.append(size(values))
+            return func(values, *args, **kwargs)
+        return wrapper
+
+    for name in ('_smooth', 'sma', 'true_range'):
+        monkeypatch.setattr(indicators, name, recording(getattr(indicators, name)))
+    monkeypatch.setattr(np, 'concatenate', recording(np.concatenate, lambda arrays: sum(map(len, arrays))))
+
+    engine.extend(*(values[-1:] for values in bars))
+    # The longest window (sma prepends a zero to its cumulative sum)
+    assert sizes and max(sizes) <= engine.sma_slow + 1
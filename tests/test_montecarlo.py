@@ -0,0 +1,54 @@
+"""
+Monte Carlo checks
+Seeded reproducibility and distribution sanity of the simulated paths
+"""
+import numpy as np
+import pytest
+from analytics import montecarlo
+
+
+@pytest.fixture
+def returns():
+    return np.random.default_rng(2).normal(0.0005, 0.02, 500)
+
+
+@pytest.mark.parametrize('method', montecarlo.METHODS)
+def test_same_seed_gives_same_result(returns, method):
+    first = montecarlo.simulate(returns, 100.0, horizon=40, paths=2_000, method=method, seed=9)
+    second = montecarlo.simulate(returns, 100.0, horizon=40, paths=2_000, method=method, seed=9)
+    np.testing.assert_array_equal(first.final_prices, second.final_prices)
+    np.testing.assert_array_equal(first.fan, second.fan)
+
+
+@pytest.mark.parametrize('method', montecarlo.METHODS)
+def test_fan_matches_percentiles_of_final_prices(returns, method):
+    result = montecarlo.simulate(returns, 100.0, horizon=40, paths=2_000, method=method, seed=4)
+    assert result.fan.shape == (len(montecarlo.FAN_PERCENTILES), 41)
+    assert (result.fan[:, 0] == 100.0).all()
+    np.testing.assert_allclose(result.fan[:, -1],
+                               np.percentile(result.final_prices, montecarlo.FAN_PERCENTILES), rtol=1e-5)
+    assert (result.path_max >= result.final_prices * (1 - 1e-6)).all()
+    assert (result.path_min <= result.final_prices * (1 + 1e-6)).all()
+
+
+def test_bootstrap_only_draws_historical_returns(returns):
+    # One-day horizon: every final price is the start price times one sampled return
+    result = montecarlo.simulate(returns, 1.0, horizon=1, paths=5_000, method='bootstrap', seed=1)
+    drawn = np.unique(result.final_prices.astype(float)) - 1
+    nearest = np.abs(drawn[:, None] - returns[None, :]).min(axis=1)
+    assert nearest.max() < 1e-6
+
+
+def test_gbm_drift_matches_log_returns(returns):
+    result = montecarlo.simulate(returns, 100.0, horizon=20, paths=50_000, method='gbm', seed=3)
+    log_returns = np.log1p(returns)
+    # Four standard errors of the mean of 50,000 sums of 20 daily draws
+    tolerance = 4 * log_returns.std() * np.sqrt(20 / 50_000)
+    assert np.log(result.final_prices / 100.0).mean() == pytest.approx(log_returns.mean() * 20, abs=tolerance)
+
+
+def test_nan_returns_are_ignored(returns):
+    gapped = np.concatenate(([np.nan], returns, [np.nan]))
+    clean = montecarlo.simulate(returns, 100.0, horizon=10, paths=500, seed=6)
+    gaps = montecarlo.simulate(gapped, 100.0, horizon=10, paths=500, seed=6)
+    np.testing.assert_array_equal(gaps.final_prices, clean.final_prices)
@@ -0,0 +1,60 @@
+"""
+Portfolio analytics checks
+Matrix-product statistics compared with NumPy's reference routines
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from analytics import portfolio
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(5)
+    factor = rng.normal(0, 0.01, (250, 1))
+    return factor * [0.5, 1.0, 1.5, 0.0] + rng.normal(0, 0.01, (250, 4))
+
+
+def test_correlation_matches_corrcoef(returns):
+    np.testing.assert_allclose(portfolio.correlation(returns), np.corrcoef(returns, rowvar=False))
+
+
+def test_correlation_of_constant_column_is_nan(returns):
+    returns[:, 2] = 0.001
+    corr = portfolio.correlation(returns)
+    assert np.isnan(corr[2, [0, 1, 3]]).all()
+    assert np.diag(corr).tolist() == [1.0] * 4
+
+
+def test_betas_match_cov(returns):
+    benchmark = returns.mean(axis=1)
+    expected = [np.cov(returns[:, i], benchmark)[0, 1] / np.var(benchmark, ddof=1) for i in range(4)]
+    np.testing.assert_allclose(portfolio.betas(returns, benchmark), expected)
+
+
+def test_frontier_samples_match_per_portfolio_math(returns):
+    mean = returns.mean(axis=0) * 252
+    cov = np.cov(returns, rowvar=False) * 252
+    weights, rets, vols = portfolio.frontier_samples(mean, cov, samples=50, seed=1)
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+    np.testing.assert_allclose(rets, [w @ mean for w in weights])
+    np.testing.assert_allclose(vols, [np.sqrt(w @ cov @ w) for w in weights])
+
+
+def test_group_correlation_matches_pairwise_mean(returns):
+    corr = portfolio.correlation(returns)
+    names, table = portfolio.group_correlation(corr, ['a', 'b', 'a', 'b'])
+    assert names == ['a', 'b']
+    assert table[0, 0] == pytest.approx(corr[0, 2])
+    assert table[0, 1] == pytest.approx(np.mean([corr[0, 1], corr[0, 3], corr[2, 1], corr[2, 3]]))
+
+
+def test_analyze_matches_direct_computation(returns):
+    closes = pd.DataFrame(100 * np.cumprod(1 + returns, axis=0), columns=list('ABCD'),
+                          index=pd.bdate_range('2021-01-01', periods=len(returns)))
+    result = portfolio.analyze(closes, [1, 1, 2, 0], frontier=0)
+    daily = closes.pct_change().iloc[1:].to_numpy()
+    weights = np.array([0.25, 0.25, 0.5, 0.0])
+    cov = np.cov(daily, rowvar=False) * 252
+    assert result.expected_return == pytest.approx(weights @ daily.mean(axis=0) * 252)
+    assert result.portfolio_volatility == pytest.approx(np.sqrt(weights @ cov @ weights))
@@ -0,0 +1,92 @@
+"""
+Price store checks
+Incremental tail updates and re-adjustment handling with a fake upstream
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from utils import price_store as store_module
+from utils.price_store import OHLCV_DTYPE, PriceStore
+
+
+def _records(dates, closes):
+    records = np.zeros(len(dates), dtype=OHLCV_DTYPE)
+    records['date'] = pd.DatetimeIndex(dates).values.astype('M8[D]')
+    for field in ('open', 'high', 'low', 'close'):
+        records[field] = closes
+    records['volume'] = 1000
+    return records
+
+
+class Upstream:
+    """Serves a fixed series and records the start date of every download"""
+
+    def __init__(self, dates, closes):
+        self.records = _records(dates, closes)
+        self.starts = []
+
+    def __call__(self, symbol, start):
+        self.starts.append(np.datetime64(start, 'D'))
+        return self.records[self.records['date'] >= start].copy()
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    dates = pd.bdate_range('2024-01-01', periods=60)
+    upstream = Upstream(dates, np.linspace(100, 159, 60))
+    clock = [1_000_000.0]
+    monkeypatch.setattr(store_module.time, 'time', lambda: clock[0])
+    store = PriceStore(str(tmp_path), tail_ttl=60)
+    monkeypatch.setattr(store, '_download', upstream)
+    return store, upstream, clock
+
+
+def test_first_request_downloads_and_later_ones_read_the_file(setup):
+    store, upstream, _ = setup
+    first = store.get_history('aapl', '2024-01-10')
+    second = store.get_history('AAPL', '2024-01-15', end='2024-02-01')
+    assert len(upstream.starts) == 1
+    assert first.index[0] == pd.Timestamp('2024-01-10')
+    assert second.index[0] == pd.Timestamp('2024-01-15')
+    assert second.index[-1] == pd.Timestamp('2024-01-31')
+    np.testing.assert_array_equal(first['Close'].to_numpy(), upstream.records['close'][7:])
+
+
+def test_stale_tail_downloads_only_from_the_bar_before_last(setup):
+    store, upstream, clock = setup
+    store.get_history('AAPL', '2024-01-01')
+    stored = store.read('AAPL')
+    upstream.records = np.concatenate([upstream.records, _records(pd.bdate_range('2024-03-25', periods=3), 170.0)])
+
+    clock[0] += 61
+    df = store.get_history('AAPL', '2024-01-01')
+    assert upstream.starts[-1] == stored['date'][-2]
+    assert len(df) == 63
+    assert df['Close'].iloc[-1] == 170.0
+
+
+def test_readjusted_history_is_downloaded_again(setup):
+    store, upstream, clock = setup
+    store.get_history('AAPL', '2024-01-01')
+    # A 2:1 split halves every adjusted close
+    upstream.records['close'] /= 2
+
+    clock[0] += 61
+    df = store.get_history('AAPL', '2024-01-01')
+    assert upstream.starts[-1] == np.datetime64('2024-01-01')
+    np.testing.assert_allclose(df['Close'].to_numpy(), np.linspace(50, 79.5, 60))
+
+
+def test_earlier_start_extends_the_stored_range(setup):
+    store, upstream, _ = setup
+    store.get_history('AAPL', '2024-02-01')
+    df = store.get_history('AAPL', '2024-01-01')
+    assert upstream.starts == [np.datetime64('2024-02-01'), np.datetime64('2024-01-01')]
+    assert len(df) == 60
+
+
+def test_unknown_symbol_gives_empty_frame(setup):
+    store, upstream, _ = setup
+    upstream.records = upstream.records[:0]
+    assert store.get_history('NOPE', '2024-01-01').empty
+    assert store.read('NOPE') is None
@@ -0,0 +1,97 @@
+"""
+Risk engine checks
+Streaming statistics compared with pandas rolling windows
+"""
+import math
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+import pytest
+from analytics.risk import RiskEngine, TRADING_DAYS, max_drawdown
+
+WINDOW = 63
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(11)
+    return 50 * np.exp(np.cumsum(rng.normal(0.0002, 0.02, 400)))
+
+
+def _rolling(prices):
+    return pd.Series(prices).pct_change().iloc[1:].rolling(WINDOW)
+
+
+def test_volatility_matches_pandas(prices):
+    engine = RiskEngine(window=WINDOW)
+    engine.extend(prices)
+    expected = _rolling(prices).std().to_numpy() * math.sqrt(TRADING_DAYS)
+    np.testing.assert_allclose(engine.series('volatility'), expected, equal_nan=True)
+
+
+def test_sharpe_and_parametric_var_match_pandas(prices):
+    engine = RiskEngine(window=WINDOW, confidence=0.95)
+    engine.extend(prices)
+    mean = _rolling(prices).mean().to_numpy()
+    std = _rolling(prices).std().to_numpy()
+    np.testing.assert_allclose(engine.series('sharpe'), mean / std * math.sqrt(TRADING_DAYS), equal_nan=True)
+    np.testing.assert_allclose(engine.series('var_parametric'), mean + NormalDist().inv_cdf(0.05) * std,
+                               equal_nan=True)
+
+
+def test_historical_var_matches_pandas_quantile(prices):
+    engine = RiskEngine(window=WINDOW, confidence=0.95)
+    engine.extend(prices)
+    expected = _rolling(prices).quantile(0.05).to_numpy()
+    np.testing.assert_allclose(engine.series('var_historical'), expected, equal_nan=True)
+
+
+def test_historical_cvar_is_tail_mean(prices):
+    engine = RiskEngine(window=WINDOW, confidence=0.95)
+    engine.extend(prices)
+    returns = prices[1:] / prices[:-1] - 1
+    window = returns[-WINDOW:]
+    var = engine.latest()['var_historical']
+    assert engine.latest()['cvar_historical'] == pytest.approx(window[window <= var].mean())
+
+
+def test_missing_prices_keep_series_aligned(prices):
+    gapped = prices.copy()
+    gapped[[100, 101, 250]] = np.nan
+    engine = RiskEngine(window=WINDOW)
+    engine.extend(gapped)
+
+    volatility = engine.series('volatility')
+    assert len(volatility) == len(prices) - 1
+    # A gap spans a single return from the last valid close
+    expected = (pd.Series(gapped).ffill().pct_change().iloc[1:]
+                .drop(index=[100, 101, 250]).rolling(WINDOW).std() * math.sqrt(TRADING_DAYS))
+    np.testing.assert_allclose(volatility[expected.index - 1], expected.to_numpy(), equal_nan=True)
+    assert np.isnan(volatility[[99, 100, 249]]).all()
+
+
+def test_incremental_updates_match_one_pass(prices):
+    whole = RiskEngine(window=WINDOW)
+    whole.extend(prices)
+    parts = RiskEngine(window=WINDOW)
+    for chunk in np.array_split(prices, 7):
+        parts.extend(chunk)
+    for name in ('volatility', 'var_historical', 'cvar_parametric'):
+        np.testing.assert_allclose(parts.series(name), whole.series(name), equal_nan=True)
+
+
+def test_max_drawdown_matches_pandas(prices):
+    series = pd.Series(prices)
+    assert max_drawdown(prices) == pytest.approx((series / series.cummax() - 1).min())
+
+
+@pytest.mark.parametrize('bad', [[0], [1], [0, 1], [5], [5, 6]])
+@pytest.mark.parametrize('value', [np.nan, np.inf, 0.0])
+def test_every_price_after_the_first_has_an_entry(prices, bad, value):
+    fed = prices[:120].copy()
+    fed[bad] = value
+    engine = RiskEngine(window=20)
+    engine.extend(fed)
+    assert engine.count == len(fed) - 1
+    for name in ('volatility', 'sharpe'):
+        assert len(engine.series(name)) == len(fed) - 1
@@ -0,0 +1,79 @@
+"""
+Request coalescing checks
+Concurrent callers share one call, its result and its exception
+"""
+import asyncio
+import pytest
+from utils.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    async def run():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {'price': 1}
+
+        results = await asyncio.gather(*(flight.do('AAPL', fetch) for _ in range(5)))
+        return flight, calls, results
+
+    flight, calls, results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats()['shared'] == 4
+    assert len(flight) == 0
+
+
+def test_different_keys_and_later_calls_fetch_again():
+    async def run():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return len(calls)
+
+        await asyncio.gather(flight.do('A', fetch), flight.do('B', fetch))
+        await flight.do('A', fetch)
+        return calls
+
+    assert len(asyncio.run(run())) == 3
+
+
+def test_exception_reaches_every_caller_and_releases_key():
+    async def run():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError('upstream')
+
+        results = await asyncio.gather(*(flight.do('X', fail) for _ in range(3)), return_exceptions=True)
+        return flight, results
+
+    flight, results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(flight) == 0
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    async def run():
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return 'done'
+
+        first = asyncio.ensure_future(flight.do('K', fetch))
+        second = asyncio.ensure_future(flight.do('K', fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return first, await second
+
+    first, result = asyncio.run(run())
+    assert first.cancelled()
+    assert result == 'done'
@@ -0,0 +1,53 @@
+"""
+Worker pool startup checks
+The boot sequence must never fork a process that already has threads
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from analytics import backtest
+from config import Config
+from utils import charts, sweep_pool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BOOT = """
+from utils import charts, sweep_pool
+charts.start_render_pool()
+sweep_pool.start_sweep_pool()
+charts.shutdown_render_pool()
+sweep_pool.shutdown_sweep_pool()
+"""
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    monkeypatch.setattr(Config, 'CHART_WORKERS', 1)
+    monkeypatch.setattr(Config, 'SWEEP_WORKERS', 2)
+    yield
+    charts.shutdown_render_pool()
+    sweep_pool.shutdown_sweep_pool()
+
+
+def test_boot_sequence_never_forks_with_threads():
+    # A fresh interpreter, like the bot at startup (this one already has threads)
+    boot = subprocess.run(
+        [sys.executable, '-W', 'always', '-c', BOOT],
+        cwd=ROOT, env={**os.environ, 'CHART_WORKERS': '1', 'SWEEP_WORKERS': '2'},
+        capture_output=True, text=True, timeout=120
+    )
+    assert boot.returncode == 0, boot.stderr
+    assert 'multi-threaded' not in boot.stderr
+
+
+def test_sweep_pool_matches_inline_sweep(pools):
+    sweep_pool.start_sweep_pool()
+    prices = 100 * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.01, (2, 300)), axis=1))
+    tasks = backtest.sweep_tasks(2, chunks=2)
+    results = asyncio.run(sweep_pool.run_shared(backtest.sweep_chunk, prices, tasks))
+    sweeps = backtest.collect(tasks, results)
+    for row in range(2):
+        np.testing.assert_allclose(sweeps[row]['ma_crossover'].roi, backtest.sweep(prices[row], 'ma_crossover').roi)
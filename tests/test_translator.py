@@ -0,0 +1,84 @@
+"""
+Translation cache checks
+Persistence, batching and cache reuse with a fake translation client
+"""
+import asyncio
+import os
+import types
+import pytest
+from utils import translator
+from utils.translator import TranslationCache
+
+
+class FakeClient:
+    """Prefixes every line with TH: and records each request"""
+
+    def __init__(self):
+        self.requests = []
+
+    def translate(self, text):
+        self.requests.append(text)
+        return '\n'.join(f"TH:{line}" for line in text.split('\n'))
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    fake = FakeClient()
+    monkeypatch.setattr(translator, '_translator', lambda: fake)
+    monkeypatch.setattr(translator, 'translation_cache', TranslationCache(str(tmp_path / 'th.sqlite3')))
+    yield fake
+    translator.translation_cache.close()
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / 'cache' / 'translations.sqlite3')
+    first = TranslationCache(path)
+    first.set_many({'hello': 'สวัสดี', 'stock': 'หุ้น'})
+    first.close()
+
+    second = TranslationCache(path)
+    assert second.get_many(['hello', 'stock', 'other']) == {'hello': 'สวัสดี', 'stock': 'หุ้น'}
+    assert os.path.exists(path)
+    second.close()
+
+
+def test_memory_only_cache_without_path():
+    memory = TranslationCache('')
+    memory.set_many({'a': 'ก'})
+    assert memory.get_many(['a', 'b']) == {'a': 'ก'}
+
+
+def test_targets_are_cached_separately(tmp_path):
+    path = str(tmp_path / 'translations.sqlite3')
+    thai = TranslationCache(path, target='th')
+    thai.set_many({'hello': 'สวัสดี'})
+    thai.close()
+    other = TranslationCache(path, target='ja')
+    assert other.get_many(['hello']) == {}
+    other.close()
+
+
+def test_many_texts_are_batched_and_cached(client):
+    texts = ['Stocks rise', 'Oil   falls', '', 'Stocks rise']
+    first = asyncio.run(translator.translate_many_to_thai(texts))
+    assert first == ['TH:Stocks rise', 'TH:Oil falls', '', 'TH:Stocks rise']
+    assert len(client.requests) == 1
+
+    second = asyncio.run(translator.translate_many_to_thai(['Oil falls', 'Gold flat']))
+    assert second == ['TH:Oil falls', 'TH:Gold flat']
+    assert client.requests[-1] == 'Gold flat'
+    assert len(client.requests) == 2
+
+
+def test_batch_split_mismatch_falls_back_to_single_requests(client, monkeypatch):
+    monkeypatch.setattr(client, 'translate', types.MethodType(
+        lambda self, text: self.requests.append(text) or f"TH:{text.replace(chr(10), ' ')}", client))
+    result = asyncio.run(translator.translate_many_to_thai(['one', 'two']))
+    assert result == ['TH:one', 'TH:two']
+    assert client.requests == ['one\ntwo', 'one', 'two']
+
+
+def test_single_text_uses_the_cache(client):
+    assert translator.translate_to_thai('Market closes') == 'TH:Market closes'
+    assert translator.translate_to_thai('Market closes') == 'TH:Market closes'
+    assert len(client.requests) == 1
@@ -1,6 +1,7 @@
 """Utility functions for the Stock Bot"""
-from .translator import translate_to_thai
+from .translator import translate_to_thai, translate_many_to_thai
 from .sp500 import get_sp500_symbols
 from .logger import setup_logger
+from .executor import run_blocking
 
-__all__ = ['translate_to_thai', 'get_sp500_symbols', 'setup_logger']
+__all__ = ['translate_to_thai', 'translate_many_to_thai', 'get_sp500_symbols', 'setup_logger', 'run_blocking']
@@ -0,0 +1,239 @@
+"""
+Parallel, rate-limited bulk price downloader
+Fetches history for many symbols in concurrent batches under a token
+bucket, with retry/backoff, adaptive batch sizing and failure reporting
+"""
+import asyncio
+import random
+import time
+import pandas as pd
+import yfinance as yf
+from typing import Dict, List, Optional, Tuple
+from config import Config
+from .executor import run_blocking
+from .instrumentation import timed
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class TokenBucket:
+    """
+    Async token bucket rate limiter
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1):
+        """
+        Wait until `tokens` are available and take them
+
+        Args:
+            tokens: Number of tokens to take (clamped to the bucket capacity)
+        """
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+class BulkResult:
+    """Per-symbol price frames from a bulk download plus the symbols that failed"""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], failed: List[str], elapsed: float):
+        self.frames = frames
+        self.failed = failed
+        self.elapsed = elapsed
+
+    @property
+    def empty(self) -> bool:
+        return not self.frames
+
+    def field(self, name: str) -> pd.DataFrame:
+        """
+        Combine one column (e.g. 'Close') of every symbol into a single frame
+
+        Args:
+            name: OHLCV column name
+
+        Returns:
+            DataFrame indexed by date with one column per symbol
+        """
+        columns = {symbol: df[name] for symbol, df in self.frames.items() if name in df.columns}
+        if not columns:
+            return pd.DataFrame()
+        return pd.concat(columns, axis=1).sort_index()
+
+
+def _clean(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Drop empty rows and the timezone; None if the symbol has no prices"""
+    if df is None or df.empty or 'Close' not in df.columns:
+        return None
+    df = df.dropna(how='all')
+    if df.empty or df['Close'].isna().all():
+        return None
+    if df.index.tz is not None:
+        df.index = df.index.tz_localize(None)
+    return df
+
+
+@timed('yfinance', 'bulk')
+def _fetch_batch(symbols: List[str], kwargs: dict) -> Tuple[Dict[str, pd.DataFrame], List[str]]:
+    """
+    Fetch history for one batch of symbols (runs in a worker thread)
+
+    Uses one `Ticker.history` call per symbol, which is also what
+    `yf.download(threads=False)` does internally; unlike the market data
+    downloads it needs no shared lock, so several batches run at once and
+    every request is covered by the tokens the batch took.
+    """
+    frames = {}
+    failed = []
+    for symbol in symbols:
+        try:
+            frame = _clean(yf.Ticker(symbol).history(**kwargs))
+        except Exception as e:
+            logger.debug(f"Bulk fetch failed for {symbol}: {e}")
+            frame = None
+        if frame is None:
+            failed.append(symbol)
+        else:
+            frames[symbol] = frame
+    return frames, failed
+
+
+class BulkDownloader:
+    """
+    Download price history for many symbols concurrently
+
+    Batches are fetched by up to `concurrency` workers, each batch first
+    taking one token per symbol from a shared token bucket. A batch in which
+    most symbols fail is treated as throttling: it is retried after an
+    exponential backoff and the batch size shrinks; clean batches grow it
+    back towards `max_chunk`. Symbols that still fail after `max_retries`
+    attempts are reported in `BulkResult.failed`.
+    """
+
+    def __init__(self, rate: Optional[float] = None, concurrency: Optional[int] = None,
+                 chunk_size: Optional[int] = None, min_chunk: Optional[int] = None,
+                 max_chunk: Optional[int] = None, max_retries: Optional[int] = None,
+                 backoff: Optional[float] = None):
+        self.rate = rate or Config.BULK_RATE_LIMIT
+        self.concurrency = concurrency or Config.BULK_CONCURRENCY
+        self.chunk_size = chunk_size or Config.BULK_CHUNK_SIZE
+        self.min_chunk = min_chunk or Config.BULK_MIN_CHUNK
+        self.max_chunk = max_chunk or Config.BULK_MAX_CHUNK
+        self.max_retries = max_retries if max_retries is not None else Config.BULK_MAX_RETRIES
+        self.backoff = backoff or Config.BULK_BACKOFF
+        self.bucket = TokenBucket(rate=self.rate, capacity=self.max_chunk)
+
+    def _grow(self):
+        self.chunk_size = min(self.max_chunk, int(self.chunk_size * 1.25) + 1)
+
+    def _shrink(self):
+        self.chunk_size = max(self.min_chunk, self.chunk_size // 2)
+
+    async def download(self, symbols: List[str], **kwargs) -> BulkResult:
+        """
+        Download history for all symbols
+
+        Args:
+            symbols: Ticker symbols
+            **kwargs: Passed to `Ticker.history` (period, interval, start, end, ...)
+
+        Returns:
+            BulkResult with per-symbol frames and the failed symbols
+        """
+        started = time.monotonic()
+        pending = list(dict.fromkeys(s.upper() for s in symbols))
+        attempts: Dict[str, int] = {}
+        frames: Dict[str, pd.DataFrame] = {}
+        failed: List[str] = []
+        in_flight = 0
+        work_available = asyncio.Event()
+        work_available.set()
+
+        async def worker():
+            nonlocal in_flight
+            while True:
+                if not pending:
+                    if in_flight == 0:
+                        return
+                    # Another worker may requeue symbols after a retry
+                    work_available.clear()
+                    await work_available.wait()
+                    continue
+
+                batch = pending[:self.chunk_size]
+                del pending[:len(batch)]
+                in_flight += 1
+                try:
+                    await self._run_batch(batch, kwargs, attempts, frames, failed, pending)
+                finally:
+                    in_flight -= 1
+                    work_available.set()
+
+        workers = max(1, min(self.concurrency, -(-len(pending) // max(self.chunk_size, 1))))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+        elapsed = time.monotonic() - started
+        logger.info(
+            f"Bulk download: {len(frames)}/{len(frames) + len(failed)} symbols in {elapsed:.1f}s"
+            + (f", failed: {', '.join(failed[:20])}{'...' if len(failed) > 20 else ''}" if failed else "")
+        )
+        return BulkResult(frames, failed, elapsed)
+
+    async def _run_batch(self, batch: List[str], kwargs: dict, attempts: Dict[str, int],
+                         frames: Dict[str, pd.DataFrame], failed: List[str], pending: List[str]):
+        await self.bucket.acquire(len(batch))
+        try:
+            batch_frames, batch_failed = await run_blocking(_fetch_batch, batch, kwargs)
+        except Exception as e:
+            logger.warning(f"Bulk batch of {len(batch)} symbols raised: {e}")
+            batch_frames, batch_failed = {}, list(batch)
+
+        frames.update(batch_frames)
+        if not batch_failed:
+            self._grow()
+            return
+
+        # Most of the batch failing looks like throttling; a few failures in an
+        # otherwise clean batch are usually bad/delisted symbols, retried once
+        throttled = len(batch_failed) > len(batch) // 2
+        if throttled:
+            self._shrink()
+
+        retry = []
+        for symbol in batch_failed:
+            attempts[symbol] = attempts.get(symbol, 0) + 1
+            if not throttled:
+                attempts[symbol] = max(attempts[symbol], self.max_retries)
+            if attempts[symbol] > self.max_retries:
+                failed.append(symbol)
+            else:
+                retry.append(symbol)
+
+        if not retry:
+            return
+
+        if throttled:
+            attempt = max(attempts[s] for s in retry)
+            delay = self.backoff * (2 ** (attempt - 1)) * (1 + random.random() * 0.25)
+            logger.info(f"Retrying {len(retry)} symbols in {delay:.1f}s (attempt {attempt}, chunk size {self.chunk_size})")
+            await asyncio.sleep(delay)
+        pending.extend(retry)
@@ -0,0 +1,497 @@
+"""
+Chart rendering worker pool
+Renders matplotlib charts to PNG bytes in separate processes using the
+Agg backend, so chart-heavy commands never block the event loop
+"""
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+from config import Config
+from .cache import TTLCache
+from .executor import run_blocking
+from .instrumentation import timed
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+# Serializes rendering when charts are drawn in-process (CHART_WORKERS = 0)
+_inline_lock = threading.Lock()
+_inline_ready = False
+
+# Per-process figure templates, created once and cleared between renders
+_templates: Dict[str, Any] = {}
+
+# Rendered PNGs keyed by chart fingerprint (see chart_fingerprint)
+chart_cache = TTLCache(
+    ttl=Config.CHART_CACHE_TTL,
+    max_entries=Config.CHART_CACHE_MAX_ENTRIES,
+    name='charts'
+)
+
+
+def _init_worker():
+    """Load matplotlib once per worker with the non-interactive backend"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.style
+    matplotlib.style.use('dark_background')
+    # Importing the figure module up front keeps the first render fast
+    from matplotlib.figure import Figure  # noqa: F401
+
+
+def _template(name: str, figsize=(10, 6)):
+    """Get a cleared, reusable figure for a chart type"""
+    fig = _templates.get(name)
+    if fig is None:
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=figsize)
+        _templates[name] = fig
+    else:
+        fig.clear()
+    return fig
+
+
+def _to_png(fig) -> bytes:
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png')
+    return buf.getvalue()
+
+
+def render_dca_chart(symbol: str, dates: np.ndarray, values: np.ndarray,
+                     price_dates: np.ndarray, prices: np.ndarray) -> bytes:
+    """
+    Render DCA portfolio value against the stock price
+
+    Returns:
+        PNG image bytes
+    """
+    fig = _template('dca')
+    ax1 = fig.add_subplot()
+    color = 'tab:green'
+    ax1.set_xlabel('Date')
+    ax1.set_ylabel('Portfolio Value ($)', color=color)
+    ax1.plot(dates, values, color=color, label='Portfolio Value')
+    ax1.tick_params(axis='y', labelcolor=color)
+    ax2 = ax1.twinx()
+    color = 'tab:cyan'
+    ax2.set_ylabel(f'{symbol.upper()} Price ($)', color=color)
+    ax2.plot(price_dates, prices, color=color, label=f'{symbol} Price', alpha=0.6, linestyle='--')
+    ax2.tick_params(axis='y', labelcolor=color)
+    ax1.set_title(f'DCA Portfolio Value vs. {symbol.upper()} Price')
+    fig.tight_layout()
+    return _to_png(fig)
+
+
+def render_probability_chart(symbol: str, period: str, returns: np.ndarray,
+                             mean_return: float, var_95: float) -> bytes:
+    """
+    Render the daily return distribution with mean and VaR markers
+
+    Returns:
+        PNG image bytes
+    """
+    from matplotlib.ticker import FuncFormatter
+
+    fig = _template('probability')
+    ax = fig.add_subplot()
+
+    n, bins, patches = ax.hist(returns, bins=50, alpha=0.75, label='Daily Returns Distribution')
+    for left, patch in zip(bins[:-1], patches):
+        patch.set_facecolor('tab:red' if left < 0 else 'tab:green')
+
+    ax.axvline(mean_return, color='yellow', linestyle='dashed', linewidth=2, label=f'Mean ({mean_return*100:.2f}%)')
+    ax.axvline(var_95, color='orange', linestyle='dashed', linewidth=2, label=f'VaR 95% ({var_95*100:.2f}%)')
+
+    ax.set_xlabel('Daily Returns')
+    ax.set_ylabel('Frequency')
+    ax.set_title(f'Probability Distribution: {symbol.upper()} ({period})')
+    ax.xaxis.set_major_formatter(FuncFormatter(lambda x, _: f'{x*100:.1f}%'))
+
+    ax.legend()
+    fig.tight_layout()
+    return _to_png(fig)
+
+
+def render_montecarlo_chart(symbol: str, history_dates: np.ndarray, history_prices: np.ndarray,
+                            future_dates: np.ndarray, fan: np.ndarray, percentiles: tuple,
+                            target: Optional[float] = None) -> bytes:
+    """
+    Render a Monte Carlo fan chart after the recent price history
+
+    Args:
+        fan: Simulated price percentiles, one row per entry of `percentiles`
+            (symmetric around the median, e.g. 5/25/50/75/95)
+
+    Returns:
+        PNG image bytes
+    """
+    fig = _template('montecarlo')
+    ax = fig.add_subplot()
+    ax.plot(history_dates, history_prices, color='tab:cyan', label='History')
+
+    bands = len(percentiles) // 2
+    for i in range(bands):
+        lo, hi = percentiles[i], percentiles[-1 - i]
+        ax.fill_between(future_dates, fan[i], fan[-1 - i], color='tab:purple',
+                        alpha=0.2 + 0.2 * i, linewidth=0, label=f'{lo}-{hi}th percentile')
+    ax.plot(future_dates, fan[bands], color='yellow', linewidth=1.5, label='Median')
+    if target is not None:
+        ax.axhline(target, color='orange', linestyle='dashed', linewidth=1.5, label=f'Target ${target:,.2f}')
+
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Price ($)')
+    ax.set_title(f'Monte Carlo Projection: {symbol.upper()}')
+    ax.legend(loc='upper left')
+    fig.tight_layout()
+    return _to_png(fig)
+
+
+def render_indicator_chart(symbol: str, dates: np.ndarray, close: np.ndarray, overlays: dict,
+                           rsi: np.ndarray, macd: np.ndarray, signal: np.ndarray, hist: np.ndarray) -> bytes:
+    """
+    Render price with indicator overlays above RSI and MACD panels
+
+    Args:
+        overlays: Line label -> series drawn over the price; 'BB Upper' and
+            'BB Lower' are drawn as a shaded band
+
+    Returns:
+        PNG image bytes
+    """
+    fig = _template('indicators', figsize=(10, 9))
+    price_ax, rsi_ax, macd_ax = fig.subplots(3, 1, sharex=True, gridspec_kw={'height_ratios': [3, 1, 1.2]})
+
+    price_ax.plot(dates, close, color='tab:cyan', linewidth=1.5, label='Close')
+    if 'BB Upper' in overlays and 'BB Lower' in overlays:
+        price_ax.fill_between(dates, overlays['BB Lower'], overlays['BB Upper'], color='tab:gray',
+                              alpha=0.25, linewidth=0, label='Bollinger Bands')
+    colors = iter(['yellow', 'tab:orange', 'tab:pink', 'tab:green'])
+    for label, values in overlays.items():
+        if label not in ('BB Upper', 'BB Lower'):
+            price_ax.plot(dates, values, color=next(colors, 'white'), linewidth=1, label=label)
+    price_ax.set_ylabel('Price ($)')
+    price_ax.set_title(f'Technical Indicators: {symbol.upper()}')
+    price_ax.legend(loc='upper left', fontsize='small')
+
+    rsi_ax.plot(dates, rsi, color='tab:purple', linewidth=1)
+    rsi_ax.axhline(70, color='tab:red', linestyle='dashed', linewidth=0.8)
+    rsi_ax.axhline(30, color='tab:green', linestyle='dashed', linewidth=0.8)
+    rsi_ax.set_ylim(0, 100)
+    rsi_ax.set_ylabel('RSI')
+
+    macd_ax.bar(dates, hist, color=np.where(hist >= 0, 'tab:green', 'tab:red'), alpha=0.6, width=1.0)
+    macd_ax.plot(dates, macd, color='tab:cyan', linewidth=1, label='MACD')
+    macd_ax.plot(dates, signal, color='tab:orange', linewidth=1, label='Signal')
+    macd_ax.set_ylabel('MACD')
+    macd_ax.legend(loc='upper left', fontsize='small')
+
+    fig.tight_layout()
+    return _to_png(fig)
+
+
+def render_portfolio_chart(symbols: list, correlation: np.ndarray, frontier_volatility: np.ndarray,
+                           frontier_returns: np.ndarray, points: dict) -> bytes:
+    """
+    Render a correlation heatmap next to efficient frontier samples
+
+    Args:
+        points: Label -> (volatility, return) of highlighted portfolios
+
+    Returns:
+        PNG image bytes
+    """
+    fig = _template('portfolio', figsize=(14, 6))
+    heat_ax, frontier_ax = fig.subplots(1, 2, gridspec_kw={'width_ratios': [1, 1.1]})
+
+    image = heat_ax.imshow(correlation, cmap='RdYlGn_r', vmin=-1, vmax=1)
+    heat_ax.set_xticks(range(len(symbols)), symbols, rotation=90, fontsize='small')
+    heat_ax.set_yticks(range(len(symbols)), symbols, fontsize='small')
+    if len(symbols) <= 12:
+        for i in range(len(symbols)):
+            for j in range(len(symbols)):
+                heat_ax.text(j, i, f'{correlation[i, j]:.2f}', ha='center', va='center', fontsize=8, color='black')
+    heat_ax.set_title('Correlation')
+    fig.colorbar(image, ax=heat_ax, fraction=0.046, pad=0.04)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = frontier_returns / frontier_volatility
+    scatter = frontier_ax.scatter(frontier_volatility * 100, frontier_returns * 100, c=sharpe,
+                                  cmap='viridis', s=4, alpha=0.6)
+    markers = iter(['*', 'D', 'o'])
+    for label, (volatility, ret) in points.items():
+        frontier_ax.scatter([volatility * 100], [ret * 100], marker=next(markers, 'o'), s=160,
+                            edgecolors='white', label=label, zorder=3)
+    frontier_ax.set_xlabel('Annual Volatility (%)')
+    frontier_ax.set_ylabel('Annual Return (%)')
+    frontier_ax.set_title('Efficient Frontier (random portfolios)')
+    frontier_ax.legend(loc='upper left', fontsize='small')
+    fig.colorbar(scatter, ax=frontier_ax, label='Sharpe')
+
+    fig.tight_layout()
+    return _to_png(fig)
+
+
+def render_correlation_heatmap(title: str, correlation: np.ndarray, groups: list,
+                               group_sizes: list) -> bytes:
+    """
+    Render a large correlation matrix ordered by group (e.g. sector)
+
+    Args:
+        groups: Group names in matrix order
+        group_sizes: Number of consecutive rows/columns in each group
+
+    Returns:
+        PNG image bytes
+    """
+    fig = _template('correlation', figsize=(11, 10))
+    ax = fig.add_subplot()
+    image = ax.imshow(correlation, cmap='RdYlGn_r', vmin=-1, vmax=1, interpolation='nearest')
+
+    edges = np.cumsum(group_sizes)
+    for edge in edges[:-1]:
+        ax.axhline(edge - 0.5, color='white', linewidth=0.5)
+        ax.axvline(edge - 0.5, color='white', linewidth=0.5)
+    centers = edges - np.asarray(group_sizes) / 2 - 0.5
+    ax.set_yticks(centers, groups, fontsize='small')
+    ax.set_xticks([])
+    ax.set_title(title)
+    fig.colorbar(image, ax=ax, fraction=0.046, pad=0.04)
+    fig.tight_layout()
+    return _to_png(fig)
+
+
+def render_backtest_chart(symbol: str, dates: np.ndarray, curves: dict, fast: np.ndarray,
+                          slow: np.ndarray, roi_table: np.ndarray) -> bytes:
+    """
+    Render strategy equity curves next to the MA crossover parameter sweep
+
+    Args:
+        curves: Label -> daily equity aligned with dates
+        fast, slow: Fast/slow SMA windows (rows/columns of roi_table)
+        roi_table: ROI per (fast, slow) pair, NaN for untested pairs
+
+    Returns:
+        PNG image bytes
+    """
+    fig = _template('backtest', figsize=(14, 6))
+    equity_ax, sweep_ax = fig.subplots(1, 2, gridspec_kw={'width_ratios': [1.4, 1]})
+
+    for label, equity in curves.items():
+        equity_ax.plot(dates, equity, label=label, linewidth=1.2)
+    equity_ax.set_title(f'{symbol.upper()} Strategy Equity')
+    equity_ax.set_ylabel('Portfolio Value ($)')
+    equity_ax.legend(loc='upper left', fontsize='small')
+    equity_ax.grid(True, alpha=0.2)
+
+    limit = np.nanmax(np.abs(roi_table)) * 100 if np.isfinite(roi_table).any() else 1.0
+    image = sweep_ax.imshow(roi_table * 100, cmap='RdYlGn', vmin=-limit, vmax=limit,
+                            aspect='auto', origin='lower')
+    sweep_ax.set_yticks(range(len(fast)), [str(w) for w in fast], fontsize='small')
+    step = max(len(slow) // 8, 1)
+    sweep_ax.set_xticks(range(0, len(slow), step), [str(w) for w in slow[::step]], fontsize='small')
+    sweep_ax.set_ylabel('Fast SMA')
+    sweep_ax.set_xlabel('Slow SMA')
+    sweep_ax.set_title('MA Crossover ROI (%) by Parameters')
+    fig.colorbar(image, ax=sweep_ax, fraction=0.046, pad=0.04)
+
+    fig.tight_layout()
+    return _to_png(fig)
+
+
+def _restart_context():
+    """Start method for pools created while the bot is running (threads exist, so no fork)"""
+    return multiprocessing.get_context(
+        'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    )
+
+
+def start_render_pool(warm: bool = True):
+    """
+    Start the chart worker processes
+
+    Call this early at startup: workers are forked from the main process,
+    which is only safe before other threads exist. Charts are rendered in
+    the I/O thread pool when no pool was started.
+
+    Args:
+        warm: Fork the workers now (the executor otherwise forks on its
+            first submit, by which time the bot is multi-threaded). Their
+            initializer (matplotlib import) runs in the children, so this
+            does not wait for it.
+    """
+    global _pool
+    if _pool is not None or Config.CHART_WORKERS <= 0:
+        return
+    _pool = ProcessPoolExecutor(
+        max_workers=Config.CHART_WORKERS,
+        mp_context=multiprocessing.get_context('fork'),
+        initializer=_init_worker
+    )
+    if warm:
+        # Submitting a no-op forks every worker; each then runs the initializer
+        _pool.submit(int)
+    logger.info(f"Chart render pool started with {Config.CHART_WORKERS} workers")
+
+
+def _restart_render_pool(broken: ProcessPoolExecutor):
+    """Replace a broken pool, unless another render already did"""
+    global _pool
+    if _pool is not broken:
+        return
+    broken.shutdown(wait=False, cancel_futures=True)
+    _pool = ProcessPoolExecutor(
+        max_workers=Config.CHART_WORKERS,
+        mp_context=_restart_context(),
+        initializer=_init_worker
+    )
+    logger.warning("Chart render pool broke, restarted it")
+
+
+def shutdown_render_pool():
+    """Stop the chart worker processes"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        logger.info("Chart render pool stopped")
+
+
+def _render_inline(func: Callable[..., bytes], *args) -> bytes:
+    global _inline_ready
+    with _inline_lock:
+        if not _inline_ready:
+            _init_worker()
+            _inline_ready = True
+        return func(*args)
+
+
+async def render(func: Callable[..., bytes], *args) -> bytes:
+    """
+    Render a chart off the event loop
+
+    Args:
+        func: One of the module-level render_* functions
+        *args: Arguments for func (must be picklable)
+
+    Returns:
+        PNG image bytes
+    """
+    with timed('chart', func.__name__):
+        pool = _pool
+        if pool is None:
+            # Never fork from the running bot; without a boot-time pool render here
+            return await run_blocking(_render_inline, func, *args)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(pool, func, *args)
+        except BrokenProcessPool:
+            _restart_render_pool(pool)
+            return await loop.run_in_executor(_pool, func, *args)
+
+
+def chart_fingerprint(func: Callable[..., bytes], *args) -> str:
+    """
+    Hash a render call: chart type, parameters and the underlying data
+
+    NumPy arrays (also inside dicts, lists and tuples) are hashed by dtype,
+    shape and raw bytes, so identical price series produce the same key
+    regardless of where they came from.
+
+    Returns:
+        Hex digest identifying the rendered image
+    """
+    digest = hashlib.sha256(func.__name__.encode())
+    for arg in args:
+        _hash_arg(digest, arg)
+    return digest.hexdigest()
+
+
+def _hash_arg(digest, arg):
+    if isinstance(arg, np.ndarray):
+        arr = np.ascontiguousarray(arg)
+        digest.update(f"{arr.dtype.str}{arr.shape}".encode())
+        digest.update(arr.view(np.uint8).tobytes())
+    elif isinstance(arg, dict):
+        # repr() would elide the arrays inside
+        for key, value in arg.items():
+            _hash_arg(digest, key)
+            _hash_arg(digest, value)
+    elif isinstance(arg, (list, tuple)):
+        digest.update(f"{type(arg).__name__}{len(arg)}".encode())
+        for item in arg:
+            _hash_arg(digest, item)
+    else:
+        digest.update(repr(arg).encode())
+    digest.update(b'\x00')
+
+
+def _disk_path(key: str) -> str:
+    return os.path.join(Config.CHART_CACHE_DIR, f"{key}.png")
+
+
+def _read_disk(key: str) -> Optional[bytes]:
+    try:
+        with open(_disk_path(key), 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_disk(key: str, png: bytes):
+    try:
+        os.makedirs(Config.CHART_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{_disk_path(key)}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(png)
+        os.replace(tmp_path, _disk_path(key))
+
+        # Keep the directory bounded: drop the oldest files
+        files = [os.path.join(Config.CHART_CACHE_DIR, name)
+                 for name in os.listdir(Config.CHART_CACHE_DIR) if name.endswith('.png')]
+        if len(files) > Config.CHART_CACHE_MAX_FILES:
+            files.sort(key=os.path.getmtime)
+            for path in files[:len(files) - Config.CHART_CACHE_MAX_FILES]:
+                os.remove(path)
+    except OSError as e:
+        logger.warning(f"Failed to write chart cache file: {e}")
+
+
+async def render_cached(func: Callable[..., bytes], *args) -> bytes:
+    """
+    Render a chart, reusing a previously rendered image for identical input
+
+    Looks in memory first, then in CHART_CACHE_DIR (if set), and only falls
+    back to matplotlib on a miss.
+
+    Args:
+        func: One of the module-level render_* functions
+        *args: Arguments for func (must be picklable)
+
+    Returns:
+        PNG image bytes
+    """
+    key = chart_fingerprint(func, *args)
+    png = chart_cache.get(key)
+    if png is not None:
+        return png
+
+    if Config.CHART_CACHE_DIR:
+        png = await run_blocking(_read_disk, key)
+        if png is not None:
+            chart_cache.set(key, png)
+            return png
+
+    png = await render(func, *args)
+    chart_cache.set(key, png)
+    if Config.CHART_CACHE_DIR:
+        await run_blocking(_write_disk, key, png)
+    return png
@@ -0,0 +1,86 @@
+"""
+Shared thread pool for blocking I/O
+Runs yfinance/requests calls off the Discord event loop
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from config import Config
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+# Calls submitted through run_blocking that have not finished yet
+_pending = 0
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get the shared executor, creating it on first use
+
+    Returns:
+        Bounded thread pool sized by Config.EXECUTOR_MAX_WORKERS
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=Config.EXECUTOR_MAX_WORKERS,
+            thread_name_prefix='stockbot-io'
+        )
+        logger.info(f"I/O thread pool started with {Config.EXECUTOR_MAX_WORKERS} workers")
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking function in the shared thread pool
+
+    Args:
+        func: Blocking callable (network request, parsing, etc.)
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns; exceptions are re-raised in the caller
+    """
+    global _pending
+    loop = asyncio.get_running_loop()
+    # Carry context variables (e.g. the invoking command) into the worker
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    _pending += 1
+    try:
+        return await loop.run_in_executor(get_executor(), call)
+    finally:
+        _pending -= 1
+
+
+def queue_depth() -> int:
+    """
+    Number of blocking calls waiting for a free worker
+
+    Returns:
+        Calls submitted through run_blocking beyond the pool size
+    """
+    return max(0, _pending - Config.EXECUTOR_MAX_WORKERS)
+
+
+def pending_calls() -> int:
+    """Number of blocking calls running or queued in the shared pool"""
+    return _pending
+
+
+def shutdown_executor(wait: bool = False):
+    """
+    Shut down the shared executor
+
+    Args:
+        wait: Block until running calls have finished
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait, cancel_futures=True)
+        _executor = None
+        logger.info("I/O thread pool stopped")
@@ -0,0 +1,96 @@
+"""
+Shared HTTP clients
+One keep-alive aiohttp session for async code and one pooled requests
+session for blocking code, created at startup and closed at shutdown
+"""
+import aiohttp
+import requests
+import threading
+from requests.adapters import HTTPAdapter
+from typing import Optional
+from urllib3.util.retry import Retry
+from config import Config
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (compatible; DiscordStockBot/1.0)'
+
+
+class HttpClients:
+    """Owner of the bot's outbound HTTP connection pools"""
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._requests_session: Optional[requests.Session] = None
+        self._requests_lock = threading.Lock()
+
+    async def start(self):
+        """Create the aiohttp session (must run on the bot's event loop)"""
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=Config.HTTP_MAX_CONNECTIONS,
+            limit_per_host=Config.HTTP_MAX_CONNECTIONS_PER_HOST,
+            ttl_dns_cache=Config.HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=30
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=Config.HTTP_TIMEOUT),
+            headers={'User-Agent': USER_AGENT}
+        )
+        logger.info("HTTP session started")
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The shared aiohttp session"""
+        if self._session is None or self._session.closed:
+            raise RuntimeError("HTTP session is not started; call http_clients.start() first")
+        return self._session
+
+    @property
+    def requests_session(self) -> requests.Session:
+        """The shared pooled requests session for blocking code"""
+        with self._requests_lock:
+            if self._requests_session is None:
+                adapter = HTTPAdapter(
+                    pool_connections=Config.HTTP_MAX_CONNECTIONS_PER_HOST,
+                    pool_maxsize=Config.HTTP_MAX_CONNECTIONS_PER_HOST,
+                    max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+                )
+                session = requests.Session()
+                session.headers['User-Agent'] = USER_AGENT
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._requests_session = session
+            return self._requests_session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Blocking GET through the pooled requests session
+
+        Args:
+            url: URL to fetch
+            **kwargs: Passed to requests (timeout defaults to Config.HTTP_TIMEOUT)
+
+        Returns:
+            requests Response
+        """
+        kwargs.setdefault('timeout', Config.HTTP_TIMEOUT)
+        return self.requests_session.get(url, **kwargs)
+
+    async def close(self):
+        """Close both sessions"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("HTTP session closed")
+        self._session = None
+        with self._requests_lock:
+            if self._requests_session is not None:
+                self._requests_session.close()
+                self._requests_session = None
+
+
+# Shared HTTP clients
+http_clients = HttpClients()
@@ -0,0 +1,158 @@
+"""
+Command and upstream-call instrumentation
+Records per-command latency and errors, and how long each command spends
+in Yahoo Finance, translation and chart rendering
+"""
+import contextlib
+import contextvars
+import time
+from typing import Dict, List, Optional
+from .logger import setup_logger
+from .metrics import registry
+
+logger = setup_logger(__name__)
+
+# Name of the slash command being handled by the current task (and the
+# worker threads it hands work to via run_blocking)
+current_command: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('current_command', default=None)
+
+# Work not started by a command (scheduler jobs, warm-up)
+BACKGROUND = 'background'
+
+command_latency = registry.histogram(
+    'command_duration_seconds', 'End-to-end slash command latency')
+command_errors = registry.counter(
+    'command_errors_total', 'Slash command errors by type')
+stage_latency = registry.histogram(
+    'stage_duration_seconds', 'Time spent in upstream calls and rendering')
+stage_errors = registry.counter(
+    'stage_errors_total', 'Failed upstream calls and renders')
+
+# Commands currently being handled, keyed by interaction id
+in_flight: Dict[int, dict] = {}
+
+
+@contextlib.contextmanager
+def timed(stage: str, op: str = ''):
+    """
+    Time a block of work as a stage of the current command
+
+    Usable as a context manager or as a decorator on blocking functions.
+
+    Args:
+        stage: Stage name ('yfinance', 'translation', 'chart', ...)
+        op: Operation within the stage (e.g. 'info', 'history')
+    """
+    labels = {'stage': stage, 'op': op, 'command': current_command.get() or BACKGROUND}
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        stage_errors.inc(**labels)
+        raise
+    finally:
+        stage_latency.observe(time.perf_counter() - started, **labels)
+
+
+def format_options(ctx) -> str:
+    """Render the options a user passed to a command, e.g. 'symbol=AAPL period=1y'"""
+    options = ctx.selected_options or []
+    return ' '.join(f"{o.get('name')}={o.get('value')}" for o in options)
+
+
+async def _before_invoke(ctx):
+    ctx.started_at = time.perf_counter()
+    current_command.set(ctx.command.qualified_name)
+    in_flight[ctx.interaction.id] = {
+        'command': ctx.command.qualified_name,
+        'options': format_options(ctx),
+        'user': str(ctx.author),
+        'started_at': time.monotonic(),
+        'code': getattr(ctx.command.callback, '__code__', None),
+    }
+
+
+async def _after_invoke(ctx):
+    in_flight.pop(ctx.interaction.id, None)
+    started = getattr(ctx, 'started_at', None)
+    if started is not None:
+        command_latency.observe(time.perf_counter() - started, command=ctx.command.qualified_name)
+
+
+def record_command_error(ctx, error: Exception):
+    """
+    Count a failed command invocation
+
+    Args:
+        ctx: Application context of the failed command
+        error: Error passed to on_application_command_error
+    """
+    original = getattr(error, 'original', error)
+    name = ctx.command.qualified_name if ctx.command else 'unknown'
+    command_errors.inc(command=name, error=type(original).__name__)
+
+
+def instrument_commands(bot):
+    """
+    Time every slash command registered on the bot
+
+    Uses the bot-wide invoke hooks, which run in the same task as the
+    command callback, so stages timed inside it are attributed to it.
+
+    Args:
+        bot: The discord.Bot whose commands should be instrumented
+    """
+    bot.before_invoke(_before_invoke)
+    bot.after_invoke(_after_invoke)
+    logger.info("Command instrumentation enabled")
+
+
+def _summarize(histogram, labels: Dict[str, str]) -> dict:
+    p = histogram.percentiles((0.5, 0.95, 0.99), **labels)
+    return {
+        'count': histogram.count(**labels),
+        'p50': p.get(0.5, 0.0),
+        'p95': p.get(0.95, 0.0),
+        'p99': p.get(0.99, 0.0),
+    }
+
+
+def command_summary() -> List[dict]:
+    """
+    Latency percentiles and error counts per command
+
+    Returns:
+        List of dicts with command, count, p50, p95, p99 and errors,
+        busiest command first
+    """
+    errors: Dict[str, float] = {}
+    for _, key, value in command_errors.samples():
+        name = dict(key)['command']
+        errors[name] = errors.get(name, 0) + value
+
+    rows = []
+    names = {labels['command'] for labels in command_latency.label_sets()} | set(errors)
+    for name in names:
+        row = {'command': name, **_summarize(command_latency, {'command': name})}
+        row['errors'] = int(errors.get(name, 0))
+        rows.append(row)
+    return sorted(rows, key=lambda r: r['count'], reverse=True)
+
+
+def stage_summary(command: Optional[str] = None) -> List[dict]:
+    """
+    Latency percentiles per upstream stage
+
+    Args:
+        command: Only include stages run by this command
+
+    Returns:
+        List of dicts with stage, op, command, count, p50, p95 and p99,
+        slowest p95 first
+    """
+    rows = []
+    for labels in stage_latency.label_sets():
+        if command is not None and labels['command'] != command:
+            continue
+        rows.append({**labels, **_summarize(stage_latency, labels)})
+    return sorted(rows, key=lambda r: r['p95'], reverse=True)
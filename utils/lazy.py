@@ -0,0 +1,93 @@
+"""
+Lazy loading of heavy modules
+pandas, scipy, yfinance and the modules built on them are imported off the
+event loop on first use, or warmed in the background once the bot is online
+"""
+import importlib
+import sys
+import time
+from types import ModuleType
+from typing import Dict, Iterable, List
+from .executor import run_blocking
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Imported by warm_up, slowest first; commands load them with load_modules
+HEAVY_MODULES = (
+    'scipy.stats',
+    'pandas',
+    'yfinance',
+    'deep_translator',
+    'bs4',
+    'utils.market_data',
+    'utils.market_snapshot',
+    'utils.news_feed',
+    'analytics',
+)
+
+
+async def load_module(name: str) -> ModuleType:
+    """
+    Import a module without blocking the event loop
+
+    Already-imported modules are returned immediately; otherwise the import
+    runs in the shared thread pool (Python's import locks make concurrent
+    imports of the same module safe).
+
+    Args:
+        name: Absolute module name, e.g. 'utils.market_data'
+
+    Returns:
+        The imported module
+    """
+    module = sys.modules.get(name)
+    # A module another thread is still importing is in sys.modules half-built
+    if module is not None and not getattr(module.__spec__, '_initializing', False):
+        return module
+    return await run_blocking(importlib.import_module, name)
+
+
+async def load_modules(*names: str) -> List[ModuleType]:
+    """Import several modules off the event loop, in order"""
+    return [await load_module(name) for name in names]
+
+
+def warm_up(names: Iterable[str] = HEAVY_MODULES) -> Dict[str, float]:
+    """
+    Import heavy modules ahead of the first command (blocking)
+
+    Args:
+        names: Modules to import
+
+    Returns:
+        Seconds spent importing each module that was not loaded yet
+    """
+    timings = {}
+    for name in names:
+        if name in sys.modules:
+            continue
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.error(f"Warm-up import of {name} failed: {e}")
+            continue
+        timings[name] = time.perf_counter() - started
+    return timings
+
+
+async def warm_up_in_background() -> Dict[str, float]:
+    """
+    Warm heavy modules in the thread pool and log how long it took
+
+    Returns:
+        Per-module import timings
+    """
+    started = time.perf_counter()
+    timings = await run_blocking(warm_up)
+    if timings:
+        slowest = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in
+                            sorted(timings.items(), key=lambda item: item[1], reverse=True)[:5])
+        logger.info(f"Warmed {len(timings)} modules in {time.perf_counter() - started:.2f}s ({slowest})")
+    return timings
@@ -0,0 +1,72 @@
+"""
+Event loop lag monitor
+Measures how late the event loop wakes up from a short sleep, which is the
+time the loop spent blocked on something else
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Optional
+from config import Config
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class LoopLagMonitor:
+    """
+    Samples event loop lag every `interval` seconds
+
+    Keeps the latest sample, the worst sample since start and a short
+    window of recent samples. `last_tick` tells other threads when the
+    loop last got to run the sampler.
+    """
+
+    def __init__(self, interval: float = 0.5, window: int = 240):
+        self.interval = interval
+        self.last = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=window)
+        self.last_tick = time.monotonic()
+        self.thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def recent_max(self) -> float:
+        """Worst lag within the recent window (seconds)"""
+        return max(self.samples, default=0.0)
+
+    def start(self):
+        """Start sampling on the running event loop"""
+        if self.running:
+            return
+        self.thread_id = threading.get_ident()
+        self.last_tick = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name='loop-lag-monitor')
+
+    async def stop(self):
+        """Stop sampling"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.last_tick = time.monotonic()
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            self.last = lag
+            self.max = max(self.max, lag)
+            self.samples.append(lag)
+            if lag > 1.0:
+                logger.warning(f"Event loop was blocked for {lag:.2f}s")
+
+
+# Shared monitor for the bot's event loop
+loop_monitor = LoopLagMonitor(interval=Config.LOOP_MONITOR_INTERVAL)
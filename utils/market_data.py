@@ -0,0 +1,316 @@
+"""
+Async market data access layer
+Every Yahoo Finance call made by the commands goes through here
+"""
+import copy
+import threading
+import yfinance as yf
+import pandas as pd
+from typing import Any, Callable, Hashable, Optional, List, Union
+from config import Config
+from .cache import market_cache
+from .executor import run_blocking
+from .instrumentation import timed
+from .logger import setup_logger
+from .price_store import price_store
+from .singleflight import SingleFlight
+
+logger = setup_logger(__name__)
+
+# Coalesces concurrent identical Yahoo requests (e.g. ten users running /stock NVDA)
+_flights = SingleFlight('market_data')
+
+# yf.download keeps its results in module-level state, so calls must not overlap
+_download_lock = threading.Lock()
+
+
+@timed('yfinance', 'info')
+def _fetch_info(symbol: str) -> dict:
+    return yf.Ticker(symbol).info
+
+
+@timed('yfinance', 'history')
+def _fetch_history(symbol: str, **kwargs) -> pd.DataFrame:
+    return yf.Ticker(symbol).history(**kwargs)
+
+
+# Ticker.fast_info fields behind /stock's fast-changing values (all read from one chart request)
+QUOTE_FIELDS = {
+    'currentPrice': 'lastPrice',
+    'previousClose': 'regularMarketPreviousClose',
+    'open': 'open',
+    'dayLow': 'dayLow',
+    'dayHigh': 'dayHigh',
+    'volume': 'lastVolume',
+}
+
+# Ticker.info fields that change slowly enough to cache for hours
+FUNDAMENTAL_FIELDS = ('shortName', 'longName', 'currency', 'marketCap', 'trailingPE')
+
+
+@timed('yfinance', 'quote')
+def _fetch_quote(symbol: str) -> dict:
+    fast_info = yf.Ticker(symbol).fast_info
+    quote = {}
+    try:
+        for field, key in QUOTE_FIELDS.items():
+            value = fast_info[key]
+            if value is not None and value == value:
+                quote[field] = value if field == 'volume' else round(float(value), 2)
+    except Exception as e:
+        # fast_info raises for symbols without chart data; every field comes
+        # from the same request, so don't retry it for the remaining ones
+        logger.debug(f"fast_info failed for {symbol}: {e}")
+    return quote
+
+
+def _fetch_fundamentals(symbol: str) -> dict:
+    info = _fetch_info(symbol)
+    return {field: info[field] for field in FUNDAMENTAL_FIELDS if info.get(field) is not None}
+
+
+@timed('yfinance', 'news')
+def _fetch_news(symbol: str) -> list:
+    return yf.Ticker(symbol).news
+
+
+@timed('yfinance', 'download')
+def _download(symbols, **kwargs) -> pd.DataFrame:
+    with _download_lock:
+        return yf.download(symbols, **kwargs)
+
+
+def _is_empty(value: Any) -> bool:
+    if isinstance(value, pd.DataFrame):
+        return value.empty
+    return not value
+
+
+def _copy(value: Any) -> Any:
+    # Handlers are free to mutate the frames, dicts and lists they get back
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, (dict, list)):
+        return copy.copy(value)
+    return value
+
+
+async def _cached_fetch(key: Hashable, func: Callable[..., Any], *args,
+                        use_cache: bool = True, ttl: Optional[float] = None, **kwargs) -> Any:
+    """
+    Serve a fetch from the market cache, running func in the pool on a miss
+
+    Concurrent misses for the same key share a single upstream call.
+    Empty results are not cached so a transient Yahoo failure is retried
+    on the next request. With use_cache=False the cache is bypassed but
+    concurrent calls are still coalesced; ttl overrides the cache TTL.
+    """
+    use_cache = use_cache and Config.CACHE_ENABLED
+    if use_cache:
+        value = market_cache.get(key)
+        if value is not None:
+            logger.debug(f"Cache hit: {key}")
+            return _copy(value)
+
+    async def fetch():
+        result = await run_blocking(func, *args, **kwargs)
+        if use_cache and not _is_empty(result):
+            market_cache.set(key, result, ttl=ttl)
+        return result
+
+    value = await _flights.do(key, fetch)
+    return _copy(value)
+
+
+async def get_info(symbol: str) -> dict:
+    """
+    Get the full `Ticker.info` payload for a symbol
+
+    Args:
+        symbol: Stock ticker symbol
+
+    Returns:
+        Info dictionary from Yahoo Finance
+    """
+    symbol = symbol.upper()
+    return await _cached_fetch((symbol, 'info'), _fetch_info, symbol)
+
+
+async def get_quote(symbol: str) -> dict:
+    """
+    Get the fast-changing quote fields for a symbol
+
+    Reads `Ticker.fast_info` (a single chart request) instead of the much
+    heavier `Ticker.info`, and is cached for QUOTE_CACHE_TTL.
+
+    Args:
+        symbol: Stock ticker symbol
+
+    Returns:
+        Dictionary with the `Ticker.info` keys currentPrice, previousClose,
+        open, dayLow, dayHigh and volume (missing values are left out)
+    """
+    symbol = symbol.upper()
+    return await _cached_fetch((symbol, 'quote'), _fetch_quote, symbol, ttl=Config.QUOTE_CACHE_TTL)
+
+
+async def get_fundamentals(symbol: str) -> dict:
+    """
+    Get the slow-changing fields of `Ticker.info` (name, market cap, P/E)
+
+    Only these fields are kept, cached for FUNDAMENTALS_CACHE_TTL, so the
+    full info payload is fetched once every few hours per symbol.
+
+    Args:
+        symbol: Stock ticker symbol
+
+    Returns:
+        Dictionary with the available FUNDAMENTAL_FIELDS
+    """
+    symbol = symbol.upper()
+    return await _cached_fetch((symbol, 'fundamentals'), _fetch_fundamentals, symbol,
+                               ttl=Config.FUNDAMENTALS_CACHE_TTL)
+
+
+async def get_history(symbol: str, period: Optional[str] = None, interval: str = '1d',
+                      start=None, end=None) -> pd.DataFrame:
+    """
+    Get OHLCV price history for a symbol
+
+    Args:
+        symbol: Stock ticker symbol
+        period: yfinance period string (e.g. '1y'); ignored if start is given
+        interval: Bar interval
+        start: Optional start date
+        end: Optional end date
+
+    Returns:
+        DataFrame indexed by date
+    """
+    symbol = symbol.upper()
+    kwargs = {'interval': interval}
+    if start is not None:
+        kwargs['start'] = start
+        kwargs['end'] = end
+    else:
+        kwargs['period'] = period or '1mo'
+    key = (symbol, 'history', kwargs.get('period'), interval, str(start), str(end))
+    return await _cached_fetch(key, _fetch_history, symbol, **kwargs)
+
+
+async def get_price_history(symbol: str, start, end=None) -> pd.DataFrame:
+    """
+    Get daily adjusted OHLCV history from the local price store
+
+    Only bars missing from the store are downloaded from Yahoo.
+
+    Args:
+        symbol: Stock ticker symbol
+        start: First date to include
+        end: Optional end date (exclusive)
+
+    Returns:
+        DataFrame indexed by date with Open/High/Low/Close/Volume columns
+    """
+    symbol = symbol.upper()
+    key = (symbol, 'ohlcv', str(start), str(end))
+    return await _flights.do(key, lambda: run_blocking(price_store.get_history, symbol, start, end))
+
+
+async def get_news(symbol: str, use_cache: bool = True) -> list:
+    """
+    Get the latest news items for a symbol
+
+    Args:
+        symbol: Stock ticker symbol
+        use_cache: Serve from / store in the market cache
+
+    Returns:
+        List of raw news items from Yahoo Finance
+    """
+    symbol = symbol.upper()
+    return await _cached_fetch((symbol, 'news'), _fetch_news, symbol, use_cache=use_cache)
+
+
+async def download(symbols: Union[str, List[str]], use_cache: bool = True, **kwargs) -> pd.DataFrame:
+    """
+    Run `yf.download` for one or more symbols off the event loop
+
+    Args:
+        symbols: Ticker symbol or list of symbols
+        use_cache: Serve from / store in the market cache
+        **kwargs: Passed through to yf.download
+
+    Returns:
+        DataFrame as returned by yf.download
+    """
+    kwargs.setdefault('progress', False)
+    if isinstance(symbols, str):
+        symbols = symbols.upper()
+        symbol_key = symbols
+    else:
+        symbols = [s.upper() for s in symbols]
+        symbol_key = tuple(symbols)
+    key = (symbol_key, 'download', tuple(sorted((k, str(v)) for k, v in kwargs.items())))
+    return await _cached_fetch(key, _download, symbols, use_cache=use_cache, **kwargs)
+
+
+async def get_closes(symbols: List[str], period: str = '1y') -> pd.DataFrame:
+    """
+    Daily adjusted closes for many symbols, one column each
+
+    Up to BULK_DOWNLOAD_THRESHOLD symbols are fetched with a single
+    batched `yf.download`; larger sets (e.g. the whole S&P 500) go through
+    the rate-limited BulkDownloader and are cached for CLOSES_CACHE_TTL.
+
+    Args:
+        symbols: Ticker symbols
+        period: yfinance period string
+
+    Returns:
+        DataFrame indexed by date; symbols without data are missing
+    """
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+    if len(symbols) <= Config.BULK_DOWNLOAD_THRESHOLD:
+        df = await download(symbols, period=period, interval='1d', auto_adjust=True)
+        if df.empty:
+            return pd.DataFrame()
+        closes = df['Close'] if isinstance(df.columns, pd.MultiIndex) else df[['Close']].set_axis(symbols, axis=1)
+        if closes.index.tz is not None:
+            closes.index = closes.index.tz_localize(None)
+        return closes.dropna(axis=1, how='all')
+
+    async def fetch():
+        from .bulk_download import BulkDownloader
+        result = await BulkDownloader().download(symbols, period=period, interval='1d', auto_adjust=True)
+        return result.field('Close')
+
+    key = (tuple(sorted(symbols)), 'closes', period)
+    if Config.CACHE_ENABLED:
+        value = market_cache.get(key)
+        if value is not None:
+            return value.copy()
+    value = await _flights.do(key, fetch)
+    if Config.CACHE_ENABLED and not value.empty:
+        market_cache.set(key, value, ttl=Config.CLOSES_CACHE_TTL)
+    return value.copy()
+
+
+def cache_stats() -> dict:
+    """
+    Get hit/miss counters for the market data cache
+
+    Returns:
+        Dictionary of cache statistics
+    """
+    return market_cache.stats()
+
+
+def coalescing_stats() -> dict:
+    """
+    Get counters for request coalescing
+
+    Returns:
+        Dictionary of single-flight statistics
+    """
+    return _flights.stats()
@@ -0,0 +1,212 @@
+"""
+S&P 500 market snapshot
+Keeps last price, % change and volume for every constituent in memory,
+refreshed in the background so /marketdata only has to rank it
+"""
+import asyncio
+import datetime
+import pandas as pd
+from typing import Optional, List
+from zoneinfo import ZoneInfo
+from config import Config
+from .bulk_download import BulkDownloader
+from .executor import run_blocking
+from .logger import setup_logger
+from .sp500 import get_sp500_symbols
+
+logger = setup_logger(__name__)
+
+MARKET_TZ = ZoneInfo('America/New_York')
+MARKET_OPEN = datetime.time(9, 30)
+MARKET_CLOSE = datetime.time(16, 0)
+# Give Yahoo time to publish final closing prices before the after-close refresh
+CLOSE_SETTLE_DELAY = datetime.timedelta(minutes=20)
+
+
+def is_market_open(now: Optional[datetime.datetime] = None) -> bool:
+    """
+    Check whether the US market is in its regular session (holidays ignored)
+
+    Args:
+        now: Aware datetime to check (defaults to the current time)
+
+    Returns:
+        True during 9:30-16:00 New York time on weekdays
+    """
+    now = (now or datetime.datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def last_session_close(now: Optional[datetime.datetime] = None) -> datetime.datetime:
+    """
+    Get the most recent regular-session close at or before now
+
+    Args:
+        now: Aware datetime (defaults to the current time)
+
+    Returns:
+        Aware datetime of the last 16:00 New York close on a weekday
+    """
+    now = (now or datetime.datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    close = datetime.datetime.combine(now.date(), MARKET_CLOSE, tzinfo=MARKET_TZ)
+    if close > now:
+        close -= datetime.timedelta(days=1)
+    while close.weekday() >= 5:
+        close -= datetime.timedelta(days=1)
+    return close
+
+
+class MarketSnapshot:
+    """
+    Ranked view of one S&P 500 download
+
+    Rows are pre-sorted by change and by volume when the snapshot is built,
+    so any top-N query is a slice.
+    """
+
+    def __init__(self, table: pd.DataFrame, updated_at: datetime.datetime):
+        self.table = table
+        self.updated_at = updated_at
+        self.by_change = table.sort_values(by='Change (%)', ascending=False)
+        self.by_volume = table.sort_values(by='Volume', ascending=False)
+        self.gainers = int((table['Change (%)'] > 0).sum())
+        self.losers = int((table['Change (%)'] < 0).sum())
+        self.avg_change = float(table['Change (%)'].mean())
+
+    def top_gainers(self, n: int) -> pd.DataFrame:
+        return self.by_change.head(n)
+
+    def top_losers(self, n: int) -> pd.DataFrame:
+        return self.by_change.iloc[::-1].head(n)
+
+    def most_active(self, n: int) -> pd.DataFrame:
+        return self.by_volume.head(n)
+
+    def age(self) -> float:
+        """Seconds since the snapshot was taken"""
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return (now - self.updated_at).total_seconds()
+
+    @classmethod
+    def from_prices(cls, close: pd.DataFrame, volume: pd.DataFrame) -> Optional['MarketSnapshot']:
+        """
+        Build a snapshot from daily close and volume frames (one column per ticker)
+
+        Returns:
+            MarketSnapshot, or None if there are not enough rows
+        """
+        if close.empty or len(close) < 2:
+            return None
+
+        close_prices = close.iloc[-2:]
+        pct_change = ((close_prices.iloc[-1] - close_prices.iloc[-2]) / close_prices.iloc[-2]) * 100
+
+        table = pd.DataFrame({
+            'Ticker': pct_change.index,
+            'Price': close.iloc[-1],
+            'Change (%)': pct_change,
+            'Volume': volume.iloc[-1] if not volume.empty else 0
+        }).dropna()
+
+        if table.empty:
+            return None
+        return cls(table, datetime.datetime.now(datetime.timezone.utc))
+
+
+async def fetch_snapshot(symbols: List[str],
+                         downloader: Optional[BulkDownloader] = None) -> Optional[MarketSnapshot]:
+    """
+    Download recent daily bars for all symbols and build a snapshot
+
+    Args:
+        symbols: Ticker symbols to include
+        downloader: Bulk downloader to use (a default one is created if omitted)
+
+    Returns:
+        MarketSnapshot, or None if no prices could be fetched
+    """
+    downloader = downloader or BulkDownloader()
+    result = await downloader.download(symbols, period='5d', interval='1d', auto_adjust=True)
+    if result.empty:
+        return None
+
+    if result.failed:
+        logger.warning(f"Market snapshot missing {len(result.failed)} symbols: {', '.join(result.failed[:20])}")
+
+    return MarketSnapshot.from_prices(result.field('Close'), result.field('Volume'))
+
+
+class SnapshotStore:
+    """Holds the current market snapshot and decides when to refresh it"""
+
+    def __init__(self):
+        self.snapshot: Optional[MarketSnapshot] = None
+        self._downloader = BulkDownloader()
+        self._lock = asyncio.Lock()
+
+    def needs_refresh(self, now: Optional[datetime.datetime] = None) -> bool:
+        """
+        Decide whether the snapshot is out of date
+
+        During the session it is refreshed every MARKET_SNAPSHOT_INTERVAL;
+        after the close it is refreshed once the closing prices have settled.
+        """
+        if self.snapshot is None:
+            return True
+
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        age = (now - self.snapshot.updated_at).total_seconds()
+        if age > Config.MARKET_SNAPSHOT_MAX_AGE:
+            return True
+        if is_market_open(now):
+            return age > Config.MARKET_SNAPSHOT_INTERVAL
+
+        settled_close = last_session_close(now) + CLOSE_SETTLE_DELAY
+        return self.snapshot.updated_at < settled_close <= now
+
+    async def refresh(self) -> Optional[MarketSnapshot]:
+        """
+        Rebuild the snapshot now (concurrent callers share one refresh)
+
+        Returns:
+            The current snapshot (the previous one if the refresh failed)
+        """
+        if self._lock.locked():
+            async with self._lock:
+                return self.snapshot
+
+        async with self._lock:
+            symbols = await run_blocking(get_sp500_symbols)
+            if not symbols:
+                logger.error("Market snapshot refresh skipped: no S&P 500 symbols")
+                return self.snapshot
+
+            snapshot = await fetch_snapshot(symbols[:Config.MAX_MARKET_DATA_STOCKS], self._downloader)
+            if snapshot is None:
+                logger.warning("Market snapshot refresh returned no data, keeping previous snapshot")
+                return self.snapshot
+
+            self.snapshot = snapshot
+            logger.info(f"Market snapshot refreshed: {len(snapshot.table)} tickers")
+            return snapshot
+
+    async def get(self) -> Optional[MarketSnapshot]:
+        """
+        Get the current snapshot, building it first if none exists yet
+
+        Returns:
+            MarketSnapshot, or None if market data is unavailable
+        """
+        if self.snapshot is None:
+            return await self.refresh()
+        return self.snapshot
+
+
+# Shared snapshot used by /marketdata
+market_snapshot = SnapshotStore()
+
+
+async def refresh_market_snapshot():
+    """Scheduler job: refresh the market snapshot when it is out of date"""
+    if market_snapshot.needs_refresh():
+        await market_snapshot.refresh()
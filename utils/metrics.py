@@ -0,0 +1,228 @@
+"""
+Lightweight metrics registry
+Counters, gauges and histograms exposed in the Prometheus text format on
+/metrics
+"""
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+Sample = Tuple[Dict[str, str], float]
+
+# Latency buckets in seconds, from a cache hit to a slow Yahoo request
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ''
+    escaped = (f'{k}="{v.replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in key)
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value != value:
+        return 'NaN'
+    if value in (float('inf'), float('-inf')):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+class Metric:
+    """
+    Base class: a named metric with a help string and labelled values
+
+    Values are either recorded explicitly, or computed at scrape time by
+    `func`, which returns a number or a list of (labels, value) pairs.
+    """
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, help_text: str,
+                 func: Optional[Callable[[], Union[float, List[Sample]]]] = None):
+        self.name = name
+        self.help = help_text
+        self.func = func
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def samples(self) -> Iterable[Tuple[str, LabelKey, float]]:
+        if self.func is not None:
+            yield from self._collect()
+            return
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, key, value
+
+    def _collect(self):
+        try:
+            result = self.func()
+        except Exception as e:
+            logger.debug(f"Metric {self.name} collection failed: {e}")
+            return
+        if isinstance(result, (int, float)):
+            yield self.name, (), float(result)
+        else:
+            for labels, value in result:
+                yield self.name, _label_key(labels), float(value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for name, key, value in self.samples():
+            lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+
+class Gauge(Metric):
+    """Value that can go up and down"""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values
+
+    Cumulative buckets are exported for Prometheus; the most recent
+    `window` observations per label set are also kept so percentiles can
+    be computed in-process (e.g. for /botstats).
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, window: int = 1024):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        self.window = window
+        self._counts: Dict[LabelKey, List[int]] = {}
+        self._sums: Dict[LabelKey, float] = {}
+        self._recent: Dict[LabelKey, Deque[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+                self._recent[key] = deque(maxlen=self.window)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-1] += 1
+            self._sums[key] += value
+            self._recent[key].append(value)
+
+    def label_sets(self) -> List[Dict[str, str]]:
+        with self._lock:
+            return [dict(key) for key in self._counts]
+
+    def count(self, **labels) -> int:
+        counts = self._counts.get(_label_key(labels))
+        return counts[-1] if counts else 0
+
+    def percentiles(self, quantiles: Sequence[float] = (0.5, 0.95, 0.99), **labels) -> Dict[float, float]:
+        """
+        Percentiles over the recent observations for one label set
+
+        Args:
+            quantiles: Quantiles between 0 and 1
+            **labels: Label set to summarize
+
+        Returns:
+            Mapping of quantile -> value (empty if nothing was observed)
+        """
+        with self._lock:
+            values = sorted(self._recent.get(_label_key(labels), ()))
+        if not values:
+            return {}
+        last = len(values) - 1
+        return {q: values[min(last, int(round(q * last)))] for q in quantiles}
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+        for key, counts, total in items:
+            for bound, count in zip(self.buckets, counts):
+                yield f"{self.name}_bucket", key + (('le', _format_value(bound)),), count
+            yield f"{self.name}_bucket", key + (('le', '+Inf'),), counts[-1]
+            yield f"{self.name}_sum", key, total
+            yield f"{self.name}_count", key, counts[-1]
+
+
+class Registry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self, prefix: str = 'stockbot'):
+        self.prefix = prefix
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def _name(self, name: str) -> str:
+        return f"{self.prefix}_{name}" if self.prefix else name
+
+    def counter(self, name: str, help_text: str, func=None) -> Counter:
+        return self._register(Counter(self._name(name), help_text, func))
+
+    def gauge(self, name: str, help_text: str, func=None) -> Gauge:
+        return self._register(Gauge(self._name(name), help_text, func))
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self._name(name), help_text, buckets))
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(self._name(name))
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# Shared metrics registry
+registry = Registry()
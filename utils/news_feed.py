@@ -0,0 +1,211 @@
+"""
+Background news ingestion
+Polls Yahoo Finance news for watched and recently queried tickers,
+de-duplicates it and pre-translates it to Thai so /news only formats
+prepared entries
+"""
+import asyncio
+import datetime
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from config import Config
+from .logger import setup_logger
+from .singleflight import SingleFlight
+from .translator import translate_many_to_thai
+from . import market_data
+
+logger = setup_logger(__name__)
+
+
+def _parse_link(content: dict) -> str:
+    link = None
+    click_url = content.get('clickThroughUrl')
+    if click_url and isinstance(click_url, dict):
+        link = click_url.get('url')
+
+    if not link:
+        canonical_url = content.get('canonicalUrl')
+        if canonical_url and isinstance(canonical_url, dict):
+            link = canonical_url.get('url')
+
+    if not link:
+        link = content.get('previewUrl')
+
+    return str(link) if link else '#'
+
+
+def _parse_publish_time(content: dict) -> str:
+    pub_date = content.get('pubDate') or content.get('displayTime')
+    if pub_date:
+        try:
+            dt = datetime.datetime.fromisoformat(pub_date.replace('Z', '+00:00'))
+            return dt.strftime('%d/%m/%Y %H:%M')
+        except (ValueError, AttributeError):
+            pass
+    return "N/A"
+
+
+def _parse_thumbnail(content: dict) -> Optional[str]:
+    thumbnail = content.get('thumbnail')
+    if thumbnail and isinstance(thumbnail, dict):
+        resolutions = thumbnail.get('resolutions', [])
+        if resolutions and len(resolutions) > 0:
+            return resolutions[0].get('url')
+        elif thumbnail.get('originalUrl'):
+            return thumbnail.get('originalUrl')
+    return None
+
+
+def parse_news_item(item: dict) -> dict:
+    """
+    Extract the fields /news displays from a raw Yahoo Finance news item
+
+    Args:
+        item: Raw item from `Ticker.news`
+
+    Returns:
+        Dictionary with id, title, summary, publisher, link, publish_time
+        and thumbnail
+    """
+    content = item.get('content', {}) or {}
+    publisher = content.get('provider', {}).get('displayName', 'N/A')
+    link = _parse_link(content)
+    return {
+        'id': item.get('id') or content.get('id') or link,
+        'title': content.get('title', '') or '',
+        'summary': content.get('summary', '') or '',
+        'publisher': str(publisher) if publisher else 'N/A',
+        'link': link,
+        'publish_time': _parse_publish_time(content),
+        'thumbnail': _parse_thumbnail(content),
+    }
+
+
+def dedupe_news(entries: List[dict]) -> List[dict]:
+    """Drop entries whose id or link was already seen (keeps the first)"""
+    seen = set()
+    unique = []
+    for entry in entries:
+        keys = {entry['id'], entry['link']} - {'#', None}
+        if keys & seen:
+            continue
+        seen |= keys
+        unique.append(entry)
+    return unique
+
+
+async def prepare_news(raw_items: List[dict], limit: int) -> List[dict]:
+    """
+    Parse, de-duplicate and translate raw news items
+
+    Args:
+        raw_items: Items from `Ticker.news`
+        limit: Maximum number of entries to prepare
+
+    Returns:
+        Entries with added title_th and summary_th
+    """
+    entries = dedupe_news([parse_news_item(item) for item in raw_items])[:limit]
+    titles = [entry['title'] for entry in entries]
+    summaries = [entry['summary'] for entry in entries]
+    translated = await translate_many_to_thai(titles + summaries)
+
+    for i, entry in enumerate(entries):
+        entry['title_th'] = translated[i] if entry['title'] else 'ไม่มีหัวข้อ'
+        entry['summary_th'] = translated[len(entries) + i] if entry['summary'] else ''
+    return entries
+
+
+class NewsFeed:
+    """
+    Prepared (translated) news per ticker, kept warm by a background poller
+
+    The poller covers Config.NEWS_WATCHLIST plus up to NEWS_RECENT_MAX
+    tickers somebody got news for within NEWS_RECENT_TTL.
+    """
+
+    def __init__(self, watchlist: List[str]):
+        self.watchlist = [s.upper() for s in watchlist]
+        self._entries: Dict[str, Tuple[float, List[dict]]] = {}
+        self._recent: 'OrderedDict[str, float]' = OrderedDict()
+        self._flights = SingleFlight('news_feed')
+
+    def tracked_symbols(self) -> List[str]:
+        """Watchlist plus recently queried tickers (expired ones are dropped)"""
+        now = time.monotonic()
+        self._recent = OrderedDict((s, t) for s, t in self._recent.items() if now - t < Config.NEWS_RECENT_TTL)
+        return list(dict.fromkeys(self.watchlist + list(self._recent)))
+
+    def cached(self, symbol: str) -> Optional[List[dict]]:
+        """Prepared entries for a symbol if they are fresh enough to serve"""
+        stored = self._entries.get(symbol.upper())
+        if stored and time.monotonic() - stored[0] < Config.NEWS_POLL_INTERVAL * 2:
+            return stored[1]
+        return None
+
+    async def refresh(self, symbol: str) -> List[dict]:
+        """
+        Fetch and prepare news for one symbol now
+
+        Returns:
+            Prepared entries (may be empty)
+        """
+        symbol = symbol.upper()
+
+        async def fetch():
+            raw_items = await market_data.get_news(symbol, use_cache=False)
+            entries = await prepare_news(raw_items or [], Config.MAX_NEWS_ITEMS)
+            self._entries[symbol] = (time.monotonic(), entries)
+            return entries
+
+        return await self._flights.do(symbol, fetch)
+
+    async def get(self, symbol: str) -> List[dict]:
+        """
+        Get prepared news for a symbol, fetching it if it is not warm
+
+        Symbols that returned news are marked as recently queried so the
+        poller keeps them warm; typos and unknown tickers are not polled.
+        """
+        symbol = symbol.upper()
+        entries = self.cached(symbol)
+        if entries is None:
+            entries = await self.refresh(symbol)
+        if entries:
+            self._track(symbol)
+        return entries
+
+    def _track(self, symbol: str):
+        """Mark a symbol as recently queried, evicting the least recent beyond NEWS_RECENT_MAX"""
+        self._recent[symbol] = time.monotonic()
+        self._recent.move_to_end(symbol)
+        while len(self._recent) > Config.NEWS_RECENT_MAX:
+            self._recent.popitem(last=False)
+
+    async def poll(self):
+        """Refresh every tracked symbol with bounded concurrency"""
+        symbols = self.tracked_symbols()
+        semaphore = asyncio.Semaphore(Config.NEWS_POLL_CONCURRENCY)
+
+        async def refresh_one(symbol: str):
+            async with semaphore:
+                try:
+                    await self.refresh(symbol)
+                except Exception as e:
+                    logger.warning(f"News refresh failed for {symbol}: {e}")
+
+        await asyncio.gather(*(refresh_one(s) for s in symbols))
+        # Forget entries nobody is tracking any more
+        for symbol in set(self._entries) - set(symbols):
+            del self._entries[symbol]
+        logger.debug(f"News feed refreshed for {len(symbols)} symbols")
+
+
+# Shared feed used by /news
+news_feed = NewsFeed(Config.NEWS_WATCHLIST)
+
+
+async def poll_news():
+    """Scheduler job: refresh news for all tracked symbols"""
+    await news_feed.poll()
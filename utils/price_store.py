@@ -0,0 +1,203 @@
+"""
+Local OHLCV store for daily price history
+Keeps one memory-mapped NumPy file per symbol and only downloads the
+missing tail from Yahoo Finance
+"""
+import json
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from typing import Dict, Optional
+from config import Config
+from .instrumentation import timed
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+OHLCV_DTYPE = np.dtype([
+    ('date', 'M8[D]'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'f8'),
+])
+
+# Column names as used by yfinance / the commands
+COLUMNS = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
+
+# Relative close difference on the overlapping bar that means Yahoo has
+# re-adjusted the series (split or dividend) and the stored history is stale
+ADJUSTMENT_TOLERANCE = 1e-4
+
+
+def _to_date(value) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+
+def _frame_to_records(df: pd.DataFrame) -> np.ndarray:
+    """Convert a yfinance history frame to OHLCV records"""
+    index = df.index
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    records = np.empty(len(df), dtype=OHLCV_DTYPE)
+    records['date'] = index.normalize().values.astype('M8[D]')
+    for field, column in COLUMNS.items():
+        records[field] = df[column].to_numpy(dtype='f8')
+    return records[~np.isnan(records['close'])]
+
+
+def records_to_frame(records: np.ndarray) -> pd.DataFrame:
+    """
+    Convert OHLCV records to a DataFrame like `Ticker.history` returns
+
+    Args:
+        records: Structured array with OHLCV_DTYPE
+
+    Returns:
+        DataFrame indexed by date with Open/High/Low/Close/Volume columns
+    """
+    return pd.DataFrame(
+        {column: np.asarray(records[field]) for field, column in COLUMNS.items()},
+        index=pd.DatetimeIndex(records['date'].astype('M8[ns]'), name='Date')
+    )
+
+
+class PriceStore:
+    """
+    Per-symbol daily OHLCV files with incremental tail updates
+
+    Each symbol has `<SYMBOL>.npy` (structured array, loaded memory-mapped)
+    and `<SYMBOL>.json` recording the earliest date requested and when the
+    tail was last checked against Yahoo. Prices are split/dividend adjusted;
+    if Yahoo re-adjusts the series the whole range is downloaded again.
+    """
+
+    def __init__(self, root: str, tail_ttl: float):
+        self.root = root
+        self.tail_ttl = tail_ttl
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _paths(self, symbol: str):
+        base = os.path.join(self.root, symbol.replace('/', '_'))
+        return f"{base}.npy", f"{base}.json"
+
+    def read(self, symbol: str) -> Optional[np.ndarray]:
+        """
+        Memory-map the stored records for a symbol
+
+        Returns:
+            Read-only structured array, or None if nothing is stored
+        """
+        data_path, _ = self._paths(symbol.upper())
+        if not os.path.exists(data_path):
+            return None
+        try:
+            return np.load(data_path, mmap_mode='r')
+        except Exception as e:
+            logger.warning(f"Corrupt price store file for {symbol}: {e}")
+            return None
+
+    def _read_meta(self, symbol: str) -> dict:
+        _, meta_path = self._paths(symbol)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, symbol: str, records: np.ndarray, meta: dict):
+        os.makedirs(self.root, exist_ok=True)
+        data_path, meta_path = self._paths(symbol)
+        # np.save appends .npy to names that do not end with it
+        tmp_data = f"{data_path}.tmp.npy"
+        np.save(tmp_data, records)
+        os.replace(tmp_data, data_path)
+        with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(f"{meta_path}.tmp", meta_path)
+
+    def _download(self, symbol: str, start: np.datetime64) -> np.ndarray:
+        with timed('yfinance', 'ohlcv'):
+            df = yf.Ticker(symbol).history(start=str(start), interval='1d', auto_adjust=True)
+        if df.empty:
+            return np.empty(0, dtype=OHLCV_DTYPE)
+        return _frame_to_records(df)
+
+    def _update(self, symbol: str, start: np.datetime64) -> Optional[np.ndarray]:
+        """Bring the stored series up to date and make sure it covers start"""
+        records = self.read(symbol)
+        meta = self._read_meta(symbol)
+        stored_start = np.datetime64(meta['start'], 'D') if meta.get('start') else None
+
+        if records is None or len(records) == 0 or stored_start is None or start < stored_start:
+            fetched = self._download(symbol, start)
+            if len(fetched) == 0:
+                return records
+            logger.info(f"Price store: downloaded {len(fetched)} bars for {symbol}")
+            self._write(symbol, fetched, {'start': str(start), 'checked_at': time.time()})
+            return fetched
+
+        if time.time() - meta.get('checked_at', 0) < self.tail_ttl:
+            return records
+
+        # Re-fetch from the bar before last: the last one may have been a partial
+        # intraday bar, the one before it must match unless Yahoo re-adjusted
+        anchor = records['date'][-2] if len(records) > 1 else records['date'][-1]
+        tail = self._download(symbol, anchor)
+        if len(tail) == 0:
+            return records
+
+        if tail['date'][0] == anchor:
+            stored_close = records['close'][records['date'] == anchor][0]
+            if abs(tail['close'][0] - stored_close) > ADJUSTMENT_TOLERANCE * abs(stored_close):
+                logger.info(f"Price store: {symbol} was re-adjusted by Yahoo, re-downloading")
+                fetched = self._download(symbol, stored_start)
+                if len(fetched) == 0:
+                    return records
+                self._write(symbol, fetched, {'start': str(stored_start), 'checked_at': time.time()})
+                return fetched
+
+        updated = np.concatenate([np.asarray(records[records['date'] < tail['date'][0]]), tail])
+        meta['checked_at'] = time.time()
+        self._write(symbol, updated, meta)
+        logger.debug(f"Price store: {symbol} tail updated (+{len(updated) - len(records)} bars)")
+        return updated
+
+    def get_history(self, symbol: str, start, end=None) -> pd.DataFrame:
+        """
+        Get daily adjusted OHLCV history, downloading only what is missing (blocking)
+
+        Args:
+            symbol: Stock ticker symbol
+            start: First date to include
+            end: Optional end date (exclusive, like yf.download)
+
+        Returns:
+            DataFrame indexed by date; empty if Yahoo has no data
+        """
+        symbol = symbol.upper()
+        start = _to_date(start)
+
+        with self._lock(symbol):
+            records = self._update(symbol, start)
+
+        if records is None or len(records) == 0:
+            return pd.DataFrame(columns=list(COLUMNS.values()))
+
+        dates = records['date']
+        lo = np.searchsorted(dates, start, side='left')
+        hi = np.searchsorted(dates, _to_date(end), side='left') if end is not None else len(records)
+        return records_to_frame(records[lo:hi])
+
+
+# Shared store used by the analysis commands
+price_store = PriceStore(Config.PRICE_STORE_DIR, tail_ttl=Config.PRICE_STORE_TAIL_TTL)
@@ -0,0 +1,259 @@
+"""
+Shared live quote poller
+Fetches every symbol watched via /watch in one batched request per
+interval and fans the quotes out to the subscriptions that use them
+"""
+import asyncio
+import datetime
+import itertools
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+from config import Config
+from .lazy import load_module
+from .logger import setup_logger
+from .metrics import registry
+
+logger = setup_logger(__name__)
+
+# Concurrent Discord message edits per poll
+EDIT_CONCURRENCY = 5
+
+
+class Quote:
+    """Latest price for one symbol (from the daily bars of a batched download)"""
+
+    def __init__(self, symbol: str, price: float, previous_close: Optional[float],
+                 day_low: Optional[float], day_high: Optional[float], volume: Optional[int]):
+        self.symbol = symbol
+        self.price = price
+        self.previous_close = previous_close
+        self.day_low = day_low
+        self.day_high = day_high
+        self.volume = volume
+
+    @property
+    def change(self) -> Optional[float]:
+        if self.previous_close is None:
+            return None
+        return self.price - self.previous_close
+
+    @property
+    def change_percent(self) -> Optional[float]:
+        if not self.previous_close:
+            return None
+        return self.change / self.previous_close * 100
+
+    def key(self) -> tuple:
+        """Values that, when unchanged, make a message edit pointless"""
+        return (self.price, self.previous_close, self.day_low, self.day_high, self.volume)
+
+
+def _value(row, field: str) -> Optional[float]:
+    value = row.get(field)
+    return None if value is None or value != value else float(value)
+
+
+def quotes_from_frame(df, symbols: Iterable[str]) -> Dict[str, Quote]:
+    """
+    Build quotes from a `yf.download(..., interval='1d')` frame
+
+    Args:
+        df: Download result with (field, symbol) columns
+        symbols: Symbols that were requested
+
+    Returns:
+        Quotes for the symbols that have at least one close
+    """
+    quotes = {}
+    if df is None or df.empty:
+        return quotes
+    for symbol in symbols:
+        try:
+            bars = df.xs(symbol, axis=1, level=-1) if df.columns.nlevels > 1 else df
+        except KeyError:
+            continue
+        bars = bars.dropna(subset=['Close'])
+        if bars.empty:
+            continue
+        last = bars.iloc[-1]
+        previous = float(bars['Close'].iloc[-2]) if len(bars) > 1 else None
+        volume = _value(last, 'Volume')
+        quotes[symbol] = Quote(
+            symbol,
+            price=float(last['Close']),
+            previous_close=previous,
+            day_low=_value(last, 'Low'),
+            day_high=_value(last, 'High'),
+            volume=int(volume) if volume is not None else None,
+        )
+    return quotes
+
+
+async def fetch_quotes(symbols: List[str]) -> Dict[str, Quote]:
+    """
+    Fetch quotes for many symbols with a single batched download
+
+    Args:
+        symbols: Ticker symbols
+
+    Returns:
+        Quotes keyed by symbol (symbols without data are missing)
+    """
+    if not symbols:
+        return {}
+    market_data = await load_module('utils.market_data')
+    df = await market_data.download(symbols, use_cache=False, period='5d', interval='1d',
+                                    auto_adjust=False)
+    return quotes_from_frame(df, symbols)
+
+
+UpdateCallback = Callable[['Subscription', Dict[str, Quote], bool], Awaitable[None]]
+
+
+class Subscription:
+    """
+    One live quote message: the symbols it shows and how to update it
+
+    `on_update(subscription, quotes, final)` is called with the latest
+    quotes; final is True once the watch expires or is stopped. Raising
+    LookupError from it (e.g. the message was deleted) ends the watch.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, channel_id: int, owner_id: int, symbols: List[str],
+                 minutes: int, on_update: UpdateCallback):
+        self.id = next(self._ids)
+        self.channel_id = channel_id
+        self.owner_id = owner_id
+        self.symbols = symbols
+        self.on_update = on_update
+        self.created_at = datetime.datetime.now(datetime.timezone.utc)
+        self.expires_at = self.created_at + datetime.timedelta(minutes=minutes)
+        self.last_key: Optional[tuple] = None
+
+    @property
+    def expired(self) -> bool:
+        return datetime.datetime.now(datetime.timezone.utc) >= self.expires_at
+
+    def quotes_key(self, quotes: Dict[str, Quote]) -> tuple:
+        return tuple(quotes[s].key() if s in quotes else None for s in self.symbols)
+
+
+class QuotePoller:
+    """
+    Central poller for /watch
+
+    Upstream cost is one batched request per interval for the distinct
+    watched symbols, however many messages show them; a message is only
+    edited when one of its quotes changed.
+    """
+
+    def __init__(self):
+        self.subscriptions: Dict[int, Subscription] = {}
+        self.quotes: Dict[str, Quote] = {}
+        self.updated_at: Optional[float] = None
+        self.polls = 0
+        self.edits = 0
+        self._lock = asyncio.Lock()
+
+    def symbols(self) -> List[str]:
+        """Distinct symbols across all subscriptions"""
+        return sorted({s for sub in self.subscriptions.values() for s in sub.symbols})
+
+    def for_channel(self, channel_id: int) -> List[Subscription]:
+        return [sub for sub in self.subscriptions.values() if sub.channel_id == channel_id]
+
+    def can_subscribe(self, channel_id: int) -> Optional[str]:
+        """
+        Check subscription limits
+
+        Returns:
+            None if a new subscription is allowed, otherwise the reason
+        """
+        if len(self.subscriptions) >= Config.WATCH_MAX_SUBSCRIPTIONS:
+            return 'global'
+        if len(self.for_channel(channel_id)) >= Config.WATCH_MAX_PER_CHANNEL:
+            return 'channel'
+        return None
+
+    async def quotes_for(self, symbols: List[str]) -> Dict[str, Quote]:
+        """
+        Quotes to show a new subscription right away
+
+        Served from the last poll; only symbols nobody watched yet are
+        fetched now (and kept until the next poll replaces them).
+        """
+        missing = [s for s in symbols if s not in self.quotes]
+        if missing:
+            self.quotes.update(await fetch_quotes(missing))
+        return self.quotes
+
+    def add(self, subscription: Subscription):
+        self.subscriptions[subscription.id] = subscription
+        logger.info(f"Watch {subscription.id} started in channel {subscription.channel_id}: "
+                    f"{', '.join(subscription.symbols)} ({len(self.symbols())} symbols watched)")
+
+    async def remove(self, subscription: Subscription, final: bool = True):
+        """Stop a subscription, giving it a last update to show it has ended"""
+        if self.subscriptions.pop(subscription.id, None) is None:
+            return
+        if final:
+            try:
+                await subscription.on_update(subscription, self.quotes, True)
+            except Exception as e:
+                logger.debug(f"Final update for watch {subscription.id} failed: {e}")
+        logger.info(f"Watch {subscription.id} stopped")
+
+    async def _update(self, subscription: Subscription, semaphore: asyncio.Semaphore):
+        if subscription.expired:
+            await self.remove(subscription)
+            return
+        key = subscription.quotes_key(self.quotes)
+        if key == subscription.last_key:
+            return
+        async with semaphore:
+            try:
+                await subscription.on_update(subscription, self.quotes, False)
+                subscription.last_key = key
+                self.edits += 1
+            except LookupError:
+                # Message or channel is gone
+                await self.remove(subscription, final=False)
+            except Exception as e:
+                logger.warning(f"Failed to update watch {subscription.id}: {e}")
+
+    async def poll(self):
+        """Fetch all watched symbols once and update every subscription"""
+        if not self.subscriptions:
+            return
+        async with self._lock:
+            symbols = self.symbols()
+            quotes = await fetch_quotes(symbols)
+            self.polls += 1
+            missing = len(symbols) - len(quotes)
+            logger.debug(f"Quote poll: {len(quotes)} symbols{f', {missing} missing' if missing else ''}")
+            if not quotes:
+                # Keep showing the last prices; only retire expired watches
+                for sub in [s for s in self.subscriptions.values() if s.expired]:
+                    await self.remove(sub)
+                return
+            self.quotes = quotes
+            self.updated_at = time.monotonic()
+
+            semaphore = asyncio.Semaphore(EDIT_CONCURRENCY)
+            await asyncio.gather(*(self._update(sub, semaphore) for sub in list(self.subscriptions.values())))
+
+
+# Shared poller used by /watch
+quote_poller = QuotePoller()
+
+registry.gauge('watch_subscriptions', 'Active /watch messages', lambda: len(quote_poller.subscriptions))
+registry.gauge('watch_symbols', 'Distinct symbols polled for /watch', lambda: len(quote_poller.symbols()))
+registry.counter('watch_polls_total', 'Batched quote fetches for /watch', lambda: quote_poller.polls)
+registry.counter('watch_edits_total', 'Watch message edits', lambda: quote_poller.edits)
+
+
+async def poll_quotes():
+    """Scheduler job: refresh quotes for all /watch subscriptions"""
+    await quote_poller.poll()
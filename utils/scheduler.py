@@ -0,0 +1,110 @@
+"""
+Background job scheduler
+Runs periodic maintenance tasks (data refreshes) on the bot's event loop
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+Interval = Union[float, Callable[[], float]]
+
+
+class Job:
+    """A periodic coroutine function registered with the scheduler"""
+
+    def __init__(self, name: str, func: Callable[[], Awaitable[None]],
+                 interval: Interval, initial_delay: float = 0):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.initial_delay = initial_delay
+        self.runs = 0
+        self.failures = 0
+
+    def next_delay(self) -> float:
+        """Seconds to wait before the next run (intervals may be dynamic)"""
+        return self.interval() if callable(self.interval) else self.interval
+
+
+class Scheduler:
+    """
+    Minimal asyncio scheduler for periodic jobs
+
+    Jobs are registered up front with `add_job` and started once the event
+    loop is running. A failing run is logged and retried on the next tick;
+    it never stops the job.
+    """
+
+    def __init__(self):
+        self._jobs: List[Job] = []
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def jobs(self) -> List[Job]:
+        return list(self._jobs)
+
+    def add_job(self, name: str, func: Callable[[], Awaitable[None]],
+                interval: Interval, initial_delay: float = 0) -> Job:
+        """
+        Register a periodic job
+
+        Args:
+            name: Unique job name (used in logs)
+            func: Coroutine function run on every tick
+            interval: Seconds between runs, or a callable returning it
+            initial_delay: Seconds to wait before the first run
+
+        Returns:
+            The registered job
+        """
+        job = Job(name, func, interval, initial_delay)
+        self._jobs.append(job)
+        if self.running:
+            self._tasks[name] = asyncio.get_running_loop().create_task(self._run(job))
+        return job
+
+    def get_job(self, name: str) -> Optional[Job]:
+        """Look up a registered job by name"""
+        return next((job for job in self._jobs if job.name == name), None)
+
+    def start(self):
+        """Start all registered jobs on the running event loop"""
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        for job in self._jobs:
+            self._tasks[job.name] = loop.create_task(self._run(job))
+        logger.info(f"Scheduler started with {len(self._jobs)} jobs")
+
+    async def stop(self):
+        """Cancel all running jobs and wait for them to finish"""
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if tasks:
+            logger.info("Scheduler stopped")
+
+    async def _run(self, job: Job):
+        await asyncio.sleep(job.initial_delay)
+        while True:
+            try:
+                await job.func()
+                job.runs += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.failures += 1
+                logger.error(f"Background job '{job.name}' failed: {e}", exc_info=True)
+            await asyncio.sleep(job.next_delay())
+
+
+# Shared scheduler for all background jobs
+scheduler = Scheduler()
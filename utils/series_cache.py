@@ -0,0 +1,105 @@
+"""
+Incremental analytics state per price series
+Keeps streaming engines (risk, indicators) advanced through a symbol's
+history so a request only feeds them the bars added since the last one
+"""
+import threading
+from typing import Any, Callable, Hashable
+from config import Config
+from .cache import TTLCache
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class _Entry:
+    def __init__(self, engine: Any, first_date, last_date, last_close: float):
+        self.engine = engine
+        self.first_date = first_date
+        self.last_date = last_date
+        self.last_close = last_close
+
+
+class SeriesCache:
+    """
+    Cache of engines fed with a symbol's daily bars
+
+    Only settled bars (all but the latest, which Yahoo keeps revising during
+    the session) advance the cached engine; every call works on a copy that
+    also gets the latest bar. The engine is rebuilt from scratch when the
+    request needs older history than it has seen, or when the stored prices
+    were re-adjusted (split/dividend) or have gaps.
+
+    Engines must provide `copy()`; `feed(engine, bars)` advances one with
+    a DataFrame slice of new bars.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, name: str = 'series'):
+        self._cache = TTLCache(ttl=ttl, max_entries=max_entries, name=name)
+        self._lock = threading.Lock()
+        self.name = name
+        self.rebuilds = 0
+        self.updates = 0
+
+    @property
+    def memory(self) -> TTLCache:
+        return self._cache
+
+    def _settled(self, key: Hashable, df, factory: Callable[[], Any],
+                 feed: Callable[[Any, Any], None]) -> Any:
+        settled = df.iloc[:-1]
+        entry = self._cache.get(key)
+        if entry is not None:
+            reusable = (
+                entry.first_date <= df.index[0]
+                and entry.last_date in settled.index
+                and settled['Close'].at[entry.last_date] == entry.last_close
+            )
+            if reusable:
+                new_bars = settled[settled.index > entry.last_date]
+                if len(new_bars):
+                    feed(entry.engine, new_bars)
+                    entry.last_date = settled.index[-1]
+                    entry.last_close = settled['Close'].iloc[-1]
+                    self.updates += 1
+                return entry.engine
+            logger.debug(f"{self.name} state for {key} is stale, rebuilding")
+
+        engine = factory()
+        if len(settled):
+            feed(engine, settled)
+            self._cache.set(key, _Entry(engine, df.index[0], settled.index[-1], settled['Close'].iloc[-1]))
+        self.rebuilds += 1
+        return engine
+
+    def get(self, key: Hashable, df, factory: Callable[[], Any],
+            feed: Callable[[Any, Any], None]) -> Any:
+        """
+        Get an engine that has seen every bar of df (blocking; call it from
+        the executor)
+
+        Args:
+            key: Symbol plus the engine parameters, e.g. ('AAPL', 'risk', 63)
+            df: Daily OHLCV history in date order (from get_price_history)
+            factory: Creates an empty engine
+            feed: Advances an engine with a slice of df
+
+        Returns:
+            A private engine instance the caller may keep using. It may have
+            seen bars older than df when a longer history was requested
+            earlier, so slice its output to the bars you need.
+        """
+        if df.empty:
+            return factory()
+        with self._lock:
+            engine = self._settled(key, df, factory, feed).copy()
+        feed(engine, df.iloc[-1:])
+        return engine
+
+
+# Shared by the analysis commands
+series_cache = SeriesCache(
+    ttl=Config.SERIES_CACHE_TTL,
+    max_entries=Config.SERIES_CACHE_MAX_ENTRIES,
+    name='series'
+)
@@ -0,0 +1,74 @@
+"""
+Request coalescing for concurrent identical fetches
+Concurrent callers with the same key share one in-flight upstream call
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls by key
+
+    The first caller for a key starts the work; callers arriving while it
+    is still running await the same task and receive the same result (or
+    exception). Once the task finishes the key is released, so later calls
+    start a fresh fetch.
+    """
+
+    def __init__(self, name: str = 'singleflight'):
+        self.name = name
+        self.calls = 0
+        self.shared = 0
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func once for all concurrent callers using the same key
+
+        Args:
+            key: Deduplication key
+            func: Zero-argument coroutine function performing the fetch
+
+        Returns:
+            Result of func, shared between all concurrent callers
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._release(key, t))
+        else:
+            self.shared += 1
+            logger.debug(f"Joining in-flight request: {key}")
+
+        # Shield so one cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved even if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing counters
+
+        Returns:
+            Dictionary with upstream calls, shared joins and in-flight count
+        """
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'shared': self.shared,
+            'in_flight': len(self._inflight),
+        }
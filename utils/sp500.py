@@ -1,52 +1,186 @@
 """
 S&P 500 data fetching utilities
-Retrieves the list of S&P 500 companies from Wikipedia
+Keeps the list of S&P 500 companies in memory, backed by an on-disk
+snapshot that is refreshed from Wikipedia in the background
 """
+import datetime
+import json
+import os
+import threading
 import requests
-from bs4 import BeautifulSoup
-from typing import Optional, List
+from typing import Optional, List, Dict
+from config import Config
+from .executor import run_blocking
+from .http_client import http_clients
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
 
+WIKIPEDIA_URL = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
 
-def get_sp500_symbols() -> Optional[List[str]]:
+
+def fetch_sp500_constituents() -> Optional[List[Dict[str, str]]]:
     """
-    Fetch S&P 500 stock symbols from Wikipedia
-    
+    Fetch S&P 500 constituents from Wikipedia
+
     Returns:
-        List of stock symbols, or None if fetching fails
+        List of dicts with symbol, name, sector and sub_industry,
+        or None if fetching fails
     """
+    from bs4 import BeautifulSoup
+
     try:
-        url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        
-        logger.info("Fetching S&P 500 symbols from Wikipedia...")
-        response = requests.get(url, headers=headers, timeout=10)
+        logger.info("Fetching S&P 500 constituents from Wikipedia...")
+        response = http_clients.get(WIKIPEDIA_URL, timeout=10)
         response.raise_for_status()
-        
+
         soup = BeautifulSoup(response.text, 'html.parser')
         table = soup.find('table', {'id': 'constituents'})
-        
+
         if not table:
             logger.error("Could not find constituents table on Wikipedia")
             return None
-        
-        symbols = []
+
+        constituents = []
         for row in table.find_all('tr')[1:]:  # Skip header
             cells = row.find_all('td')
-            if cells:
-                symbol = cells[0].text.strip()
-                # yfinance uses - instead of . in some tickers
-                symbol = symbol.replace('.', '-')
-                symbols.append(symbol)
-        
-        logger.info(f"Successfully fetched {len(symbols)} S&P 500 symbols")
-        return symbols
-        
+            if len(cells) < 4:
+                continue
+            # yfinance uses - instead of . in some tickers
+            symbol = cells[0].text.strip().replace('.', '-')
+            constituents.append({
+                'symbol': symbol,
+                'name': cells[1].text.strip(),
+                'sector': cells[2].text.strip(),
+                'sub_industry': cells[3].text.strip(),
+            })
+
+        if not constituents:
+            logger.error("Constituents table on Wikipedia is empty")
+            return None
+
+        logger.info(f"Successfully fetched {len(constituents)} S&P 500 constituents")
+        return constituents
+
     except requests.RequestException as e:
         logger.error(f"HTTP error while fetching S&P 500 symbols: {e}")
         return None
     except Exception as e:
         logger.error(f"Error fetching S&P 500 symbols: {e}")
         return None
+
+
+class SP500Index:
+    """
+    In-memory S&P 500 constituent list with a versioned JSON snapshot on disk
+
+    A failed refresh never replaces the last good snapshot.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.constituents: List[Dict[str, str]] = []
+        self.fetched_at: Optional[datetime.datetime] = None
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def version(self) -> Optional[str]:
+        """Snapshot version (UTC fetch timestamp in ISO format)"""
+        return self.fetched_at.isoformat() if self.fetched_at else None
+
+    def symbols(self) -> List[str]:
+        return [c['symbol'] for c in self.constituents]
+
+    def get(self, symbol: str) -> Optional[Dict[str, str]]:
+        """Look up a constituent by ticker symbol"""
+        symbol = symbol.upper()
+        return next((c for c in self.constituents if c['symbol'] == symbol), None)
+
+    def is_stale(self, max_age: float) -> bool:
+        """Whether the snapshot is missing or older than max_age seconds"""
+        if not self.constituents or self.fetched_at is None:
+            return True
+        age = datetime.datetime.now(datetime.timezone.utc) - self.fetched_at
+        return age.total_seconds() > max_age
+
+    def load(self) -> bool:
+        """
+        Load the snapshot from disk
+
+        Returns:
+            True if a snapshot was loaded
+        """
+        if not os.path.exists(self.path):
+            logger.info(f"No S&P 500 snapshot at {self.path}")
+            return False
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+            self.constituents = payload['constituents']
+            self.fetched_at = datetime.datetime.fromisoformat(payload['fetched_at'])
+            logger.info(f"Loaded {len(self.constituents)} S&P 500 constituents (version {self.version})")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to load S&P 500 snapshot {self.path}: {e}")
+            return False
+
+    def save(self):
+        """Write the snapshot to disk atomically"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'fetched_at': self.version,
+                'source': WIKIPEDIA_URL,
+                'constituents': self.constituents,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def refresh(self) -> bool:
+        """
+        Re-fetch constituents from Wikipedia and persist them (blocking)
+
+        Returns:
+            True if the snapshot was updated
+        """
+        with self._refresh_lock:
+            constituents = fetch_sp500_constituents()
+            if not constituents:
+                if self.constituents:
+                    logger.warning(f"S&P 500 refresh failed, keeping snapshot version {self.version}")
+                return False
+
+            self.constituents = constituents
+            self.fetched_at = datetime.datetime.now(datetime.timezone.utc)
+            try:
+                self.save()
+            except OSError as e:
+                logger.error(f"Failed to save S&P 500 snapshot: {e}")
+            return True
+
+
+# Shared constituent index
+sp500_index = SP500Index(Config.SP500_SNAPSHOT_PATH)
+
+
+def get_sp500_symbols() -> Optional[List[str]]:
+    """
+    Get S&P 500 stock symbols
+
+    Served from memory; falls back to the disk snapshot and finally to a
+    live Wikipedia fetch if nothing has been loaded yet.
+
+    Returns:
+        List of stock symbols, or None if no data is available
+    """
+    if not sp500_index.constituents:
+        if not sp500_index.load():
+            sp500_index.refresh()
+    return sp500_index.symbols() or None
+
+
+async def refresh_sp500_index():
+    """Scheduler job: refresh the constituent index if it is out of date"""
+    if sp500_index.is_stale(Config.SP500_REFRESH_INTERVAL):
+        await run_blocking(sp500_index.refresh)
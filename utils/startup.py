@@ -0,0 +1,46 @@
+"""
+Startup phase timings
+Logs how long each step between process start and a warm, connected bot
+takes
+"""
+import time
+from typing import List, Tuple
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class StartupTimer:
+    """Records named startup milestones relative to when it was created"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def mark(self, phase: str):
+        """
+        Record that a startup phase finished
+
+        Args:
+            phase: Short description, e.g. 'commands registered'
+        """
+        now = self.elapsed()
+        previous = self.marks[-1][1] if self.marks else 0.0
+        self.marks.append((phase, now))
+        logger.info(f"Startup: {phase} (+{now - previous:.2f}s, {now:.2f}s total)")
+
+    def summary(self) -> str:
+        """One line listing every phase with its duration"""
+        parts = []
+        previous = 0.0
+        for phase, at in self.marks:
+            parts.append(f"{phase} {at - previous:.2f}s")
+            previous = at
+        return ' → '.join(parts)
+
+
+# Created on first import, which bot.py does before anything heavy
+startup = StartupTimer()
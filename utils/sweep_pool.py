@@ -0,0 +1,124 @@
+"""
+Parameter sweep worker pool
+Runs CPU-heavy sweep tasks in separate processes over a price matrix that is
+published once in shared memory instead of being pickled for every task
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, List, Optional, Sequence
+import numpy as np
+from config import Config
+from .executor import run_blocking
+from .instrumentation import timed
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _context():
+    """
+    Start method for sweep workers
+
+    The chart pool forks its workers first, after which this process has
+    threads; workers here come from a fork server (or spawn) instead.
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    # Import the engine once in the server so every worker inherits it
+    context.set_forkserver_preload(['__main__', 'analytics.backtest'])
+    return context
+
+
+def start_sweep_pool():
+    """
+    Start the sweep worker processes
+
+    Call this at startup: a warm-up task starts the fork server and the
+    first worker now rather than on the first /backtest. Without a pool,
+    sweeps run in the I/O thread pool.
+    """
+    global _pool
+    if _pool is not None or Config.SWEEP_WORKERS <= 0:
+        return
+    # Workers must share this process's tracker; one started lazily in a
+    # worker would unlink shared matrices when that worker exits
+    resource_tracker.ensure_running()
+    _pool = ProcessPoolExecutor(max_workers=Config.SWEEP_WORKERS, mp_context=_context())
+    _pool.submit(int).result()
+    logger.info(f"Sweep pool started with {Config.SWEEP_WORKERS} workers")
+
+
+def _restart_sweep_pool(broken: ProcessPoolExecutor):
+    """Replace a broken pool, unless another task already did"""
+    global _pool
+    if _pool is not broken:
+        return
+    broken.shutdown(wait=False, cancel_futures=True)
+    _pool = ProcessPoolExecutor(max_workers=Config.SWEEP_WORKERS, mp_context=_context())
+    logger.warning("Sweep pool broke, restarted it")
+
+
+def shutdown_sweep_pool():
+    """Stop the sweep worker processes"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        logger.info("Sweep pool stopped")
+
+
+def _run_task(name: str, shape: tuple, dtype: str, func: Callable, args: tuple) -> Any:
+    """Worker side: map the shared matrix and run one task on it"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return func(np.ndarray(shape, dtype=dtype, buffer=shm.buf), *args)
+    finally:
+        shm.close()
+
+
+def _run_inline(func: Callable, array: np.ndarray, tasks: Sequence[tuple]) -> list:
+    return [func(array, *args) for args in tasks]
+
+
+async def run_shared(func: Callable, array: np.ndarray, tasks: Sequence[tuple]) -> List[Any]:
+    """
+    Run func(array, *args) for every task, in the sweep pool if it was
+    started at boot, otherwise in the I/O thread pool
+
+    Args:
+        func: Module-level function (picklable by reference)
+        array: Data shared by all tasks, e.g. a (symbols, days) price matrix
+        tasks: Argument tuples, one per call
+
+    Returns:
+        Results in task order
+    """
+    array = np.ascontiguousarray(array)
+    with timed('sweep', func.__name__):
+        pool = _pool
+        if pool is None or len(tasks) < 2:
+            return await run_blocking(_run_inline, func, array, tasks)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        try:
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            spec = (shm.name, array.shape, array.dtype.str)
+            loop = asyncio.get_running_loop()
+            try:
+                return await asyncio.gather(*(
+                    loop.run_in_executor(pool, _run_task, *spec, func, args) for args in tasks
+                ))
+            except BrokenProcessPool:
+                _restart_sweep_pool(pool)
+                return await asyncio.gather(*(
+                    loop.run_in_executor(_pool, _run_task, *spec, func, args) for args in tasks
+                ))
+        finally:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,32 @@
+"""
+Ticker symbol parsing
+Shared by the commands that accept a list of symbols
+"""
+import re
+from typing import List
+
+SYMBOL_PATTERN = re.compile(r'^[A-Z0-9.\-^=]{1,12}$')
+
+
+def parse_symbols(text: str) -> List[str]:
+    """
+    Split a comma/space separated symbol list
+
+    Args:
+        text: User input, e.g. "AAPL, msft nvda"
+
+    Returns:
+        Upper-cased symbols without duplicates, in input order
+
+    Raises:
+        ValueError: If a symbol is malformed
+    """
+    symbols = []
+    for part in re.split(r'[\s,]+', text.strip().upper()):
+        if not part:
+            continue
+        if not SYMBOL_PATTERN.match(part):
+            raise ValueError(part)
+        if part not in symbols:
+            symbols.append(part)
+    return symbols
@@ -1,39 +1,269 @@
 """
 Translation utilities using Google Translate
-Handles English to Thai translation for news content
+Handles English to Thai translation for news content, with a persistent
+cache and batched, concurrent requests
 """
-from deep_translator import GoogleTranslator
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
 from config import Config
+from .cache import TTLCache
+from .executor import run_blocking
+from .instrumentation import timed
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Texts are joined with newlines into one request; Google keeps line breaks
+BATCH_SEPARATOR = '\n'
+
+_local = threading.local()
+
+
+def _translator():
+    """Get this thread's translator client (created once per worker thread)"""
+    translator = getattr(_local, 'translator', None)
+    if translator is None:
+        # Imported here: deep_translator is slow to import and only needed by workers
+        from deep_translator import GoogleTranslator
+        translator = GoogleTranslator(source='en', target='th')
+        _local.translator = translator
+    return translator
+
+
+class TranslationCache:
+    """
+    Translations keyed by a hash of the source text
+
+    Backed by SQLite so translations survive restarts, with a small
+    in-memory LRU in front of it.
+    """
+
+    def __init__(self, path: str, target: str = 'th'):
+        self.path = path
+        self.target = target
+        self.memory = TTLCache(ttl=24 * 60 * 60, max_entries=2048, name='translations')
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and self.path:
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS translations ("
+                    "hash TEXT NOT NULL, target TEXT NOT NULL, text TEXT NOT NULL, "
+                    "created_at REAL NOT NULL, PRIMARY KEY (hash, target))"
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Translation cache unavailable ({self.path}): {e}")
+                self.path = ''
+                self._conn = None
+        return self._conn
+
+    def get_many(self, texts: List[str]) -> Dict[str, str]:
+        """
+        Look up cached translations
+
+        Args:
+            texts: Source texts
+
+        Returns:
+            Mapping of source text -> translation for the texts found
+        """
+        found = {}
+        missing = {}
+        for text in texts:
+            key = self.key(text)
+            cached = self.memory.get(key)
+            if cached is not None:
+                found[text] = cached
+            else:
+                missing[key] = text
+
+        if missing:
+            with self._lock:
+                conn = self._connection()
+                if conn is not None:
+                    keys = list(missing)
+                    # Stay well under SQLite's bound-parameter limit
+                    for i in range(0, len(keys), 500):
+                        chunk = keys[i:i + 500]
+                        rows = conn.execute(
+                            f"SELECT hash, text FROM translations WHERE target = ? "
+                            f"AND hash IN ({','.join('?' * len(chunk))})",
+                            [self.target, *chunk]
+                        ).fetchall()
+                        for key, translated in rows:
+                            found[missing[key]] = translated
+                            self.memory.set(key, translated)
+        return found
+
+    def set_many(self, translations: Dict[str, str]):
+        """
+        Store translations
+
+        Args:
+            translations: Mapping of source text -> translation
+        """
+        if not translations:
+            return
+        rows = []
+        now = time.time()
+        for text, translated in translations.items():
+            key = self.key(text)
+            self.memory.set(key, translated)
+            rows.append((key, self.target, translated, now))
+
+        with self._lock:
+            conn = self._connection()
+            if conn is not None:
+                try:
+                    conn.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)", rows)
+                    conn.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to persist translations: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+translation_cache = TranslationCache(Config.TRANSLATION_CACHE_PATH)
+
+
+def _prepare(text: str) -> str:
+    """Normalize a source text: single line, truncated to the API limit"""
+    text = ' '.join(text.split())
+    if len(text) > Config.TRANSLATION_MAX_LENGTH:
+        logger.warning(f"Text too long ({len(text)} chars), truncating to {Config.TRANSLATION_MAX_LENGTH}")
+        text = text[:Config.TRANSLATION_MAX_LENGTH]
+    return text
+
+
+def _translate_one(text: str) -> Optional[str]:
+    try:
+        with timed('translation', 'google'):
+            translated = _translator().translate(text)
+        logger.debug(f"Translated: {text[:50]}... -> {str(translated)[:50]}...")
+        return translated
+    except Exception as e:
+        logger.error(f"Translation failed: {e}")
+        return None
+
+
+def _translate_chunk(texts: List[str]) -> Dict[str, str]:
+    """
+    Translate several texts with a single request (blocking)
+
+    Falls back to one request per text if the response does not split back
+    into the same number of lines.
+
+    Returns:
+        Mapping of source text -> translation for the texts that succeeded
+    """
+    if len(texts) == 1:
+        translated = _translate_one(texts[0])
+        return {texts[0]: translated} if translated else {}
+
+    joined = _translate_one(BATCH_SEPARATOR.join(texts))
+    if joined:
+        parts = [part.strip() for part in joined.split(BATCH_SEPARATOR)]
+        if len(parts) == len(texts) and all(parts):
+            return dict(zip(texts, parts))
+        logger.debug(f"Batch translation split mismatch ({len(parts)} != {len(texts)}), translating individually")
+
+    results = {}
+    for text in texts:
+        translated = _translate_one(text)
+        if translated:
+            results[text] = translated
+    return results
+
+
+def _chunk(texts: List[str]) -> List[List[str]]:
+    """Pack texts into requests no longer than TRANSLATION_MAX_LENGTH"""
+    chunks, current, size = [], [], 0
+    for text in texts:
+        extra = len(text) + len(BATCH_SEPARATOR)
+        if current and size + extra > Config.TRANSLATION_MAX_LENGTH:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(text)
+        size += extra
+    if current:
+        chunks.append(current)
+    return chunks
+
 
 def translate_to_thai(text: str) -> str:
     """
-    Translate text from English to Thai
-    
+    Translate text from English to Thai (blocking)
+
     Args:
         text: English text to translate
-        
+
     Returns:
         Translated Thai text, or original text if translation fails
     """
     if not text or not text.strip():
         return text
-    
-    try:
-        translator = GoogleTranslator(source='en', target='th')
-        
-        # Truncate if too long
-        if len(text) > Config.TRANSLATION_MAX_LENGTH:
-            logger.warning(f"Text too long ({len(text)} chars), truncating to {Config.TRANSLATION_MAX_LENGTH}")
-            text = text[:Config.TRANSLATION_MAX_LENGTH]
-        
-        translated = translator.translate(text)
-        logger.debug(f"Translated: {text[:50]}... -> {translated[:50]}...")
-        return translated
-        
-    except Exception as e:
-        logger.error(f"Translation failed: {e}")
+
+    prepared = _prepare(text)
+    cached = translation_cache.get_many([prepared])
+    if prepared in cached:
+        return cached[prepared]
+
+    translated = _translate_one(prepared)
+    if not translated:
         return text  # Return original text if translation fails
+    translation_cache.set_many({prepared: translated})
+    return translated
+
+
+async def translate_many_to_thai(texts: List[str]) -> List[str]:
+    """
+    Translate many texts from English to Thai off the event loop
+
+    Cached texts are served without a request; the rest are packed into
+    as few requests as possible, which run concurrently.
+
+    Args:
+        texts: English texts (empty strings are passed through)
+
+    Returns:
+        Translations in the same order; a text whose translation failed is
+        returned unchanged
+    """
+    prepared = [_prepare(t) if t and t.strip() else '' for t in texts]
+    unique = list(dict.fromkeys(p for p in prepared if p))
+    if not unique:
+        return list(texts)
+
+    translations = await run_blocking(translation_cache.get_many, unique)
+    missing = [t for t in unique if t not in translations]
+
+    if missing:
+        chunks = _chunk(missing)
+        results = await asyncio.gather(*(run_blocking(_translate_chunk, c) for c in chunks))
+        fresh = {}
+        for result in results:
+            fresh.update(result)
+        translations.update(fresh)
+        await run_blocking(translation_cache.set_many, fresh)
+        logger.debug(f"Translated {len(fresh)}/{len(missing)} texts in {len(chunks)} requests "
+                     f"({len(unique) - len(missing)} cached)")
+
+    return [translations.get(p, original) if p else original for p, original in zip(prepared, texts)]
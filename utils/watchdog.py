@@ -0,0 +1,107 @@
+"""
+Blocking-call watchdog
+A background thread that notices when the event loop stops ticking and
+logs which command was running, its arguments and a stack sample
+"""
+import sys
+import threading
+import time
+import traceback
+from typing import List, Optional
+from config import Config
+from .instrumentation import in_flight
+from .logger import setup_logger
+from .loop_monitor import LoopLagMonitor, loop_monitor
+from .metrics import registry
+
+logger = setup_logger(__name__)
+
+# Frames kept from the innermost end of the stack sample
+STACK_DEPTH = 12
+
+blocked_total = registry.counter(
+    'event_loop_blocked_total', 'Times the event loop was blocked beyond the watchdog threshold')
+
+
+def _blocking_command(frame) -> Optional[dict]:
+    """Find the in-flight command whose callback is on the blocked stack"""
+    commands = list(in_flight.values())
+    codes = {c['code']: c for c in commands if c['code'] is not None}
+    while frame is not None:
+        if frame.f_code in codes:
+            return codes[frame.f_code]
+        frame = frame.f_back
+    return None
+
+
+class Watchdog:
+    """
+    Checks the loop monitor's tick from a separate thread
+
+    The check itself is a timestamp comparison every `threshold / 2`
+    seconds; the stack is only sampled once the loop is already late, so
+    the watchdog is cheap enough to leave running in production.
+    """
+
+    def __init__(self, monitor: LoopLagMonitor, threshold: float):
+        self.monitor = monitor
+        self.threshold = threshold
+        self.blocked_count = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start watching (the loop monitor must be running on the bot's loop)"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='loop-watchdog', daemon=True)
+        self._thread.start()
+        logger.info(f"Event loop watchdog started (threshold {self.threshold:.2f}s)")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _overdue(self) -> float:
+        """Seconds the loop is late for its next monitor tick"""
+        return time.monotonic() - self.monitor.last_tick - self.monitor.interval
+
+    def _run(self):
+        reported_tick = None
+        while not self._stop.wait(self.threshold / 2):
+            tick = self.monitor.last_tick
+            if tick == reported_tick or self._overdue() < self.threshold:
+                continue
+            # One report per blocked stretch: wait for the loop to tick again
+            reported_tick = tick
+            self.report(self._overdue())
+
+    def report(self, blocked_for: float):
+        """Log what the event loop thread is doing right now"""
+        self.blocked_count += 1
+        frame = sys._current_frames().get(self.monitor.thread_id)
+        command = _blocking_command(frame)
+        blocked_total.inc(command=command['command'] if command else 'unknown')
+
+        stack = ''.join(traceback.format_stack(frame)[-STACK_DEPTH:]) if frame is not None else '  <unavailable>\n'
+        lines: List[str] = [f"Event loop blocked for {blocked_for:.2f}s+"]
+        if command is not None:
+            lines.append(f"Blocking command: /{command['command']} {command['options']} (by {command['user']})")
+        others = [c for c in list(in_flight.values()) if c is not command]
+        if others:
+            now = time.monotonic()
+            lines.append("Other in-flight commands: " + ', '.join(
+                f"/{c['command']} {c['options']} ({now - c['started_at']:.1f}s)".replace('  ', ' ') for c in others))
+        lines.append(f"Stack sample:\n{stack.rstrip()}")
+        logger.warning('\n'.join(lines))
+
+
+# Shared watchdog for the bot's event loop
+watchdog = Watchdog(loop_monitor, threshold=Config.WATCHDOG_THRESHOLD)
@@ -0,0 +1,158 @@
+"""
+Health check and metrics web server
+Runs an aiohttp app on the bot's own event loop, serving /, /health and a
+Prometheus-style /metrics endpoint
+"""
+import math
+import sys
+import time
+from typing import Optional
+from aiohttp import web
+from .cache import market_cache
+from .charts import chart_cache
+from .executor import pending_calls, queue_depth
+from .logger import setup_logger
+from .loop_monitor import loop_monitor
+from .metrics import registry
+from .scheduler import scheduler
+from .series_cache import series_cache
+from .translator import translation_cache
+
+logger = setup_logger(__name__)
+
+CACHES = (market_cache, chart_cache, translation_cache.memory, series_cache.memory)
+
+
+def _latency(bot) -> Optional[float]:
+    """Last heartbeat latency in seconds, or None before the first heartbeat"""
+    latency = bot.latency
+    return latency if math.isfinite(latency) else None
+
+
+def _connected(bot) -> bool:
+    return bot.is_ready() and not bot.is_closed()
+
+
+def _coalesced_in_flight() -> int:
+    # market_data is loaded lazily; before that nothing can be in flight
+    market_data = sys.modules.get('utils.market_data')
+    return market_data.coalescing_stats()['in_flight'] if market_data else 0
+
+
+def register_bot_metrics(bot, started: float):
+    """
+    Register scrape-time metrics describing the bot's state
+
+    Args:
+        bot: The running discord.Bot
+        started: time.monotonic() value the uptime is measured from
+    """
+    registry.gauge('uptime_seconds', 'Seconds since the web server started',
+                   lambda: time.monotonic() - started)
+    registry.gauge('gateway_connected', 'Whether the Discord gateway connection is ready',
+                   lambda: float(_connected(bot)))
+    registry.gauge('gateway_latency_seconds', 'Last Discord heartbeat latency',
+                   lambda: _latency(bot) if _latency(bot) is not None else float('nan'))
+    registry.gauge('guilds', 'Number of guilds the bot is in', lambda: len(bot.guilds))
+    registry.gauge('event_loop_lag_seconds', 'Latest event loop lag sample',
+                   lambda: loop_monitor.last)
+    registry.gauge('event_loop_lag_max_seconds', 'Worst event loop lag in the recent window',
+                   loop_monitor.recent_max)
+    registry.gauge('executor_pending_calls', 'Blocking calls running or queued in the I/O pool',
+                   pending_calls)
+    registry.gauge('executor_queue_depth', 'Blocking calls waiting for a free I/O worker',
+                   queue_depth)
+    registry.gauge('coalesced_requests_in_flight', 'Upstream market data requests in flight',
+                   _coalesced_in_flight)
+    registry.gauge('cache_entries', 'Entries held per cache',
+                   lambda: [({'cache': c.name}, len(c)) for c in CACHES])
+    registry.counter('cache_hits_total', 'Cache hits per cache',
+                     lambda: [({'cache': c.name}, c.hits) for c in CACHES])
+    registry.counter('cache_misses_total', 'Cache misses per cache',
+                     lambda: [({'cache': c.name}, c.misses) for c in CACHES])
+    registry.counter('cache_evictions_total', 'LRU evictions per cache',
+                     lambda: [({'cache': c.name}, c.evictions) for c in CACHES])
+    registry.counter('job_runs_total', 'Successful background job runs',
+                     lambda: [({'job': j.name}, j.runs) for j in scheduler.jobs])
+    registry.counter('job_failures_total', 'Failed background job runs',
+                     lambda: [({'job': j.name}, j.failures) for j in scheduler.jobs])
+
+
+class WebServer:
+    """aiohttp server bound to the bot's event loop"""
+
+    def __init__(self, bot, host: str = '0.0.0.0', port: int = 10000):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.started_at = time.monotonic()
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application()
+        self.app.router.add_get('/', self.handle_root)
+        self.app.router.add_get('/health', self.handle_health)
+        self.app.router.add_get('/metrics', self.handle_metrics)
+
+    def health(self) -> dict:
+        """
+        Collect the bot's operational state
+
+        Returns:
+            Dictionary served as JSON by /health
+        """
+        connected = _connected(self.bot)
+        latency = _latency(self.bot)
+        return {
+            'status': 'healthy' if connected else 'starting' if not self.bot.is_closed() else 'offline',
+            'uptime_seconds': round(time.monotonic() - self.started_at, 1),
+            'gateway': {
+                'connected': connected,
+                'latency_ms': round(latency * 1000, 1) if latency is not None else None,
+                'guilds': len(self.bot.guilds),
+            },
+            'event_loop': {
+                'lag_ms': round(loop_monitor.last * 1000, 1),
+                'max_lag_ms': round(loop_monitor.recent_max() * 1000, 1),
+            },
+            'executor': {
+                'pending': pending_calls(),
+                'queue_depth': queue_depth(),
+            },
+            'caches': {c.name: {'size': len(c), 'hit_rate': round(c.stats()['hit_rate'], 3)}
+                       for c in CACHES},
+            'jobs': {j.name: {'runs': j.runs, 'failures': j.failures} for j in scheduler.jobs},
+        }
+
+    async def handle_root(self, request: web.Request) -> web.Response:
+        # Render's health check hits / and only needs the process to be up
+        return web.Response(text="Discord Stock Bot is running! 🤖📈")
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        state = self.health()
+        status = 200 if state['gateway']['connected'] else 503
+        return web.json_response(state, status=status)
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=registry.render(), content_type='text/plain',
+                            charset='utf-8', headers={'X-Content-Type-Options': 'nosniff'})
+
+    async def start(self):
+        """Start listening (call from within the running event loop)"""
+        if self._runner is not None:
+            return
+        self.started_at = time.monotonic()
+        register_bot_metrics(self.bot, self.started_at)
+        loop_monitor.start()
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        logger.info(f"Web server listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        """Stop listening and release the port"""
+        await loop_monitor.stop()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            logger.info("Web server stopped")